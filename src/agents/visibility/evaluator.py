@@ -2,10 +2,19 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Sequence
 
-from src.common.text import keyword_hits
-from src.common.types import QuestionAnswer, VisibilityResult, VisibilityScorecard, VisibilitySummary
+from src.common.text import compile_terms, keyword_hits
+from src.common.types import (
+    QuestionAnswer,
+    VisibilityResult,
+    VisibilityScorecard,
+    VisibilitySummary,
+)
+
+# Aliases never contain NUL, so joining answers with it keeps matches per-answer.
+_ANSWER_SEPARATOR = "\x00"
 
 
 def detect_provider_in_answer(answer: QuestionAnswer, provider_aliases: Iterable[str]) -> bool:
@@ -15,12 +24,52 @@ def detect_provider_in_answer(answer: QuestionAnswer, provider_aliases: Iterable
     return bool(hits)
 
 
-def evaluate_answers(result: VisibilityResult, provider_aliases: Iterable[str]) -> None:
-    """Mutate answers with provider inference flags and refresh summary."""
+def detect_provider_hits(
+    answers: Sequence[QuestionAnswer],
+    provider_aliases: Iterable[str],
+) -> List[Dict[str, int]]:
+    """Return per-answer alias hit counts using one scan across all answers."""
+
+    hits: List[Dict[str, int]] = [{} for _ in answers]
+    matcher = compile_terms(provider_aliases)
+    if not answers or not matcher:
+        return hits
+    if matcher.has_overlaps:
+        # Overlapping aliases need per-term counts, which one shared scan cannot give.
+        return [matcher.hits(answer.answer) for answer in answers]
+
+    offsets: List[int] = []
+    cursor = 0
+    for answer in answers:
+        offsets.append(cursor)
+        cursor += len(answer.answer) + len(_ANSWER_SEPARATOR)
+    corpus = _ANSWER_SEPARATOR.join(answer.answer for answer in answers)
+    for match in matcher.finditer(corpus):
+        index = bisect_right(offsets, match.start()) - 1
+        matcher.count_match(hits[index], match)
+    return hits
+
+
+def detect_provider_in_results(
+    results: Sequence[VisibilityResult],
+    provider_aliases: Iterable[str],
+) -> List[List[Dict[str, int]]]:
+    """Batch :func:`detect_provider_hits` over a corpus of stored results."""
 
+    flattened = [answer for result in results for answer in result.answers]
+    flat_hits = detect_provider_hits(flattened, provider_aliases)
+    grouped: List[List[Dict[str, int]]] = []
+    cursor = 0
+    for result in results:
+        grouped.append(flat_hits[cursor : cursor + len(result.answers)])
+        cursor += len(result.answers)
+    return grouped
+
+
+def _apply_hits(result: VisibilityResult, hits: Sequence[Dict[str, int]]) -> None:
     question_hits: dict[str, bool] = {}
-    for answer in result.answers:
-        seen = detect_provider_in_answer(answer, provider_aliases)
+    for answer, answer_hits in zip(result.answers, hits):
+        seen = bool(answer_hits)
         answer.ai_provider_inferred = seen
         if answer.question_id not in question_hits:
             question_hits[answer.question_id] = seen
@@ -29,13 +78,12 @@ def evaluate_answers(result: VisibilityResult, provider_aliases: Iterable[str])
 
     total_questions = len(question_hits) if question_hits else len(result.questions)
     inferred = sum(1 for hit in question_hits.values() if hit)
-    result.summary = VisibilitySummary(total_questions=total_questions, ai_provider_recognized_in=inferred)
-
+    result.summary = VisibilitySummary(
+        total_questions=total_questions, ai_provider_recognized_in=inferred
+    )
 
-def score_visibility(result: VisibilityResult, provider_aliases: Iterable[str]) -> VisibilityScorecard:
-    """Compute coverage and confidence scores after evaluation."""
 
-    evaluate_answers(result, provider_aliases)
+def _scorecard(result: VisibilityResult) -> VisibilityScorecard:
     total_questions = max(1, result.summary.total_questions)
     coverage = result.summary.ai_provider_recognized_in / total_questions
     confidence = min(1.0, 0.1 * (len(result.pillars) + result.summary.ai_provider_recognized_in))
@@ -44,4 +92,39 @@ def score_visibility(result: VisibilityResult, provider_aliases: Iterable[str])
     return scorecard
 
 
-__all__ = ["detect_provider_in_answer", "evaluate_answers", "score_visibility"]
+def evaluate_answers(result: VisibilityResult, provider_aliases: Iterable[str]) -> None:
+    """Mutate answers with provider inference flags and refresh summary."""
+
+    _apply_hits(result, detect_provider_hits(result.answers, provider_aliases))
+
+
+def score_visibility(
+    result: VisibilityResult, provider_aliases: Iterable[str]
+) -> VisibilityScorecard:
+    """Compute coverage and confidence scores after evaluation."""
+
+    evaluate_answers(result, provider_aliases)
+    return _scorecard(result)
+
+
+def score_results(
+    results: Sequence[VisibilityResult],
+    provider_aliases: Iterable[str],
+) -> List[VisibilityScorecard]:
+    """Rescore a corpus of results with a single batched provider scan."""
+
+    scorecards: List[VisibilityScorecard] = []
+    for result, hits in zip(results, detect_provider_in_results(results, provider_aliases)):
+        _apply_hits(result, hits)
+        scorecards.append(_scorecard(result))
+    return scorecards
+
+
+__all__ = [
+    "detect_provider_in_answer",
+    "detect_provider_hits",
+    "detect_provider_in_results",
+    "evaluate_answers",
+    "score_visibility",
+    "score_results",
+]
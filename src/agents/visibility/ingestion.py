@@ -4,17 +4,26 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Iterable, Iterator, Sequence
 
+from src.common.cache import StageCache, content_hash
+from src.common.metrics import STAGE_SECONDS
+from src.common.profiling import record_stage
 from src.common.text import (
+    StreamMasker,
+    TermMatcher,
+    compile_terms,
+    iter_mask_terms,
+    iter_normalize_whitespace,
+    iter_strip_markup,
     keyword_hits,
-    mask_terms,
     normalize_whitespace,
     strip_markup,
 )
 from src.common.types import StoryDocument, StoryMetadata
 
 GLOBAL_MASK_TOKEN = "[MASK]"
+DEFAULT_CHUNK_SIZE = 64 * 1024
 
 
 @dataclass(frozen=True)
@@ -25,11 +34,18 @@ class MaskingSummary:
     issues: Sequence[str]
 
 
-def load_transcript(path: Path) -> str:
+def load_transcript(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
     """Load and lightly clean a transcript from disk."""
 
-    raw = path.read_text(encoding="utf-8")
-    return normalize_story_text(raw)
+    return "".join(iter_normalized_chunks(iter_file_chunks(path, chunk_size)))
+
+
+def iter_file_chunks(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Yield a UTF-8 file in fixed-size character chunks."""
+
+    with path.open("r", encoding="utf-8") as handle:
+        while chunk := handle.read(chunk_size):
+            yield chunk
 
 
 def normalize_story_text(value: str) -> str:
@@ -38,18 +54,83 @@ def normalize_story_text(value: str) -> str:
     return normalize_whitespace(strip_markup(value))
 
 
+def iter_normalized_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    """Streaming counterpart of :func:`normalize_story_text`."""
+
+    return iter_normalize_whitespace(iter_strip_markup(chunks))
+
+
 def audit_mask_integrity(value: str, terms: Iterable[str]) -> list[str]:
     """Return human-readable issues when provider terms remain in text."""
 
     hits = keyword_hits(value, terms)
+    return _format_issues(hits)
+
+
+def _format_issues(hits: dict[str, int]) -> list[str]:
     return [f"Unmasked term '{term}' found {count} time(s)." for term, count in hits.items()]
 
 
-def mask_provider_terms(value: str, terms: Sequence[str], token: str = GLOBAL_MASK_TOKEN) -> MaskingSummary:
+def _audit_token_windows(
+    text: str,
+    token_offsets: Sequence[int],
+    matcher: TermMatcher,
+    token: str,
+) -> dict[str, int]:
+    """Count aliases left in masked text by scanning only around inserted tokens.
+
+    A single leftmost-longest pass cannot leave an alias in the untouched gaps, so
+    any residual occurrence must overlap a token (e.g. an alias contained in the
+    token itself). Only those bounded windows are rescanned, unless aliases can
+    overlap each other, in which case the whole text is counted per term.
+    """
+
+    if matcher.has_overlaps:
+        return matcher.hits(text)
+    hits: dict[str, int] = {}
+    reach = matcher.max_length - 1
+    limit = len(text)
+    windows: list[list[int]] = []
+    for start in token_offsets:
+        end = start + len(token)
+        window_start, window_end = max(0, start - reach), min(limit, end + reach)
+        if windows and window_start <= windows[-1][1]:
+            windows[-1][1] = window_end
+        else:
+            windows.append([window_start, window_end])
+    for window_start, window_end in windows:
+        for match in matcher.finditer(text, window_start, window_end):
+            matcher.count_match(hits, match)
+    return hits
+
+
+def mask_provider_terms(
+    value: str, terms: Sequence[str], token: str = GLOBAL_MASK_TOKEN
+) -> MaskingSummary:
     """Apply masking to provider aliases and report any remaining occurrences."""
 
-    masked = mask_terms(value, terms, token=token)
-    issues = audit_mask_integrity(masked, terms)
+    matcher = compile_terms(terms)
+    result = matcher.mask(value, token)
+    token_offsets: list[int] = []
+    shift = 0
+    for span in result.spans:
+        token_offsets.append(span.start + shift)
+        shift += len(token) - (span.end - span.start)
+    issues = _format_issues(_audit_token_windows(result.text, token_offsets, matcher, token))
+    return MaskingSummary(masked_text=result.text, issues=issues)
+
+
+def mask_provider_stream(
+    chunks: Iterable[str],
+    terms: Sequence[str],
+    token: str = GLOBAL_MASK_TOKEN,
+) -> MaskingSummary:
+    """Normalize and mask a chunked stream, keeping only the masked output."""
+
+    matcher = compile_terms(terms)
+    masker = StreamMasker(matcher, token)
+    masked = "".join(iter_mask_terms(iter_normalized_chunks(chunks), masker))
+    issues = _format_issues(_audit_token_windows(masked, masker.token_offsets, matcher, token))
     return MaskingSummary(masked_text=masked, issues=issues)
 
 
@@ -67,8 +148,30 @@ def load_story_document(
     metadata: StoryMetadata,
     provider_aliases: Sequence[str] | None = None,
     enforce_mask_integrity: bool = True,
+    *,
+    streaming: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
 ) -> StoryDocument:
-    """Ingest a story file, normalize content, and apply provider masking."""
+    """Ingest a story file, normalize content, and apply provider masking.
+
+    With ``streaming=True`` the file is stripped, normalized and masked chunk by
+    chunk so only the masked copy is held in memory. The returned document then
+    carries ``masked_text`` only: ``raw_text`` and ``normalized_text`` are empty
+    strings, so callers that need either must use the default in-memory path.
+    """
+
+    if streaming:
+        aliases = _coalesce_aliases(metadata, provider_aliases)
+        with STAGE_SECONDS.time(stage="masking"), record_stage("masking"):
+            summary = mask_provider_stream(iter_file_chunks(path, chunk_size), aliases)
+        if enforce_mask_integrity and summary.issues:
+            raise ValueError("; ".join(summary.issues))
+        return StoryDocument(
+            metadata=metadata,
+            raw_text="",
+            normalized_text="",
+            masked_text=summary.masked_text,
+        )
 
     raw = path.read_text(encoding="utf-8")
     return load_story_document_from_text(
@@ -84,30 +187,56 @@ def load_story_document_from_text(
     metadata: StoryMetadata,
     provider_aliases: Sequence[str] | None = None,
     enforce_mask_integrity: bool = True,
+    *,
+    cache: StageCache | None = None,
 ) -> StoryDocument:
-    """Normalize and mask a story directly from a string."""
+    """Normalize and mask a story directly from a string.
+
+    When a ``cache`` is supplied the normalized/masked pair is memoized by content
+    hash and alias set; metadata is always taken from the caller.
+    """
 
-    normalized = normalize_story_text(text)
     aliases = _coalesce_aliases(metadata, provider_aliases)
-    summary = mask_provider_terms(normalized, aliases)
-    if enforce_mask_integrity and summary.issues:
-        raise ValueError("; ".join(summary.issues))
+
+    def _compute() -> tuple[str, str]:
+        with STAGE_SECONDS.time(stage="ingestion"), record_stage("ingestion"):
+            normalized = normalize_story_text(text)
+        with STAGE_SECONDS.time(stage="masking"), record_stage("masking"):
+            summary = mask_provider_terms(normalized, aliases)
+        if enforce_mask_integrity and summary.issues:
+            raise ValueError("; ".join(summary.issues))
+        return normalized, summary.masked_text
+
+    if cache is None:
+        normalized, masked = _compute()
+    else:
+        normalized, masked = cache.get_or_compute(
+            "ingestion",
+            _compute,
+            content=content_hash(text),
+            aliases=sorted(set(aliases)),
+            enforce=enforce_mask_integrity,
+        )
 
     return StoryDocument(
         metadata=metadata,
         raw_text=text,
         normalized_text=normalized,
-        masked_text=summary.masked_text,
+        masked_text=masked,
     )
 
 
 __all__ = [
     "GLOBAL_MASK_TOKEN",
     "MaskingSummary",
+    "DEFAULT_CHUNK_SIZE",
     "load_transcript",
+    "iter_file_chunks",
     "normalize_story_text",
+    "iter_normalized_chunks",
     "audit_mask_integrity",
     "mask_provider_terms",
+    "mask_provider_stream",
     "load_story_document",
     "load_story_document_from_text",
 ]
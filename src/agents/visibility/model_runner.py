@@ -2,12 +2,70 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List
+import asyncio
+import contextlib
+import contextvars
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Sequence, TypeVar
 
+from src.common.cache import ResponseCache, content_hash, get_response_cache
+from src.common.cancellation import CancellationToken
 from src.common.config import Settings
-from src.common.openai_client import OpenAIClient
+from src.common.deadline import Deadline, DeadlineExceeded
+from src.common.hedging import Hedger, LatencyTracker, get_latency_tracker
+from src.common.metrics import (
+    CALL_BUDGET_EXHAUSTED,
+    INCOMPLETE_RESPONSES,
+    MODEL_CALL_SECONDS,
+    MODEL_CALLS,
+    PARSE_FALLBACKS,
+)
+from src.common.openai_client import OpenAIClient, get_shared_client
+from src.common.resilience import CircuitOpenError
+from src.common.tracing import current_span, span
 from src.common.types import ClarifyingQuestion, QuestionAnswer
+from src.common.usage import TokenUsage, UsageLedger, estimate_usage, extract_usage
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ANSWER_MODES = ("per_question", "batched")
+
+
+async def _gather_or_cancel(aws: Iterable[Awaitable[T]]) -> List[T]:
+    """``asyncio.gather`` that cancels the remaining tasks as soon as one fails.
+
+    Otherwise siblings keep calling, and charging the budget, after the run
+    has already failed (budget exhausted, cancelled, ...).
+    """
+
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@contextlib.contextmanager
+def _observe_call(model: str, stage: str) -> Iterator[None]:
+    """Record latency and outcome of one live model call."""
+
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        MODEL_CALLS.inc(model=model, stage=stage, outcome="error")
+        raise
+    MODEL_CALL_SECONDS.observe(time.perf_counter() - started, model=model, stage=stage)
+    MODEL_CALLS.inc(model=model, stage=stage, outcome="ok")
 
 
 @dataclass
@@ -16,43 +74,114 @@ class ModelResponse:
 
     content: str
     tokens_used: int = 0
+    usage: TokenUsage = field(default_factory=TokenUsage)
 
 
 class ModelRunner:
     """Execute model calls with optional live OpenAI integration."""
 
-    def __init__(self, settings: Settings, client: OpenAIClient | None = None) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        client: OpenAIClient | None = None,
+        response_cache: ResponseCache | None = None,
+        latency_tracker: LatencyTracker | None = None,
+        deadline: Deadline | None = None,
+        cancellation: CancellationToken | None = None,
+        call_limiter: asyncio.Semaphore | None = None,
+    ) -> None:
         self.settings = settings
+        self.deadline = deadline
+        self.cancellation = cancellation
+        # Optional cap on in-flight async calls shared with other runners.
+        self.call_limiter = call_limiter
         self.mode = settings.model.mode.lower()
         self._client = client
         self._calls_made = 0
         self._call_budget = settings.model.call_budget
+        self._response_cache = response_cache or get_response_cache(settings.model)
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._lock = threading.Lock()
+        self.ledger = UsageLedger(settings.model.pricing)
         if self.is_live and self._client is None:
-            self._client = OpenAIClient.from_model_settings(settings.model)
+            self._client = get_shared_client(settings.model)
+        self._hedger: Hedger | None = None
+        if self.is_live and settings.model.hedge_percentile:
+            self._hedger = Hedger(
+                latency_tracker or get_latency_tracker(),
+                quantile=settings.model.hedge_percentile,
+                min_samples=settings.model.hedge_min_samples,
+            )
 
     @property
     def is_live(self) -> bool:
         return self.mode == "live"
 
-    def invoke(self, messages: List[Dict[str, str]]) -> ModelResponse:
+    def cache_stats(self) -> Dict[str, Any] | None:
+        """Report response-cache usage for this runner, or None when disabled."""
+
+        if self._response_cache is None:
+            return None
+        lookups = self._cache_hits + self._cache_misses
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "hit_rate": self._cache_hits / lookups if lookups else 0.0,
+            "saved_calls": self._cache_hits,
+        }
+
+    def hedge_stats(self) -> Dict[str, Any] | None:
+        """Report how often hedged requests fired and won, or None when disabled."""
+
+        if self._hedger is None:
+            return None
+        return self._hedger.stats.as_dict()
+
+    def invoke(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        bypass_cache: bool = False,
+        stage: str = "invoke",
+    ) -> ModelResponse:
         """Invoke the primary model with arbitrary messages."""
 
-        combined = "\n\n".join(message.get("content", "") for message in messages)
-        if self.is_live:
-            self._register_call()
-            assert self._client is not None  # for type checkers
-            response = self._client.chat(
+        with span("runner.invoke", stage=stage, model=self.settings.model.name):
+            if self.is_live:
+                return self._chat(
+                    model=self.settings.model.name,
+                    messages=messages,
+                    bypass_cache=bypass_cache,
+                    stage=stage,
+                )
+            self.raise_if_cancelled()
+            if self.deadline is not None:
+                self.deadline.check()
+            combined = "\n\n".join(message.get("content", "") for message in messages)
+            content = f"[stub-response]\n{combined}"
+            usage = estimate_usage(messages, content, self.settings.model.name)
+            self.ledger.record(stage, self.settings.model.name, usage)
+            return ModelResponse(content=content, tokens_used=usage.total_tokens, usage=usage)
+
+    async def ainvoke(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        bypass_cache: bool = False,
+        stage: str = "invoke",
+    ) -> ModelResponse:
+        """Async :meth:`invoke`; live calls await the client instead of blocking."""
+
+        if not self.is_live:
+            return self.invoke(messages, stage=stage)
+        with span("runner.invoke", stage=stage, model=self.settings.model.name):
+            return await self._achat(
                 model=self.settings.model.name,
                 messages=messages,
-                temperature=self.settings.model.temperature,
-                max_tokens=self.settings.model.max_output_tokens,
-                reasoning_effort=self.settings.model.reasoning_effort,
-                max_reasoning_tokens=self.settings.model.max_reasoning_tokens,
+                bypass_cache=bypass_cache,
+                stage=stage,
             )
-            content = self._extract_content(response)
-            tokens = len(content.split())
-            return ModelResponse(content=content, tokens_used=tokens)
-        return ModelResponse(content=f"[stub-response]\n{combined}", tokens_used=len(combined.split()))
 
     def answer_questions(
         self,
@@ -61,70 +190,691 @@ class ModelRunner:
         *,
         transcript: str | None = None,
         system_prompt: str = "",
+        bypass_cache: bool = False,
+        max_concurrency: int | None = None,
     ) -> List[QuestionAnswer]:
         """Generate answers for each question using the requested model."""
 
-        answers: List[QuestionAnswer] = []
-        for index, question in enumerate(questions, start=1):
-            if self.is_live:
-                answer_text = self._answer_live(
-                    model_name=model_name,
-                    question=question,
-                    transcript=transcript or "",
-                    system_prompt=system_prompt,
+        return self.answer_matrix(
+            [model_name],
+            questions,
+            transcript=transcript,
+            system_prompt=system_prompt,
+            bypass_cache=bypass_cache,
+            max_concurrency=max_concurrency,
+        )
+
+    def answer_matrix(
+        self,
+        models: Iterable[str],
+        questions: Iterable[ClarifyingQuestion],
+        *,
+        transcript: str | None = None,
+        system_prompt: str = "",
+        bypass_cache: bool = False,
+        max_concurrency: int | None = None,
+        answer_mode: str | None = None,
+        on_answer: Callable[[QuestionAnswer], None] | None = None,
+    ) -> List[QuestionAnswer]:
+        """Answer every question with every model, fanning out live calls.
+
+        Answers are returned model-major in question order regardless of which
+        call finishes first. In ``batched`` answer mode each model receives the
+        transcript once with every question in a single call. Answers cut off
+        by the runner's deadline are omitted rather than failing the matrix.
+        ``on_answer`` is called with each answer as soon as it is ready (from
+        worker threads when calls run concurrently).
+        """
+
+        questions_list = list(questions)
+        limit = (
+            max_concurrency if max_concurrency is not None else self.settings.model.max_concurrency
+        )
+        if self.is_live and self._resolve_answer_mode(answer_mode) == "batched":
+            batch_tasks = [
+                self._notifying(
+                    self._batch_task(
+                        model_name,
+                        questions_list,
+                        transcript=transcript or "",
+                        system_prompt=system_prompt,
+                        bypass_cache=bypass_cache,
+                    ),
+                    on_answer,
+                )
+                for model_name in models
+            ]
+            return [answer for group in self._run_tasks(batch_tasks, limit) for answer in group]
+
+        tasks: List[Callable[[], QuestionAnswer | None]] = []
+        for model_name in models:
+            for index, question in enumerate(questions_list, start=1):
+                tasks.append(
+                    self._notifying(
+                        self._answer_task(
+                            model_name,
+                            question,
+                            index,
+                            transcript=transcript or "",
+                            system_prompt=system_prompt,
+                            bypass_cache=bypass_cache,
+                        ),
+                        on_answer,
+                    )
                 )
+        results = self._run_tasks(tasks, limit if self.is_live else 1)
+        return [answer for answer in results if answer is not None]
+
+    @staticmethod
+    def _notifying(
+        task: Callable[[], T],
+        on_answer: Callable[[QuestionAnswer], None] | None,
+    ) -> Callable[[], T]:
+        """Wrap a task so each answer it produces is reported on completion."""
+
+        if on_answer is None:
+            return task
+
+        def _run() -> T:
+            result = task()
+            for answer in result if isinstance(result, list) else [result]:
+                if answer is not None:
+                    on_answer(answer)
+            return result
+
+        return _run
+
+    def _batch_task(
+        self,
+        model_name: str,
+        questions: List[ClarifyingQuestion],
+        *,
+        transcript: str,
+        system_prompt: str,
+        bypass_cache: bool,
+    ) -> Callable[[], List[QuestionAnswer]]:
+        def _task() -> List[QuestionAnswer]:
+            try:
+                with span("runner.answer_batch", model=model_name, questions=len(questions)):
+                    response = self._chat(
+                        model=model_name,
+                        messages=self._batch_messages(questions, transcript, system_prompt),
+                        bypass_cache=bypass_cache,
+                        stage="answer_batch",
+                    )
+            except CircuitOpenError:
+                return [
+                    self._build_answer(model_name, question, index, None)
+                    for index, question in enumerate(questions, start=1)
+                ]
+            except DeadlineExceeded:
+                return []
+            parsed = self._parse_batch_answers(response.content)
+            answers: List[QuestionAnswer] = []
+            for index, question in enumerate(questions, start=1):
+                identifier = self.question_identifier(question, index)
+                answer_text = parsed.get(identifier)
+                if answer_text is None:
+                    try:
+                        answer_text = self._answer_live(
+                            model_name=model_name,
+                            question=question,
+                            index=index,
+                            transcript=transcript,
+                            system_prompt=system_prompt,
+                            bypass_cache=bypass_cache,
+                        )
+                    except DeadlineExceeded:
+                        continue
+                answers.append(self._build_answer(model_name, question, index, answer_text))
+            return answers
+
+        return _task
+
+    def _answer_task(
+        self,
+        model_name: str,
+        question: ClarifyingQuestion,
+        index: int,
+        *,
+        transcript: str,
+        system_prompt: str,
+        bypass_cache: bool,
+    ) -> Callable[[], QuestionAnswer | None]:
+        def _task() -> QuestionAnswer | None:
+            if self.is_live:
+                try:
+                    answer_text = self._answer_live(
+                        model_name=model_name,
+                        question=question,
+                        index=index,
+                        transcript=transcript,
+                        system_prompt=system_prompt,
+                        bypass_cache=bypass_cache,
+                    )
+                except DeadlineExceeded:
+                    return None
             else:
+                self.raise_if_cancelled()
+                if self.deadline is not None and self.deadline.expired:
+                    return None
                 answer_text = self._fabricate_answer(question)
                 self._register_call()
-            identifier = question.identifier or f"q{index}_{question.kind}"
-            answers.append(
-                QuestionAnswer(
-                    question_id=identifier,
-                    model=model_name,
-                    prompt=question.prompt,
-                    answer=answer_text,
-                    kind=question.kind,
+                usage = estimate_usage(
+                    [{"content": transcript}, {"content": question.prompt}], answer_text, model_name
                 )
+                self.ledger.record("answer", model_name, usage)
+            return self._build_answer(model_name, question, index, answer_text)
+
+        return _task
+
+    async def aanswer_questions(
+        self,
+        model_name: str,
+        questions: Iterable[ClarifyingQuestion],
+        *,
+        transcript: str | None = None,
+        system_prompt: str = "",
+        bypass_cache: bool = False,
+        max_concurrency: int | None = None,
+    ) -> List[QuestionAnswer]:
+        """Async :meth:`answer_questions`."""
+
+        return await self.aanswer_matrix(
+            [model_name],
+            questions,
+            transcript=transcript,
+            system_prompt=system_prompt,
+            bypass_cache=bypass_cache,
+            max_concurrency=max_concurrency,
+        )
+
+    async def aanswer_matrix(
+        self,
+        models: Iterable[str],
+        questions: Iterable[ClarifyingQuestion],
+        *,
+        transcript: str | None = None,
+        system_prompt: str = "",
+        bypass_cache: bool = False,
+        max_concurrency: int | None = None,
+        answer_mode: str | None = None,
+        on_answer: Callable[[QuestionAnswer], None] | None = None,
+    ) -> List[QuestionAnswer]:
+        """Async :meth:`answer_matrix` bounded by a semaphore instead of threads."""
+
+        questions_list = list(questions)
+        if not self.is_live:
+            return self.answer_matrix(
+                models, questions_list, transcript=transcript, on_answer=on_answer
             )
-        return answers
+
+        limit = (
+            max_concurrency if max_concurrency is not None else self.settings.model.max_concurrency
+        )
+        semaphore = asyncio.Semaphore(max(1, limit))
+
+        if self._resolve_answer_mode(answer_mode) == "batched":
+
+            async def _batch(model_name: str) -> List[QuestionAnswer]:
+                async with semaphore:
+                    try:
+                        batch_span = span(
+                            "runner.answer_batch", model=model_name, questions=len(questions_list)
+                        )
+                        with batch_span:
+                            response = await self._achat(
+                                model=model_name,
+                                messages=self._batch_messages(
+                                    questions_list, transcript or "", system_prompt
+                                ),
+                                bypass_cache=bypass_cache,
+                                stage="answer_batch",
+                            )
+                    except CircuitOpenError:
+                        return [
+                            self._build_answer(model_name, question, index, None)
+                            for index, question in enumerate(questions_list, start=1)
+                        ]
+                    except DeadlineExceeded:
+                        return []
+                    parsed = self._parse_batch_answers(response.content)
+                    answers: List[QuestionAnswer] = []
+                    for index, question in enumerate(questions_list, start=1):
+                        answer_text = parsed.get(self.question_identifier(question, index))
+                        if answer_text is None:
+                            try:
+                                answer_text = await self._aanswer_live(
+                                    model_name=model_name,
+                                    question=question,
+                                    index=index,
+                                    transcript=transcript or "",
+                                    system_prompt=system_prompt,
+                                    bypass_cache=bypass_cache,
+                                )
+                            except DeadlineExceeded:
+                                continue
+                        answers.append(self._build_answer(model_name, question, index, answer_text))
+                    return answers
+
+            async def _notify_batch(model_name: str) -> List[QuestionAnswer]:
+                answers = await _batch(model_name)
+                if on_answer is not None:
+                    for answer in answers:
+                        on_answer(answer)
+                return answers
+
+            groups = await _gather_or_cancel(_notify_batch(model_name) for model_name in models)
+            return [answer for group in groups for answer in group]
+
+        async def _task(
+            model_name: str, question: ClarifyingQuestion, index: int
+        ) -> QuestionAnswer | None:
+            async with semaphore:
+                try:
+                    answer_text = await self._aanswer_live(
+                        model_name=model_name,
+                        question=question,
+                        index=index,
+                        transcript=transcript or "",
+                        system_prompt=system_prompt,
+                        bypass_cache=bypass_cache,
+                    )
+                except DeadlineExceeded:
+                    return None
+            answer = self._build_answer(model_name, question, index, answer_text)
+            if on_answer is not None:
+                on_answer(answer)
+            return answer
+
+        coroutines: List[Awaitable[QuestionAnswer | None]] = [
+            _task(model_name, question, index)
+            for model_name in models
+            for index, question in enumerate(questions_list, start=1)
+        ]
+        results = await _gather_or_cancel(coroutines)
+        return [answer for answer in results if answer is not None]
+
+    def _resolve_answer_mode(self, answer_mode: str | None) -> str:
+        mode = (answer_mode or self.settings.model.answer_mode).lower()
+        if mode not in ANSWER_MODES:
+            raise ValueError(f"answer_mode must be one of {', '.join(ANSWER_MODES)}.")
+        return mode
+
+    @staticmethod
+    def question_identifier(question: ClarifyingQuestion, index: int) -> str:
+        """Identifier answers carry for the ``index``-th (1-based) question."""
+
+        return question.identifier or f"q{index}_{question.kind}"
+
+    @classmethod
+    def _build_answer(
+        cls,
+        model_name: str,
+        question: ClarifyingQuestion,
+        index: int,
+        answer_text: str | None,
+    ) -> QuestionAnswer:
+        """Build an answer record; ``None`` text marks the answer as skipped."""
+
+        identifier = cls.question_identifier(question, index)
+        return QuestionAnswer(
+            question_id=identifier,
+            model=model_name,
+            prompt=question.prompt,
+            answer=answer_text or "",
+            kind=question.kind,
+            skipped=answer_text is None,
+        )
+
+    @staticmethod
+    def _run_tasks(tasks: Sequence[Callable[[], T]], limit: int) -> List[T]:
+        if limit <= 1 or len(tasks) <= 1:
+            return [task() for task in tasks]
+        executor = ThreadPoolExecutor(
+            max_workers=min(limit, len(tasks)),
+            thread_name_prefix="visibility-answer",
+        )
+        try:
+            # Each task gets its own context copy so spans nest under the caller's.
+            futures = [executor.submit(contextvars.copy_context().run, task) for task in tasks]
+            results = [future.result() for future in futures]
+        except BaseException:
+            # Drop queued work and hand the thread back without waiting on
+            # in-flight calls (e.g. after cancellation).
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown(wait=True)
+        return results
 
     def _answer_live(
         self,
         *,
         model_name: str,
         question: ClarifyingQuestion,
+        index: int,
+        transcript: str,
+        system_prompt: str,
+        bypass_cache: bool = False,
+    ) -> str | None:
+        """Answer one question, or return None when the model's circuit is open."""
+
+        question_id = self.question_identifier(question, index)
+        with span("runner.answer", model=model_name, question_id=question_id) as active:
+            try:
+                response = self._chat(
+                    model=model_name,
+                    messages=self._answer_messages(question, transcript, system_prompt),
+                    bypass_cache=bypass_cache,
+                    stage="answer",
+                )
+            except CircuitOpenError:
+                active.set_attribute("skipped", True)
+                return None
+            return response.content
+
+    async def _aanswer_live(
+        self,
+        *,
+        model_name: str,
+        question: ClarifyingQuestion,
+        index: int,
         transcript: str,
         system_prompt: str,
-    ) -> str:
+        bypass_cache: bool = False,
+    ) -> str | None:
+        question_id = self.question_identifier(question, index)
+        with span("runner.answer", model=model_name, question_id=question_id) as active:
+            try:
+                response = await self._achat(
+                    model=model_name,
+                    messages=self._answer_messages(question, transcript, system_prompt),
+                    bypass_cache=bypass_cache,
+                    stage="answer",
+                )
+            except CircuitOpenError:
+                active.set_attribute("skipped", True)
+                return None
+            return response.content
+
+    def _prefix_messages(self, transcript: str, system_prompt: str) -> List[Dict[str, str]]:
+        """Messages shared verbatim by every answer call in a run.
+
+        Keeping the system prompt and transcript as an identical leading prefix
+        (with the per-question text last) lets the provider reuse its prompt
+        cache across all questions and models.
+        """
+
         if self._client is None:
             raise RuntimeError("Live model invocation requested without an OpenAI client.")
         if not system_prompt:
             raise ValueError("System prompt is required for live model execution.")
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"Transcript:\n{transcript}"},
+        ]
+
+    def _answer_messages(
+        self,
+        question: ClarifyingQuestion,
+        transcript: str,
+        system_prompt: str,
+    ) -> List[Dict[str, str]]:
+        question_content = (
+            "Question:\n" f"{question.prompt}\n\n" "Respond concisely in 3 sentences or fewer."
+        )
+        return [
+            *self._prefix_messages(transcript, system_prompt),
+            {"role": "user", "content": question_content},
+        ]
+
+    def _batch_messages(
+        self,
+        questions: List[ClarifyingQuestion],
+        transcript: str,
+        system_prompt: str,
+    ) -> List[Dict[str, str]]:
+        payload = [
+            {"id": self.question_identifier(question, index), "question": question.prompt}
+            for index, question in enumerate(questions, start=1)
+        ]
+        questions_content = (
+            "Questions (JSON):\n"
+            f"{json.dumps(payload, ensure_ascii=False)}\n\n"
+            "Answer every question, each concisely in 3 sentences or fewer. Return only a JSON "
+            'object of the form {"answers": [{"id": "<question id>", "answer": "<answer>"}]}.'
+        )
+        return [
+            *self._prefix_messages(transcript, system_prompt),
+            {"role": "user", "content": questions_content},
+        ]
+
+    @staticmethod
+    def _parse_batch_answers(content: str) -> Dict[str, str]:
+        """Map question identifiers to answers; malformed entries are dropped."""
+
+        text = content.strip()
+        if text.startswith("```"):
+            text = text.strip("`")
+            text = text.split("\n", 1)[1] if "\n" in text else ""
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            PARSE_FALLBACKS.inc(stage="answer_batch")
+            return {}
+        items = data.get("answers", []) if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return {}
+        parsed: Dict[str, str] = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            identifier, answer = item.get("id"), item.get("answer")
+            if isinstance(identifier, str) and isinstance(answer, str) and answer.strip():
+                parsed[identifier] = answer.strip()
+        return parsed
+
+    @staticmethod
+    def _prompt_cache_key(messages: List[Dict[str, str]]) -> str:
+        """Route requests sharing a message prefix to the same provider cache."""
+
+        return content_hash(json.dumps(messages[:-1], ensure_ascii=False, sort_keys=True))[:16]
+
+    def _chat_params(self) -> Dict[str, Any]:
+        return {
+            "temperature": self.settings.model.temperature,
+            "max_tokens": self.settings.model.max_output_tokens,
+            "reasoning_effort": self.settings.model.reasoning_effort,
+            "max_reasoning_tokens": self.settings.model.max_reasoning_tokens,
+        }
+
+    def _cache_lookup(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        params: Dict[str, Any],
+        bypass_cache: bool,
+    ) -> tuple[str | None, Any]:
+        if self._response_cache is None or bypass_cache:
+            return None, None
+        cache_key = ResponseCache.key_for(model, messages, **params)
+        cached = self._response_cache.get(cache_key)
+        with self._lock:
+            if cached is not None:
+                self._cache_hits += 1
+            else:
+                self._cache_misses += 1
+        return cache_key, cached
+
+    def _cache_store(self, cache_key: str | None, response: Any) -> None:
+        if (
+            cache_key is not None
+            and self._response_cache is not None
+            and isinstance(response, dict)
+        ):
+            self._response_cache.set(cache_key, response)
+
+    def _chat(
+        self,
+        *,
+        model: str,
+        messages: List[Dict[str, str]],
+        bypass_cache: bool = False,
+        stage: str = "invoke",
+    ) -> ModelResponse:
+        """Call the client, serving byte-identical requests from the response cache."""
+
+        params = self._chat_params()
+        cache_key, cached = self._cache_lookup(model, messages, params, bypass_cache)
+        if cached is not None:
+            MODEL_CALLS.inc(model=model, stage=stage, outcome="cached")
+            return self._to_model_response(cached, model, messages, stage, from_cache=True)
+
+        self.raise_if_cancelled()
+        timeout = self._call_timeout()
         self._register_call()
-        user_content = (
-            "Transcript:\n"
-            f"{transcript}\n\n"
-            "Question:\n"
-            f"{question.prompt}\n\n"
-            "Respond concisely in 3 sentences or fewer."
+        client = self._client
+        assert client is not None  # for type checkers
+        prompt_cache_key = self._prompt_cache_key(messages)
+
+        def _send() -> Any:
+            return client.chat(
+                model=model,
+                messages=messages,
+                prompt_cache_key=prompt_cache_key,
+                timeout=timeout,
+                cancellation=self.cancellation,
+                **params,
+            )
+
+        try:
+            with _observe_call(model, stage):
+                if self._hedger is None:
+                    response = _send()
+                else:
+                    response = self._hedger.call(model, _send, self._reserve_hedge)
+        except CircuitOpenError as exc:
+            self._refund_call(exc)
+            raise
+        self._cache_store(cache_key, response)
+        return self._to_model_response(response, model, messages, stage)
+
+    async def _achat(
+        self,
+        *,
+        model: str,
+        messages: List[Dict[str, str]],
+        bypass_cache: bool = False,
+        stage: str = "invoke",
+    ) -> ModelResponse:
+        """Async :meth:`_chat` built on ``OpenAIClient.achat``."""
+
+        params = self._chat_params()
+        cache_key, cached = await self._offload_cache_io(
+            self._cache_lookup, model, messages, params, bypass_cache
         )
-        response = self._client.chat(
-            model=model_name,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_content},
-            ],
-            temperature=self.settings.model.temperature,
-            max_tokens=self.settings.model.max_output_tokens,
-            reasoning_effort=self.settings.model.reasoning_effort,
-            max_reasoning_tokens=self.settings.model.max_reasoning_tokens,
+        if cached is not None:
+            MODEL_CALLS.inc(model=model, stage=stage, outcome="cached")
+            return self._to_model_response(cached, model, messages, stage, from_cache=True)
+
+        self.raise_if_cancelled()
+        timeout = self._call_timeout()
+        self._register_call()
+        client = self._client
+        assert client is not None  # for type checkers
+        prompt_cache_key = self._prompt_cache_key(messages)
+
+        async def _send() -> Any:
+            async with self.call_limiter or contextlib.nullcontext():
+                return await client.achat(
+                    model=model,
+                    messages=messages,
+                    prompt_cache_key=prompt_cache_key,
+                    timeout=timeout,
+                    cancellation=self.cancellation,
+                    **params,
+                )
+
+        try:
+            with _observe_call(model, stage):
+                if self._hedger is None:
+                    pending = _send()
+                else:
+                    pending = self._hedger.acall(model, _send, self._reserve_hedge)
+                if self.cancellation is None:
+                    response = await pending
+                else:
+                    response = await self.cancellation.arace(pending)
+        except CircuitOpenError as exc:
+            self._refund_call(exc)
+            raise
+        await self._offload_cache_io(self._cache_store, cache_key, response)
+        return self._to_model_response(response, model, messages, stage)
+
+    async def _offload_cache_io(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a response-cache read or write off the event loop (it may hit SQLite)."""
+
+        if self._response_cache is None:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    def _to_model_response(
+        self,
+        response: Any,
+        model: str,
+        messages: List[Dict[str, str]],
+        stage: str,
+        *,
+        from_cache: bool = False,
+    ) -> ModelResponse:
+        """Extract content and record provider-reported (or estimated) usage."""
+
+        content = self._extract_content(response)
+        usage = extract_usage(response) or estimate_usage(messages, content, model)
+        self.ledger.record(stage, model, usage, from_cache=from_cache)
+        current_span().set_attributes(
+            cache_hit=from_cache,
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            cached_tokens=usage.cached_tokens,
         )
-        return self._extract_content(response)
+        return ModelResponse(content=content, tokens_used=usage.total_tokens, usage=usage)
 
     def _register_call(self) -> None:
-        if self._call_budget is not None and self._calls_made >= self._call_budget:
-            raise RuntimeError("Model call budget exceeded for this run.")
-        self._calls_made += 1
+        with self._lock:
+            if self._call_budget is not None and self._calls_made >= self._call_budget:
+                CALL_BUDGET_EXHAUSTED.inc()
+                raise RuntimeError("Model call budget exceeded for this run.")
+            self._calls_made += 1
+
+    def raise_if_cancelled(self) -> None:
+        """Refuse to start new work once the run's cancellation token fires."""
+
+        if self.cancellation is not None:
+            self.cancellation.raise_if_cancelled()
+
+    def _call_timeout(self) -> float | None:
+        """Per-call timeout budget: the configured timeout, cut to the deadline."""
+
+        if self.deadline is None:
+            return None
+        return self.deadline.budget(self.settings.model.timeout_seconds)
+
+    def _refund_call(self, exc: CircuitOpenError) -> None:
+        """Return budget for a call rejected before any request was sent."""
+
+        if exc.__cause__ is None:
+            with self._lock:
+                self._calls_made -= 1
+
+    def _reserve_hedge(self) -> bool:
+        """Charge a hedged duplicate against the call budget if room remains."""
+
+        try:
+            self._register_call()
+        except RuntimeError:
+            return False
+        return True
 
     @staticmethod
     def _fabricate_answer(question: ClarifyingQuestion) -> str:
@@ -141,10 +891,8 @@ class ModelRunner:
             if response.get("status") == "incomplete":
                 details = response.get("incomplete_details", {})
                 model_name = response.get("model", "unknown-model")
-                print(
-                    f"[visibility] Warning: {model_name} response incomplete -> {details}",
-                    flush=True,
-                )
+                INCOMPLETE_RESPONSES.inc(model=model_name)
+                logger.warning("%s response incomplete -> %s", model_name, details)
             if "output_text" in response:
                 text = str(response.get("output_text", "")).strip()
                 if text:
@@ -1,10 +1,125 @@
-"""Assemble prompt payloads for model execution."""
+"""Assemble prompt payloads for model execution.
+
+Templates use ``{{ name }}`` placeholders (one space inside each brace pair);
+anything else, such as ``{{CLIENT_NAME}}``, is literal prompt text. Each file
+is compiled once per process into literal and placeholder segments and
+recompiled only when its mtime changes.
+"""
 
 from __future__ import annotations
 
 import json
+import re
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Tuple
+
+from src.common.cache import content_hash
+
+_PLACEHOLDER = re.compile(r"\{\{ ([A-Za-z_][A-Za-z0-9_]*) \}\}")
+
+
+class TemplateError(ValueError):
+    """Raised when a template's placeholders do not match its context."""
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A template split into ``literals[0] field[0] literals[1] ... literals[-1]``."""
+
+    literals: Tuple[str, ...]
+    fields: Tuple[str, ...]
+    digest: str
+    source: str = "<string>"
+    mtime_ns: int = 0
+
+    @property
+    def placeholders(self) -> frozenset[str]:
+        return frozenset(self.fields)
+
+    def validate(self, expected: Iterable[str]) -> None:
+        """Raise unless the template uses exactly the ``expected`` placeholders."""
+
+        expected = frozenset(expected)
+        missing = sorted(expected - self.placeholders)
+        unknown = sorted(self.placeholders - expected)
+        if missing:
+            raise TemplateError(f"{self.source} has no placeholder for {missing}.")
+        if unknown:
+            raise TemplateError(f"{self.source} uses unknown placeholders {unknown}.")
+
+    def render(self, **context: Any) -> str:
+        if context.keys() != self.placeholders:
+            self.validate(context)
+        values = {key: _stringify(value) for key, value in context.items()}
+        parts = [self.literals[0]]
+        for field, literal in zip(self.fields, self.literals[1:]):
+            parts.append(values[field])
+            parts.append(literal)
+        return "".join(parts)
+
+
+def _stringify(value: Any) -> str:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, indent=2)
+    return str(value)
+
+
+def compile_template(
+    template: str,
+    *,
+    source: str = "<string>",
+    mtime_ns: int = 0,
+    placeholders: Iterable[str] | None = None,
+) -> CompiledTemplate:
+    """Split ``template`` into segments, validating ``placeholders`` if given."""
+
+    pieces = _PLACEHOLDER.split(template)
+    compiled = CompiledTemplate(
+        literals=tuple(pieces[0::2]),
+        fields=tuple(pieces[1::2]),
+        digest=content_hash(template),
+        source=source,
+        mtime_ns=mtime_ns,
+    )
+    if placeholders is not None:
+        compiled.validate(placeholders)
+    return compiled
+
+
+class TemplateRegistry:
+    """Process-wide cache of compiled template files keyed by path."""
+
+    def __init__(self) -> None:
+        self._templates: Dict[Path, CompiledTemplate] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, *, placeholders: Iterable[str] | None = None) -> CompiledTemplate:
+        path = Path(path).resolve()
+        mtime_ns = path.stat().st_mtime_ns
+        with self._lock:
+            compiled = self._templates.get(path)
+        if compiled is None or compiled.mtime_ns != mtime_ns:
+            compiled = compile_template(load_template(path), source=str(path), mtime_ns=mtime_ns)
+            with self._lock:
+                self._templates[path] = compiled
+        if placeholders is not None:
+            compiled.validate(placeholders)
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+
+
+TEMPLATES = TemplateRegistry()
+
+
+def get_template(path: Path, *, placeholders: Iterable[str] | None = None) -> CompiledTemplate:
+    """Compiled template for ``path`` from the process-wide registry."""
+
+    return TEMPLATES.get(path, placeholders=placeholders)
 
 
 def load_template(path: Path) -> str:
@@ -14,26 +129,29 @@ def load_template(path: Path) -> str:
 
 
 def render_template(template: str, **context: Any) -> str:
-    """Render a template using naive string replacement."""
+    """Render a template string; every placeholder must be supplied."""
 
-    rendered = template
-    for key, value in context.items():
-        placeholder = f"{{{{ {key} }}}}"
-        if isinstance(value, (dict, list)):
-            value = json.dumps(value, indent=2)
-        rendered = rendered.replace(placeholder, str(value))
-    return rendered
+    return compile_template(template).render(**context)
 
 
 def build_prompt(template_path: Path, **context: Any) -> Dict[str, str]:
     """Couple a system template with runtime context for the model runner."""
 
-    template = load_template(template_path)
-    message = render_template(template, **context)
+    message = get_template(template_path).render(**context)
     return {
         "template": str(template_path),
         "message": message,
     }
 
 
-__all__ = ["load_template", "render_template", "build_prompt"]
+__all__ = [
+    "CompiledTemplate",
+    "TEMPLATES",
+    "TemplateError",
+    "TemplateRegistry",
+    "build_prompt",
+    "compile_template",
+    "get_template",
+    "load_template",
+    "render_template",
+]
@@ -2,46 +2,169 @@
 
 from __future__ import annotations
 
+import copy
 import json
+import threading
+import time
 from pathlib import Path
-from typing import Iterable, List
+from typing import Callable, Dict, Iterable, List
 
 from src.agents.visibility import pillars as stub_pillars
 from src.agents.visibility import questions as stub_questions
 from src.agents.visibility.model_runner import ModelRunner
-from src.agents.visibility.prompt_assembler import load_template, render_template
+from src.agents.visibility.prompt_assembler import get_template
+from src.common.cache import StageCache, content_hash
 from src.common.config import Settings
-from src.common.types import ClarifyingQuestion, NarrativePillar, StoryDocument
+from src.common.metrics import ANSWER_STAGE_SECONDS, PARSE_FALLBACKS
+from src.common.tracing import current_span, span
+from src.common.types import ClarifyingQuestion, NarrativePillar, QuestionAnswer, StoryDocument
 
 ASSETS_DIR = Path(__file__).resolve().parents[3] / "assets" / "visibility"
 
 
+class _AnswerClock:
+    """Time from the start of answering until each model's last answer.
+
+    Models that produced no answer (all cut off) are charged the full stage.
+    """
+
+    def __init__(
+        self,
+        models: Iterable[str],
+        on_answer: Callable[[QuestionAnswer], None] | None,
+    ) -> None:
+        self.models = list(models)
+        self._on_answer = on_answer
+        self._started = time.perf_counter()
+        self._finished: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, answer: QuestionAnswer) -> None:
+        with self._lock:
+            self._finished[answer.model] = time.perf_counter()
+        if self._on_answer is not None:
+            self._on_answer(answer)
+
+    def observe(self) -> None:
+        ended = time.perf_counter()
+        for model in self.models:
+            finished = self._finished.get(model, ended)
+            ANSWER_STAGE_SECONDS.observe(finished - self._started, model=model)
+
+
 class VisibilityLLMService:
     """Use GPT-5 (live mode) or heuristics (stub mode) to drive the workflow."""
 
-    def __init__(self, settings: Settings, runner: ModelRunner | None = None) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        runner: ModelRunner | None = None,
+        cache: StageCache | None = None,
+    ) -> None:
         self.settings = settings
         self.runner = runner or ModelRunner(settings)
-        self.system_prompt = load_template(ASSETS_DIR / "system.prompt.md")
-        self.extract_template = load_template(ASSETS_DIR / "extract_pillars.prompt.md")
-        self.questions_template = load_template(ASSETS_DIR / "generate_questions.prompt.md")
+        self.cache = cache
+        system = get_template(ASSETS_DIR / "system.prompt.md", placeholders=())
+        self.system_prompt = system.render()
+        self.extract_template = get_template(
+            ASSETS_DIR / "extract_pillars.prompt.md", placeholders=("transcript",)
+        )
+        self.questions_template = get_template(
+            ASSETS_DIR / "generate_questions.prompt.md", placeholders=("pillars_json",)
+        )
+        self.prompt_version = content_hash(
+            system.digest + self.extract_template.digest + self.questions_template.digest
+        )[:12]
+
+    def with_runner(self, runner: ModelRunner) -> VisibilityLLMService:
+        """Copy of this service (sharing its loaded templates) driving ``runner``."""
+
+        service = copy.copy(self)
+        service.runner = runner
+        return service
 
     @property
     def is_live(self) -> bool:
         return self.runner.is_live
 
-    def extract_pillars(self, document: StoryDocument, target_count: int = 3) -> List[NarrativePillar]:
+    def extract_pillars(
+        self, document: StoryDocument, target_count: int = 3
+    ) -> List[NarrativePillar]:
+        with span("service.extract_pillars", cache_hit=self.cache is not None) as active:
+            if self.cache is None:
+                pillars = self._extract_pillars(document, target_count)
+            else:
+                pillars = self.cache.get_or_compute(
+                    "extract_pillars",
+                    lambda: self._extract_pillars(document, target_count),
+                    **self._pillars_cache_key(document, target_count),
+                )
+            if pillars is None:
+                pillars = self._fallback_pillars(document, target_count)
+            active.set_attribute("pillars", len(pillars))
+            return pillars
+
+    async def aextract_pillars(
+        self,
+        document: StoryDocument,
+        target_count: int = 3,
+    ) -> List[NarrativePillar]:
+        """Async :meth:`extract_pillars`."""
+
+        with span("service.extract_pillars", cache_hit=self.cache is not None) as active:
+            if self.cache is None:
+                pillars = await self._aextract_pillars(document, target_count)
+            else:
+                pillars = await self.cache.aget_or_compute(
+                    "extract_pillars",
+                    lambda: self._aextract_pillars(document, target_count),
+                    **self._pillars_cache_key(document, target_count),
+                )
+            if pillars is None:
+                pillars = self._fallback_pillars(document, target_count)
+            active.set_attribute("pillars", len(pillars))
+            return pillars
+
+    def _extract_pillars(
+        self, document: StoryDocument, target_count: int
+    ) -> List[NarrativePillar] | None:
+        """Pillars for ``document``, or ``None`` (never cached) for an unusable reply."""
+
+        self.runner.raise_if_cancelled()
+        current_span().set_attribute("cache_hit", False)
         if not self.is_live:
-            return stub_pillars.extract_pillars(document.masked_text, target_count=target_count)
+            return self._fallback_pillars(document, target_count)
+        response = self.runner.invoke(self._pillars_messages(document), stage="extract_pillars")
+        return self._parse_pillars(response.content, target_count)
 
-        user_prompt = render_template(self.extract_template, transcript=document.masked_text)
-        response = self.runner.invoke(
-            [
-                {"role": "system", "content": self.system_prompt},
-                {"role": "user", "content": user_prompt},
-            ]
+    async def _aextract_pillars(
+        self, document: StoryDocument, target_count: int
+    ) -> List[NarrativePillar] | None:
+        self.runner.raise_if_cancelled()
+        current_span().set_attribute("cache_hit", False)
+        if not self.is_live:
+            return self._fallback_pillars(document, target_count)
+        response = await self.runner.ainvoke(
+            self._pillars_messages(document), stage="extract_pillars"
         )
-        data = self._parse_json(response.content)
+        return self._parse_pillars(response.content, target_count)
+
+    def _pillars_cache_key(self, document: StoryDocument, target_count: int) -> dict:
+        return {
+            "content": content_hash(document.masked_text),
+            "target_count": target_count,
+            **self._cache_scope(),
+        }
+
+    def _pillars_messages(self, document: StoryDocument) -> List[dict]:
+        user_prompt = self.extract_template.render(transcript=document.masked_text)
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def _parse_pillars(self, content: str, target_count: int) -> List[NarrativePillar] | None:
+        data = self._parse_json(content, "extract_pillars")
         pillars_data = data.get("pillars", [])
         pillars: List[NarrativePillar] = []
         for index, item in enumerate(pillars_data, start=1):
@@ -54,14 +177,86 @@ class VisibilityLLMService:
                 )
             )
         if not pillars:
-            return stub_pillars.extract_pillars(document.masked_text, target_count=target_count)
+            return None
         return pillars[:target_count]
 
+    @staticmethod
+    def _fallback_pillars(document: StoryDocument, target_count: int) -> List[NarrativePillar]:
+        return stub_pillars.extract_pillars(document.masked_text, target_count=target_count)
+
     def generate_questions(self, pillars: Iterable[NarrativePillar]) -> List[ClarifyingQuestion]:
         pillars_list = list(pillars)
+        with span("service.generate_questions", cache_hit=self.cache is not None) as active:
+            if self.cache is None:
+                questions = self._generate_questions(pillars_list)
+            else:
+                questions = self.cache.get_or_compute(
+                    "generate_questions",
+                    lambda: self._generate_questions(pillars_list),
+                    **self._questions_cache_key(pillars_list),
+                )
+            if questions is None:
+                questions = stub_questions.generate_questions(pillars_list)
+            active.set_attribute("questions", len(questions))
+            return questions
+
+    async def agenerate_questions(
+        self, pillars: Iterable[NarrativePillar]
+    ) -> List[ClarifyingQuestion]:
+        """Async :meth:`generate_questions`."""
+
+        pillars_list = list(pillars)
+        with span("service.generate_questions", cache_hit=self.cache is not None) as active:
+            if self.cache is None:
+                questions = await self._agenerate_questions(pillars_list)
+            else:
+                questions = await self.cache.aget_or_compute(
+                    "generate_questions",
+                    lambda: self._agenerate_questions(pillars_list),
+                    **self._questions_cache_key(pillars_list),
+                )
+            if questions is None:
+                questions = stub_questions.generate_questions(pillars_list)
+            active.set_attribute("questions", len(questions))
+            return questions
+
+    def _generate_questions(
+        self, pillars_list: List[NarrativePillar]
+    ) -> List[ClarifyingQuestion] | None:
+        """Questions for ``pillars_list``, or ``None`` (never cached) for an unusable reply."""
+
+        self.runner.raise_if_cancelled()
+        current_span().set_attribute("cache_hit", False)
+        if not self.is_live:
+            return stub_questions.generate_questions(pillars_list)
+        response = self.runner.invoke(
+            self._questions_messages(pillars_list), stage="generate_questions"
+        )
+        return self._parse_questions(response.content)
+
+    async def _agenerate_questions(
+        self, pillars_list: List[NarrativePillar]
+    ) -> List[ClarifyingQuestion] | None:
+        self.runner.raise_if_cancelled()
+        current_span().set_attribute("cache_hit", False)
         if not self.is_live:
             return stub_questions.generate_questions(pillars_list)
+        response = await self.runner.ainvoke(
+            self._questions_messages(pillars_list), stage="generate_questions"
+        )
+        return self._parse_questions(response.content)
+
+    def _questions_cache_key(self, pillars_list: List[NarrativePillar]) -> dict:
+        pillars_key = json.dumps(
+            [
+                [pillar.title, pillar.summary, pillar.evidence, pillar.priority]
+                for pillar in pillars_list
+            ],
+            ensure_ascii=False,
+        )
+        return {"content": content_hash(pillars_key), **self._cache_scope()}
 
+    def _questions_messages(self, pillars_list: List[NarrativePillar]) -> List[dict]:
         payload = [
             {
                 "index": index,
@@ -71,14 +266,15 @@ class VisibilityLLMService:
             }
             for index, pillar in enumerate(pillars_list, start=1)
         ]
-        user_prompt = render_template(self.questions_template, pillars_json=json.dumps(payload, ensure_ascii=False))
-        response = self.runner.invoke(
-            [
-                {"role": "system", "content": self.system_prompt},
-                {"role": "user", "content": user_prompt},
-            ]
-        )
-        data = self._parse_json(response.content)
+        pillars_json = json.dumps(payload, ensure_ascii=False)
+        user_prompt = self.questions_template.render(pillars_json=pillars_json)
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def _parse_questions(self, content: str) -> List[ClarifyingQuestion] | None:
+        data = self._parse_json(content, "generate_questions")
         questions_data = data.get("questions", [])
         questions: List[ClarifyingQuestion] = []
         for item in questions_data:
@@ -95,7 +291,7 @@ class VisibilityLLMService:
                 )
             )
         if not questions:
-            return stub_questions.generate_questions(pillars_list)
+            return None
         return questions
 
     def build_answers(
@@ -104,17 +300,50 @@ class VisibilityLLMService:
         questions: List[ClarifyingQuestion],
         *,
         transcript: str,
+        on_answer: Callable[[QuestionAnswer], None] | None = None,
+    ):
+        clock = _AnswerClock(models, on_answer)
+        with span("service.build_answers", questions=len(questions)) as active:
+            answers = self.runner.answer_matrix(
+                clock.models,
+                questions,
+                transcript=transcript,
+                system_prompt=self.system_prompt,
+                on_answer=clock,
+            )
+            clock.observe()
+            active.set_attribute("answers", len(answers))
+            return answers
+
+    async def abuild_answers(
+        self,
+        models: Iterable[str],
+        questions: List[ClarifyingQuestion],
+        *,
+        transcript: str,
+        on_answer: Callable[[QuestionAnswer], None] | None = None,
     ):
-        all_answers = []
-        for model_name in models:
-            answers = self.runner.answer_questions(
-                model_name,
+        """Async :meth:`build_answers`."""
+
+        clock = _AnswerClock(models, on_answer)
+        with span("service.build_answers", questions=len(questions)) as active:
+            answers = await self.runner.aanswer_matrix(
+                clock.models,
                 questions,
                 transcript=transcript,
                 system_prompt=self.system_prompt,
+                on_answer=clock,
             )
-            all_answers.extend(answers)
-        return all_answers
+            clock.observe()
+            active.set_attribute("answers", len(answers))
+            return answers
+
+    def _cache_scope(self) -> dict:
+        return {
+            "mode": self.runner.mode,
+            "model": self.settings.model.name,
+            "prompts": self.prompt_version,
+        }
 
     @staticmethod
     def _identifier_from(pillar_index: int, kind: str) -> str:
@@ -122,10 +351,11 @@ class VisibilityLLMService:
         return f"sp{pillar_index}_{suffix}"
 
     @staticmethod
-    def _parse_json(raw: str) -> dict:
+    def _parse_json(raw: str, stage: str) -> dict:
         try:
             return json.loads(raw)
         except json.JSONDecodeError:
+            PARSE_FALLBACKS.inc(stage=stage)
             return {}
 
 
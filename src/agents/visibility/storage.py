@@ -45,6 +45,7 @@ def _serialize_questions(
                         "model": answer.model,
                         "answer": answer.answer,
                         "ai_provider_inferred": answer.ai_provider_inferred,
+                        "skipped": answer.skipped,
                     }
                     for answer in answers
                 ],
@@ -79,6 +80,11 @@ def serialize_result(result: VisibilityResult) -> dict:
         },
     }
 
+    payload["partial"] = result.partial
+    payload["unanswered"] = result.unanswered
+    if result.usage is not None:
+        payload["usage"] = result.usage
+
     metadata: Dict[str, object] = {
         "generated_at": result.generated_at.isoformat(),
         "models_run": result.models_run,
@@ -0,0 +1,234 @@
+"""Admission control for pipelines started by the API."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent import futures
+import math
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Callable, Deque, Dict, Iterator
+
+from src.common.cancellation import CancellationToken
+
+# HTTP statuses for the two ways a request can be turned away.
+QUEUE_FULL_STATUS = 429
+WAIT_TIMEOUT_STATUS = 503
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised when a lane cannot admit a pipeline (queue full or wait too long)."""
+
+    def __init__(self, lane: str, status_code: int, retry_after: int, message: str) -> None:
+        super().__init__(message)
+        self.lane = lane
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+@dataclass
+class LaneStats:
+    admitted: int = 0
+    queued: int = 0
+    rejected_queue_full: int = 0
+    rejected_wait_timeout: int = 0
+
+
+class AdmissionLane:
+    """At most ``max_concurrent`` pipelines, plus a FIFO of ``max_queue`` waiters.
+
+    A waiter that is not admitted within ``max_wait_seconds`` is rejected
+    with 503; arrivals beyond the queue are rejected immediately with 429.
+    ``Retry-After`` is estimated from how long recent pipelines held a slot.
+    Must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_concurrent: int,
+        max_queue: int,
+        max_wait_seconds: float,
+        default_retry_after: int = 5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.max_wait_seconds = max_wait_seconds
+        self.default_retry_after = default_retry_after
+        self._clock = clock
+        self._active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._avg_hold: float | None = None
+        self.stats = LaneStats()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        if self._avg_hold is None:
+            return self.default_retry_after
+        backlog = (self.waiting + 1) / self.max_concurrent
+        return max(1, math.ceil(self._avg_hold * backlog))
+
+    async def acquire(self) -> None:
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            self.stats.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.stats.rejected_queue_full += 1
+            raise AdmissionRejected(
+                self.name,
+                QUEUE_FULL_STATUS,
+                self.retry_after(),
+                f"Too many {self.name} pipelines queued; retry later.",
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.stats.queued += 1
+        try:
+            done, _ = await asyncio.wait({waiter}, timeout=self.max_wait_seconds)
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        if not done:
+            self._abandon(waiter)
+            self.stats.rejected_wait_timeout += 1
+            raise AdmissionRejected(
+                self.name,
+                WAIT_TIMEOUT_STATUS,
+                self.retry_after(),
+                f"No {self.name} pipeline slot freed up within {self.max_wait_seconds:g}s.",
+            )
+        self.stats.admitted += 1
+
+    def release(self, held_seconds: float | None = None) -> None:
+        if held_seconds is not None:
+            self._avg_hold = (
+                held_seconds
+                if self._avg_hold is None
+                else 0.8 * self._avg_hold + 0.2 * held_seconds
+            )
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot straight to the next waiter.
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.acquire()
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.release(self._clock() - started)
+
+    @contextmanager
+    def thread_slot(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        cancellation: CancellationToken | None = None,
+    ) -> Iterator[None]:
+        """:meth:`slot` for a worker thread; the lane itself stays on ``loop``.
+
+        Cancelling ``cancellation`` while queued gives up the wait and raises
+        :class:`~src.common.cancellation.OperationCancelled`.
+        """
+
+        async def _acquire() -> None:
+            task = asyncio.current_task()
+            assert task is not None
+            remove = (
+                cancellation.add_callback(lambda: loop.call_soon_threadsafe(task.cancel))
+                if cancellation is not None
+                else None
+            )
+            try:
+                await self.acquire()
+            finally:
+                if remove is not None:
+                    remove()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_acquire(), loop).result()
+        except futures.CancelledError:
+            if cancellation is not None:
+                cancellation.raise_if_cancelled()
+            raise
+        started = self._clock()
+        try:
+            yield
+        finally:
+            loop.call_soon_threadsafe(self.release, self._clock() - started)
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # The slot was handed over just as we gave up; pass it on.
+            self.release()
+            return
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def snapshot(self) -> Dict[str, float | int]:
+        return {
+            **asdict(self.stats),
+            "active": self._active,
+            "waiting": self.waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+        }
+
+
+class AdmissionController:
+    """Separate lanes per execution mode so stub runs never queue behind live ones."""
+
+    def __init__(self, lanes: Dict[str, AdmissionLane]) -> None:
+        self.lanes = lanes
+
+    @classmethod
+    def from_env(cls) -> AdmissionController:
+        """Build ``live`` and ``stub`` lanes from ``ADMISSION_<LANE>_*`` variables."""
+
+        defaults = {"live": (4, 8, 30.0), "stub": (16, 64, 10.0)}
+        lanes = {}
+        for name, (concurrent, queue, wait) in defaults.items():
+            prefix = f"ADMISSION_{name.upper()}_"
+            lanes[name] = AdmissionLane(
+                name,
+                max_concurrent=int(os.getenv(prefix + "MAX_CONCURRENT", str(concurrent))),
+                max_queue=int(os.getenv(prefix + "MAX_QUEUE", str(queue))),
+                max_wait_seconds=float(os.getenv(prefix + "MAX_WAIT_SECONDS", str(wait))),
+            )
+        return cls(lanes)
+
+    def lane(self, mode: str) -> AdmissionLane:
+        return self.lanes[mode]
+
+    def snapshot(self) -> Dict[str, Dict[str, float | int]]:
+        return {name: lane.snapshot() for name, lane in self.lanes.items()}
+
+
+__all__ = [
+    "AdmissionController",
+    "AdmissionLane",
+    "AdmissionRejected",
+    "LaneStats",
+]
@@ -0,0 +1,101 @@
+"""Single-flight deduplication of identical concurrent API requests."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict
+
+from src.common.cache import LRUCache
+
+
+@dataclass
+class CoalesceStats:
+    """Counts of pipelines run versus requests served without one."""
+
+    leaders: int = 0
+    coalesced: int = 0
+    result_cache_hits: int = 0
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class RequestCoalescer:
+    """Share one in-flight run (and its recent result) between identical requests.
+
+    The first caller for a key starts ``factory()`` as a background task;
+    callers arriving while it runs await the same task. Each waiter is
+    shielded, so one client going away does not affect the others; the run
+    itself is cancelled only once every waiter has left. Results accepted by
+    ``cacheable`` are kept for ``ttl_seconds`` (``0`` disables the cache).
+    Must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 60.0,
+        max_entries: int = 128,
+        cacheable: Callable[[Any], bool] = lambda _: True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._results = (
+            LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds, clock=clock)
+            if ttl_seconds > 0
+            else None
+        )
+        self._cacheable = cacheable
+        self._flights: Dict[str, _Flight] = {}
+        self.stats = CoalesceStats()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        if self._results is not None:
+            cached = self._results.get(key)
+            if cached is not None:
+                self.stats.result_cache_hits += 1
+                return cached
+
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(task=asyncio.ensure_future(self._lead(key, factory)))
+            self._flights[key] = flight
+            self.stats.leaders += 1
+        else:
+            self.stats.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every waiter gave up; stop paying for a result nobody reads.
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+
+    async def _lead(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await factory()
+            if self._results is not None and self._cacheable(result):
+                self._results.set(key, result)
+            return result
+        finally:
+            flight = self._flights.get(key)
+            if flight is not None and flight.task is asyncio.current_task():
+                del self._flights[key]
+
+    def snapshot(self) -> Dict[str, int]:
+        return {**asdict(self.stats), "in_flight": self.in_flight}
+
+
+__all__ = ["CoalesceStats", "RequestCoalescer"]
@@ -0,0 +1,163 @@
+"""In-process job queue that runs pipelines off the request path."""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+from src.common.cancellation import CancellationToken, OperationCancelled
+from src.pipeline import STAGES
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+_FINISHED = {SUCCEEDED, FAILED, CANCELLED}
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the job queue is at capacity."""
+
+
+@dataclass
+class Job:
+    """A queued or running pipeline with its progress and outcome."""
+
+    id: str
+    created_at: float
+    status: str = QUEUED
+    stage: str | None = None
+    completed_stages: List[str] = field(default_factory=list)
+    result: Dict[str, Any] | None = None
+    error: str | None = None
+    finished_at: float | None = None
+    token: CancellationToken = field(default_factory=CancellationToken, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _FINISHED
+
+    def record_event(self, event: str, data: Dict[str, Any]) -> None:
+        """Pipeline ``on_event`` hook tracking stage progress."""
+
+        if event == "stage_started":
+            self.stage = data["stage"]
+        elif event == "stage_completed" and data["stage"] not in self.completed_stages:
+            self.completed_stages.append(data["stage"])
+
+    def as_dict(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "job_id": self.id,
+            "status": self.status,
+            "progress": {
+                "stage": self.stage,
+                "completed_stages": list(self.completed_stages),
+                "total_stages": len(STAGES),
+            },
+        }
+        if self.result is not None:
+            payload["result"] = self.result
+        if self.error is not None:
+            payload["error"] = self.error
+        return payload
+
+
+JobFunction = Callable[[Job], Dict[str, Any]]
+
+
+class JobManager:
+    """Bounded worker pool plus a capped queue of pipeline jobs.
+
+    At most ``max_workers`` jobs run at once and ``max_queue`` more may wait;
+    beyond that :meth:`submit` raises :class:`QueueFullError`. Finished jobs
+    are kept for ``ttl_seconds`` so clients can collect results.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 2,
+        max_queue: int = 16,
+        ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="visibility-job"
+        )
+
+    def submit(self, function: JobFunction) -> Job:
+        with self._lock:
+            self._evict_expired()
+            active = sum(1 for job in self._jobs.values() if not job.finished)
+            if active >= self.max_workers + self.max_queue:
+                raise QueueFullError("Job queue is full; retry later.")
+            job = Job(id=uuid.uuid4().hex, created_at=self._clock())
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, function)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            self._evict_expired()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Job | None:
+        job = self.get(job_id)
+        if job is not None and not job.finished:
+            job.token.cancel("cancelled by client")
+            if job.status == QUEUED:
+                self._finish(job, CANCELLED, error="cancelled by client")
+        return job
+
+    def shutdown(self) -> None:
+        """Cancel outstanding jobs and stop accepting work."""
+
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.token.cancel("server shutting down")
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: Job, function: JobFunction) -> None:
+        if job.token.cancelled:
+            return
+        job.status = RUNNING
+        try:
+            result = function(job)
+        except OperationCancelled as exc:
+            self._finish(job, CANCELLED, error=str(exc))
+        except Exception as exc:  # pragma: no cover - defensive
+            self._finish(job, FAILED, error=str(exc))
+        else:
+            job.result = result
+            self._finish(job, SUCCEEDED)
+
+    def _finish(self, job: Job, status: str, *, error: str | None = None) -> None:
+        job.error = error
+        job.finished_at = self._clock()
+        job.status = status
+
+    def _evict_expired(self) -> None:
+        now = self._clock()
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and now - job.finished_at >= self.ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+__all__ = ["Job", "JobManager", "QueueFullError"]
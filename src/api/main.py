@@ -2,33 +2,217 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import os
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Literal, Optional
 
 import anyio
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
-from src.common.config import load_settings
-from src.pipeline import run_pipeline
+from src.api.admission import AdmissionController, AdmissionRejected
+from src.api.coalesce import RequestCoalescer
+from src.api.jobs import Job, JobManager, QueueFullError
+from src.common.cache import content_hash, make_cache_key
+from src.common.cancellation import CancellationToken, OperationCancelled
+from src.common.config import Settings, load_settings
+from src.common.deadline import Deadline
+from src.common.metrics import REGISTRY, MetricFamily, render_metrics
+from src.common.openai_client import aclose_shared_clients
+from src.common.profiling import new_profile_id, profile_run
+from src.common.tracing import Tracer, get_tracer
+from src.pipeline import arun_pipeline, arun_pipeline_batch, run_pipeline
 
 DEFAULT_TIMEOUT_SECONDS = 180
+# Headroom for scoring and serializing a partial result before the hard timeout.
+DEADLINE_MARGIN_SECONDS = 5
+DISCONNECT_POLL_SECONDS = 0.5
+# nginx-style status for requests abandoned by the client.
+CLIENT_CLOSED_REQUEST = 499
+JOB_RETRY_AFTER_SECONDS = 30
+# Jobs outlive the HTTP request, so they get their own (longer) run budget.
+JOB_TIMEOUT_SECONDS = float(os.getenv("JOBS_TIMEOUT_SECONDS", "600"))
+BATCH_MAX_STORIES = 20
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+TRACE_HEADER = "X-Trace-Id"
+# Send ``X-Profile: 1`` to profile one /analyze run; its artifacts are named by X-Profile-Id.
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
 DEFAULT_ORIGINS = [
     "http://localhost:3000",
     "https://story-ai-visibility-fe.vercel.app",
 ]
 
-app = FastAPI(title="Brand Visibility API")
 
-origins = [origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", ",".join(DEFAULT_ORIGINS)).split(",") if origin.strip()]
+_job_manager: JobManager | None = None
+_coalescer: RequestCoalescer | None = None
+_admission: AdmissionController | None = None
+_settings: Settings | None = None
+_tracer: Tracer | None = None
 
+
+def get_app_settings() -> Settings:
+    """Return the settings resolved at startup (loaded from env on first use)."""
+
+    global _settings, _tracer
+    if _settings is None:
+        _settings = load_settings()
+        _tracer = get_tracer(_settings.tracing)
+    return _settings
+
+
+def get_app_tracer() -> Tracer | None:
+    """Return the tracer for :func:`get_app_settings`, or None when disabled."""
+
+    get_app_settings()
+    return _tracer
+
+
+def get_job_manager() -> JobManager:
+    """Return the process-wide job manager, creating it from env on first use."""
+
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager(
+            max_workers=int(os.getenv("JOBS_MAX_WORKERS", "2")),
+            max_queue=int(os.getenv("JOBS_MAX_QUEUE", "16")),
+            ttl_seconds=float(os.getenv("JOBS_TTL_SECONDS", "3600")),
+        )
+    return _job_manager
+
+
+def get_coalescer() -> RequestCoalescer:
+    """Return the process-wide ``/analyze`` coalescer, configured from env."""
+
+    global _coalescer
+    if _coalescer is None:
+        _coalescer = RequestCoalescer(
+            ttl_seconds=float(os.getenv("COALESCE_TTL_SECONDS", "60")),
+            max_entries=int(os.getenv("COALESCE_MAX_ENTRIES", "128")),
+            # Partial results depend on timing, so the next caller should retry.
+            cacheable=lambda result: not result.get("partial"),
+        )
+    return _coalescer
+
+
+def get_admission_controller() -> AdmissionController:
+    """Return the process-wide admission controller, configured from env."""
+
+    global _admission
+    if _admission is None:
+        _admission = AdmissionController.from_env()
+    return _admission
+
+
+def _api_metric_families() -> list[MetricFamily]:
+    """Admission-lane and coalescer state for ``/metrics``."""
+
+    families: list[MetricFamily] = []
+    if _admission is not None:
+        lanes = _admission.snapshot()
+        for key, kind in (
+            ("active", "gauge"),
+            ("waiting", "gauge"),
+            ("admitted", "counter"),
+            ("rejected_queue_full", "counter"),
+            ("rejected_wait_timeout", "counter"),
+        ):
+            suffix = "_total" if kind == "counter" else ""
+            families.append(
+                MetricFamily(
+                    f"visibility_admission_{key}{suffix}",
+                    kind,
+                    f"Admission lane {key.replace('_', ' ')}.",
+                    [("", {"lane": lane}, stats[key]) for lane, stats in lanes.items()],
+                )
+            )
+    if _coalescer is not None:
+        stats = _coalescer.snapshot()
+        for key in ("leaders", "coalesced", "result_cache_hits"):
+            families.append(
+                MetricFamily(
+                    f"visibility_analyze_{key}_total",
+                    "counter",
+                    f"/analyze requests: {key.replace('_', ' ')}.",
+                    [("", {}, stats[key])],
+                )
+            )
+    return families
+
+
+REGISTRY.add_collector(_api_metric_families)
+
+
+def _overloaded(exc: AdmissionRejected, mode: str) -> HTTPException:
+    return HTTPException(
+        status_code=exc.status_code,
+        detail={"code": "OVERLOADED", "message": str(exc), "mode": mode},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Resolve settings on startup; stop jobs and release OpenAI connections on shutdown."""
+
+    global _job_manager, _coalescer, _admission, _settings
+    _settings = None
+    get_app_settings()
+    yield
+    _settings = None
+    if _job_manager is not None:
+        _job_manager.shutdown()
+        _job_manager = None
+    _coalescer = None
+    _admission = None
+    await aclose_shared_clients()
+
+
+class TraceMiddleware:
+    """Open a root span per HTTP request and echo its ID as ``X-Trace-Id``."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        tracer = get_app_tracer() if scope["type"] == "http" else None
+        if tracer is None:
+            await self.app(scope, receive, send)
+            return
+
+        with tracer.span("http.request", method=scope["method"], path=scope["path"]) as root:
+
+            async def _send(message: dict) -> None:
+                if message["type"] == "http.response.start":
+                    root.set_attribute("status_code", message["status"])
+                    headers = list(message.get("headers", []))
+                    headers.append((TRACE_HEADER.lower().encode(), root.trace_id.encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, _send)
+
+
+app = FastAPI(title="Brand Visibility API", lifespan=lifespan)
+
+origins = [
+    origin.strip()
+    for origin in os.getenv("ALLOWED_ORIGINS", ",".join(DEFAULT_ORIGINS)).split(",")
+    if origin.strip()
+]
+
+app.add_middleware(TraceMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[TRACE_HEADER, PROFILE_ID_HEADER],
 )
 
 
@@ -38,6 +222,27 @@ class AnalyzeRequest(BaseModel):
     provider_aliases: Optional[list[str]] = Field(None, description="Additional aliases to mask")
     story_id: Optional[str] = Field(None, description="Optional story identifier to echo back")
     mode: Optional[str] = Field(None, description="Force 'stub' or 'live' execution")
+    answer_mode: Optional[Literal["per_question", "batched"]] = Field(
+        None, description="Answer questions per call or batched per model"
+    )
+
+
+class BatchAnalyzeRequest(BaseModel):
+    texts: list[str] = Field(
+        ..., min_length=1, max_length=BATCH_MAX_STORIES, description="Blog posts to analyse"
+    )
+    provider_name: Optional[str] = Field(None, description="Canonical AI provider name")
+    provider_aliases: Optional[list[str]] = Field(None, description="Additional aliases to mask")
+    mode: Optional[str] = Field(None, description="Force 'stub' or 'live' execution")
+    answer_mode: Optional[Literal["per_question", "batched"]] = Field(
+        None, description="Answer questions per call or batched per model"
+    )
+
+
+class JobAccepted(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
 
 
 class HealthResponse(BaseModel):
@@ -51,50 +256,324 @@ async def health() -> HealthResponse:
     return HealthResponse()
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus text exposition of pipeline, model and API metrics."""
+
+    return PlainTextResponse(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 def _resolve_mode(requested: Optional[str]) -> str:
     api_key = os.getenv("OPENAI_API_KEY")
     if requested:
         mode = requested.lower()
         if mode not in {"stub", "live"}:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="mode must be 'stub' or 'live'")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="mode must be 'stub' or 'live'"
+            )
         if mode == "live" and not api_key:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="OPENAI_API_KEY required for live mode")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="OPENAI_API_KEY required for live mode",
+            )
         return mode
     return "live" if api_key else "stub"
 
 
 def _default_provider_settings() -> tuple[str, list[str]]:
-    settings = load_settings()
+    settings = get_app_settings()
     return settings.provider.name, settings.provider.aliases
 
 
+async def _cancel_on_disconnect(http_request: Request, scope: anyio.CancelScope) -> None:
+    """Cancel ``scope`` as soon as the client goes away."""
+
+    while not scope.cancel_called:
+        if await http_request.is_disconnected():
+            scope.cancel()
+            return
+        await anyio.sleep(DISCONNECT_POLL_SECONDS)
+
+
+def _analyze_key(
+    request: AnalyzeRequest,
+    provider_name: str,
+    provider_aliases: list[str],
+    mode: str,
+    profile_id: str | None = None,
+) -> str:
+    # Profiled runs get a unique key so each one actually executes.
+    return make_cache_key(
+        "analyze",
+        content=content_hash(request.text),
+        provider_name=provider_name,
+        provider_aliases=list(provider_aliases),
+        mode=mode,
+        story_id=request.story_id,
+        answer_mode=request.answer_mode,
+        profile_id=profile_id,
+    )
+
+
+def _profile_id(http_request: Request, story_id: str | None) -> str | None:
+    requested = http_request.headers.get(PROFILE_HEADER, "").strip().lower() in {"1", "true", "yes"}
+    if requested or get_app_settings().profiling.enabled:
+        return new_profile_id(story_id)
+    return None
+
+
 @app.post("/analyze")
-async def analyze(request: AnalyzeRequest):
+async def analyze(request: AnalyzeRequest, http_request: Request, response: Response):
     provider_name_default, provider_aliases_default = _default_provider_settings()
     provider_name = request.provider_name or provider_name_default
     provider_aliases = request.provider_aliases or provider_aliases_default
     mode = _resolve_mode(request.mode)
+    profile_id = _profile_id(http_request, request.story_id)
 
-    def _execute() -> dict:
-        return run_pipeline(
-            text=request.text,
-            provider_name=provider_name,
-            provider_aliases=provider_aliases,
-            mode=mode,
-            story_id=request.story_id,
-        )
+    async def _run() -> dict:
+        token = CancellationToken()
+        # Time spent waiting for admission counts against the deadline.
+        deadline = Deadline.after(DEFAULT_TIMEOUT_SECONDS - DEADLINE_MARGIN_SECONDS)
+        try:
+            async with get_admission_controller().lane(mode).slot():
+                with profile_run(get_app_settings().profiling, profile_id) as profile:
+                    result = await arun_pipeline(
+                        text=request.text,
+                        provider_name=provider_name,
+                        provider_aliases=provider_aliases,
+                        mode=mode,
+                        story_id=request.story_id,
+                        settings=get_app_settings(),
+                        answer_mode=request.answer_mode,
+                        deadline=deadline,
+                        cancellation=token,
+                    )
+                    if profile is not None:
+                        profile.metadata.update(story_id=result["story_id"], mode=mode)
+                return result
+        except asyncio.CancelledError:
+            # Every coalesced caller left (disconnect or timeout); stop worker threads too.
+            token.cancel("abandoned")
+            raise
 
+    key = _analyze_key(request, provider_name, provider_aliases, mode, profile_id)
+    disconnect_scope = anyio.CancelScope()
+    watcher = asyncio.create_task(_cancel_on_disconnect(http_request, disconnect_scope))
     try:
-        with anyio.move_on_after(DEFAULT_TIMEOUT_SECONDS) as scope:
-            result = await anyio.to_thread.run_sync(_execute)
-        if scope.cancel_called:
+        with disconnect_scope:
+            with anyio.move_on_after(DEFAULT_TIMEOUT_SECONDS) as timeout_scope:
+                result = await get_coalescer().run(key, _run)
+        if disconnect_scope.cancel_called:
+            raise HTTPException(
+                status_code=CLIENT_CLOSED_REQUEST,
+                detail={"code": "CANCELLED", "message": "client disconnected", "mode": mode},
+            )
+        if timeout_scope.cancel_called:
             raise HTTPException(
                 status_code=status.HTTP_504_GATEWAY_TIMEOUT,
                 detail={"code": "TIMEOUT", "message": "Pipeline exceeded 180s", "mode": mode},
             )
     except HTTPException:
         raise
+    except AdmissionRejected as exc:
+        raise _overloaded(exc, mode) from exc
+    except OperationCancelled as exc:
+        raise HTTPException(
+            status_code=CLIENT_CLOSED_REQUEST,
+            detail={"code": "CANCELLED", "message": str(exc), "mode": mode},
+        ) from exc
     except Exception as exc:  # pragma: no cover - defensive
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
+        ) from exc
+    finally:
+        watcher.cancel()
 
+    if profile_id is not None:
+        response.headers[PROFILE_ID_HEADER] = profile_id
     return result
+
+
+def _format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+@app.post("/analyze/stream")
+async def analyze_stream(request: AnalyzeRequest) -> StreamingResponse:
+    """Server-sent events variant of ``/analyze``.
+
+    Emits ``stage_started``/``stage_completed`` (with pillars or questions),
+    one ``answer`` per model answer, then a final ``result`` with the scored
+    payload (or ``error``).
+    """
+
+    provider_name_default, provider_aliases_default = _default_provider_settings()
+    provider_name = request.provider_name or provider_name_default
+    provider_aliases = request.provider_aliases or provider_aliases_default
+    mode = _resolve_mode(request.mode)
+
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue[tuple[str, Any] | None] = asyncio.Queue()
+    token = CancellationToken()
+
+    def _publish(event: str, data: Any) -> None:
+        # Answers may be reported from worker threads.
+        loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+    async def _run() -> None:
+        deadline = Deadline.after(DEFAULT_TIMEOUT_SECONDS - DEADLINE_MARGIN_SECONDS)
+        try:
+            with anyio.move_on_after(DEFAULT_TIMEOUT_SECONDS) as scope:
+                async with get_admission_controller().lane(mode).slot():
+                    result = await arun_pipeline(
+                        text=request.text,
+                        provider_name=provider_name,
+                        provider_aliases=provider_aliases,
+                        mode=mode,
+                        story_id=request.story_id,
+                        settings=get_app_settings(),
+                        answer_mode=request.answer_mode,
+                        deadline=deadline,
+                        cancellation=token,
+                        on_event=_publish,
+                    )
+                _publish("result", result)
+            if scope.cancel_called:
+                token.cancel("timeout")
+                _publish(
+                    "error", {"code": "TIMEOUT", "message": "Pipeline exceeded 180s", "mode": mode}
+                )
+        except AdmissionRejected as exc:
+            # Headers are already sent, so overload is reported in-band.
+            _publish(
+                "error",
+                {
+                    "code": "OVERLOADED",
+                    "message": str(exc),
+                    "mode": mode,
+                    "retry_after": exc.retry_after,
+                },
+            )
+        except OperationCancelled:
+            pass
+        except Exception as exc:  # pragma: no cover - defensive
+            _publish("error", {"code": "INTERNAL", "message": str(exc), "mode": mode})
+        finally:
+            loop.call_soon_threadsafe(events.put_nowait, None)
+
+    async def _stream() -> AsyncIterator[str]:
+        worker = asyncio.create_task(_run())
+        try:
+            while (item := await events.get()) is not None:
+                yield _format_sse(*item)
+        finally:
+            # Reached early when the client disconnects mid-stream.
+            token.cancel("client disconnected")
+            worker.cancel()
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/analyze/batch")
+async def analyze_batch(request: BatchAnalyzeRequest) -> StreamingResponse:
+    """Analyse several posts in one request, streamed back as JSON lines.
+
+    Identical texts are analysed once. Each line is ``{"indices", "story_id",
+    "result"}`` (or ``"error"``) and is written as soon as that story finishes.
+    """
+
+    provider_name_default, provider_aliases_default = _default_provider_settings()
+    mode = _resolve_mode(request.mode)
+    token = CancellationToken()
+
+    async def _stream() -> AsyncIterator[str]:
+        items = arun_pipeline_batch(
+            request.texts,
+            provider_name=request.provider_name or provider_name_default,
+            provider_aliases=request.provider_aliases or provider_aliases_default,
+            mode=mode,
+            settings=get_app_settings(),
+            answer_mode=request.answer_mode,
+            deadline=Deadline.after(DEFAULT_TIMEOUT_SECONDS - DEADLINE_MARGIN_SECONDS),
+            cancellation=token,
+        )
+        completed = False
+        try:
+            # The whole batch occupies one slot; its calls share one limiter.
+            async with get_admission_controller().lane(mode).slot():
+                async for item in items:
+                    yield json.dumps(item.as_dict(), ensure_ascii=False, default=str) + "\n"
+            completed = True
+        except AdmissionRejected as exc:
+            completed = True
+            overload = {"code": "OVERLOADED", "error": str(exc), "retry_after": exc.retry_after}
+            yield json.dumps(overload) + "\n"
+        finally:
+            if not completed:
+                # The client disconnected mid-stream.
+                token.cancel("client disconnected")
+            await items.aclose()
+
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
+
+
+@app.post("/jobs", status_code=status.HTTP_202_ACCEPTED, response_model=JobAccepted)
+async def create_job(request: AnalyzeRequest) -> JobAccepted:
+    """Queue an analysis and return immediately; poll ``GET /jobs/{id}`` for progress."""
+
+    provider_name_default, provider_aliases_default = _default_provider_settings()
+    provider_name = request.provider_name or provider_name_default
+    provider_aliases = request.provider_aliases or provider_aliases_default
+    mode = _resolve_mode(request.mode)
+    loop = asyncio.get_running_loop()
+    lane = get_admission_controller().lane(mode)
+
+    def _run(job: Job) -> dict:
+        # Jobs count against the same lane as /analyze; a rejection fails the job.
+        with lane.thread_slot(loop, job.token):
+            return run_pipeline(
+                text=request.text,
+                provider_name=provider_name,
+                provider_aliases=provider_aliases,
+                mode=mode,
+                story_id=request.story_id,
+                settings=get_app_settings(),
+                answer_mode=request.answer_mode,
+                deadline=Deadline.after(JOB_TIMEOUT_SECONDS),
+                cancellation=job.token,
+                on_event=job.record_event,
+            )
+
+    try:
+        job = get_job_manager().submit(_run)
+    except QueueFullError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={"code": "QUEUE_FULL", "message": str(exc)},
+            headers={"Retry-After": str(JOB_RETRY_AFTER_SECONDS)},
+        ) from exc
+    return JobAccepted(job_id=job.id, status=job.status, status_url=f"/jobs/{job.id}")
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> dict:
+    """Report a job's status, stage progress and, once finished, its result."""
+
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown or expired job")
+    return job.as_dict()
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str) -> dict:
+    """Cancel a queued or running job."""
+
+    job = get_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown or expired job")
+    return job.as_dict()
@@ -7,6 +7,7 @@ import json
 from pathlib import Path
 
 from src.common.config import load_settings
+from src.common.profiling import new_profile_id, profile_run
 from src.pipeline import run_pipeline
 
 
@@ -14,8 +15,12 @@ def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Generate a visibility report from a transcript.")
     parser.add_argument("input", type=Path, help="Path to the transcript to ingest.")
     parser.add_argument("--story-id", dest="story_id", help="Identifier for the story or campaign.")
-    parser.add_argument("--source-url", dest="source_url", help="Optional source URL for the story.")
-    parser.add_argument("--client-name", dest="client_name", help="Client name referenced in the story.")
+    parser.add_argument(
+        "--source-url", dest="source_url", help="Optional source URL for the story."
+    )
+    parser.add_argument(
+        "--client-name", dest="client_name", help="Client name referenced in the story."
+    )
     parser.add_argument(
         "--provider-name",
         dest="provider_name",
@@ -39,6 +44,13 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Override model list for question answering (optional).",
     )
+    parser.add_argument(
+        "--answer-mode",
+        dest="answer_mode",
+        choices=["per_question", "batched"],
+        default=None,
+        help="Answer questions one call each or in one batched call per model (defaults from env).",
+    )
     parser.add_argument(
         "--output",
         dest="output",
@@ -46,6 +58,11 @@ def build_parser() -> argparse.ArgumentParser:
         default=Path("artifacts/visibility.json"),
         help="Where to store the generated report.",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write pstats, collapsed stacks and per-stage timings to PROFILE_OUTPUT_DIR.",
+    )
     return parser
 
 
@@ -57,16 +74,25 @@ def run_cli(args: argparse.Namespace) -> Path:
     provider_aliases = args.provider_aliases or settings.provider.aliases
 
     text = args.input.read_text(encoding="utf-8")
-    result = run_pipeline(
-        text=text,
-        provider_name=provider_name,
-        provider_aliases=provider_aliases,
-        mode=args.mode,
-        story_id=args.story_id,
-        client_name=args.client_name,
-        source_url=args.source_url,
-        models_override=args.models,
-    )
+    profile_id = new_profile_id(args.story_id) if getattr(args, "profile", False) else None
+    with profile_run(settings.profiling, profile_id) as profile:
+        result = run_pipeline(
+            text=text,
+            provider_name=provider_name,
+            provider_aliases=provider_aliases,
+            mode=args.mode,
+            story_id=args.story_id,
+            client_name=args.client_name,
+            source_url=args.source_url,
+            settings=settings,
+            models_override=args.models,
+            answer_mode=getattr(args, "answer_mode", None),
+        )
+        if profile is not None:
+            mode = args.mode or settings.model.mode
+            profile.metadata.update(story_id=result["story_id"], mode=mode)
+    if profile is not None:
+        args.profile_artifacts = {kind: str(path) for kind, path in profile.artifacts.items()}
 
     args.output.parent.mkdir(parents=True, exist_ok=True)
     args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
@@ -77,7 +103,10 @@ def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
     output_path = run_cli(args)
-    print(json.dumps({"output": str(output_path)}, indent=2))
+    report = {"output": str(output_path)}
+    if getattr(args, "profile_artifacts", None):
+        report["profile"] = args.profile_artifacts
+    print(json.dumps(report, indent=2))
 
 
 if __name__ == "__main__":
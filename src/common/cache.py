@@ -0,0 +1,378 @@
+"""Content-addressed caches for memoizing pipeline stages."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Mapping, Protocol, Sequence, TypeVar
+
+from src.common.config import CacheSettings, ModelSettings
+
+T = TypeVar("T")
+
+
+def content_hash(text: str) -> str:
+    """Return the SHA-1 hex digest used to address story content."""
+
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def make_cache_key(namespace: str, **parts: Any) -> str:
+    """Build a stable key from a namespace and JSON-serializable parts."""
+
+    canonical = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+class CacheBackend(Protocol):
+    """Minimal key/value interface shared by all cache backends."""
+
+    def get(self, key: str) -> Any | None:
+        ...
+
+    def set(self, key: str, value: Any) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU; values are deep-copied in and out."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl_seconds is not None and self._clock() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock(), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """On-disk cache storing pickled values, evicting least-recently-used rows."""
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = 4096,
+        ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Any | None:
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return pickle.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, blob, now, now),
+            )
+            if self.ttl_seconds is not None:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE stored_at < ?", (now - self.ttl_seconds,)
+                )
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                "SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+
+
+class TieredCache:
+    """Check a fast primary backend before falling back to a durable secondary."""
+
+    def __init__(self, primary: CacheBackend, secondary: CacheBackend) -> None:
+        self.primary = primary
+        self.secondary = secondary
+
+    def get(self, key: str) -> Any | None:
+        value = self.primary.get(key)
+        if value is not None:
+            return value
+        value = self.secondary.get(key)
+        if value is not None:
+            self.primary.set(key, value)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self.primary.set(key, value)
+        self.secondary.set(key, value)
+
+    def clear(self) -> None:
+        self.primary.clear()
+        self.secondary.clear()
+
+    def __len__(self) -> int:
+        return len(self.secondary)
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a single cached stage."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class StageCache:
+    """Memoize pipeline stages on top of a pluggable backend."""
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+        self._stats: Dict[str, CacheStats] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, stage: str, compute: Callable[[], T], **key_parts: Any) -> T:
+        """Return the cached value for ``stage`` or compute and store it."""
+
+        key, cached = self._lookup(stage, key_parts)
+        if cached is not None:
+            return cached
+        value = compute()
+        if value is not None:
+            self.backend.set(key, value)
+        return value
+
+    async def aget_or_compute(
+        self,
+        stage: str,
+        compute: Callable[[], Awaitable[T]],
+        **key_parts: Any,
+    ) -> T:
+        """Async :meth:`get_or_compute` for coroutine-producing stages.
+
+        Backend reads and writes run in a worker thread since they may hit SQLite.
+        """
+
+        key, cached = await asyncio.to_thread(self._lookup, stage, key_parts)
+        if cached is not None:
+            return cached
+        value = await compute()
+        if value is not None:
+            await asyncio.to_thread(self.backend.set, key, value)
+        return value
+
+    def _lookup(self, stage: str, key_parts: Dict[str, Any]) -> tuple[str, Any]:
+        key = make_cache_key(stage, **key_parts)
+        cached = self.backend.get(key)
+        with self._lock:
+            stats = self._stats.setdefault(stage, CacheStats())
+            if cached is not None:
+                stats.hits += 1
+            else:
+                stats.misses += 1
+        return key, cached
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return per-stage hit/miss counters."""
+
+        with self._lock:
+            return {
+                stage: {"hits": stats.hits, "misses": stats.misses, "hit_rate": stats.hit_rate}
+                for stage, stats in self._stats.items()
+            }
+
+
+class ResponseCache:
+    """Cache raw model responses keyed by a canonical hash of the request."""
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+        self.stats_counter = CacheStats()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(model: str, messages: Sequence[Mapping[str, Any]], **params: Any) -> str:
+        """Hash the model, messages and sampling parameters into a cache key."""
+
+        return make_cache_key("response", model=model, messages=list(messages), params=params)
+
+    def get(self, key: str) -> Any | None:
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.stats_counter.misses += 1
+            else:
+                self.stats_counter.hits += 1
+        return value
+
+    def set(self, key: str, response: Any) -> None:
+        self.backend.set(key, response)
+
+    def stats(self) -> Dict[str, float]:
+        """Return cumulative hit rate and calls saved by this cache."""
+
+        with self._lock:
+            return {
+                "hits": self.stats_counter.hits,
+                "misses": self.stats_counter.misses,
+                "hit_rate": self.stats_counter.hit_rate,
+                "saved_calls": self.stats_counter.hits,
+            }
+
+
+_STAGE_CACHES: Dict[tuple[int, str | None], StageCache] = {}
+_STAGE_CACHES_LOCK = threading.Lock()
+
+
+def build_stage_cache(settings: CacheSettings) -> StageCache:
+    """Create a stage cache from settings (memory-only unless a path is set)."""
+
+    memory = LRUCache(settings.max_entries)
+    if settings.path:
+        disk = SQLiteCache(Path(settings.path), max_entries=settings.max_disk_entries)
+        return StageCache(TieredCache(memory, disk))
+    return StageCache(memory)
+
+
+def get_stage_cache(settings: CacheSettings) -> StageCache | None:
+    """Return the process-wide stage cache for ``settings``, if enabled."""
+
+    if not settings.enabled:
+        return None
+    key = (settings.max_entries, settings.path)
+    with _STAGE_CACHES_LOCK:
+        cache = _STAGE_CACHES.get(key)
+        if cache is None:
+            cache = build_stage_cache(settings)
+            _STAGE_CACHES[key] = cache
+        return cache
+
+
+_RESPONSE_CACHES: Dict[tuple[str, int, float | None], ResponseCache] = {}
+
+
+def get_response_cache(settings: ModelSettings) -> ResponseCache | None:
+    """Return the process-wide on-disk response cache, if one is configured."""
+
+    if not settings.response_cache_path:
+        return None
+    key = (
+        settings.response_cache_path,
+        settings.response_cache_max_entries,
+        settings.response_cache_ttl_seconds,
+    )
+    with _STAGE_CACHES_LOCK:
+        cache = _RESPONSE_CACHES.get(key)
+        if cache is None:
+            backend = SQLiteCache(
+                Path(settings.response_cache_path),
+                max_entries=settings.response_cache_max_entries,
+                ttl_seconds=settings.response_cache_ttl_seconds,
+            )
+            cache = ResponseCache(backend)
+            _RESPONSE_CACHES[key] = cache
+        return cache
+
+
+__all__ = [
+    "content_hash",
+    "make_cache_key",
+    "CacheBackend",
+    "LRUCache",
+    "SQLiteCache",
+    "TieredCache",
+    "CacheStats",
+    "StageCache",
+    "ResponseCache",
+    "build_stage_cache",
+    "get_stage_cache",
+    "get_response_cache",
+]
@@ -0,0 +1,141 @@
+"""Cooperative cancellation shared by the API, pipeline and model clients."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Dict, List, TypeVar
+
+T = TypeVar("T")
+
+
+class OperationCancelled(RuntimeError):
+    """Raised instead of starting (or finishing) work for a cancelled run."""
+
+
+@dataclass
+class CancellationStats:
+    """Process-wide tally of model spend avoided by cancellation."""
+
+    cancelled_runs: int = 0
+    calls_avoided: int = 0
+    calls_aborted: int = 0
+
+
+_STATS = CancellationStats()
+_STATS_LOCK = threading.Lock()
+
+
+def _count(field_name: str) -> None:
+    with _STATS_LOCK:
+        setattr(_STATS, field_name, getattr(_STATS, field_name) + 1)
+
+
+class CancellationToken:
+    """Thread-safe, one-shot cancellation signal.
+
+    Work checks :meth:`raise_if_cancelled` before starting a model call,
+    sleeps through :meth:`wait` so backoff wakes up early, and wraps
+    in-flight async calls in :meth:`arace` so they are aborted outright.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.reason: str | None = None
+        self.calls_avoided = 0
+        self.calls_aborted = 0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        _count("cancelled_runs")
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run ``callback`` on cancellation (immediately if already cancelled).
+
+        Returns a function that unregisters the callback.
+        """
+
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+
+                def _remove() -> None:
+                    with self._lock:
+                        if callback in self._callbacks:
+                            self._callbacks.remove(callback)
+
+                return _remove
+        callback()
+        return lambda: None
+
+    def raise_if_cancelled(self) -> None:
+        """Raise :class:`OperationCancelled`, counting the model call it avoids."""
+
+        if self._event.is_set():
+            with self._lock:
+                self.calls_avoided += 1
+            _count("calls_avoided")
+            raise OperationCancelled(self.reason or "cancelled")
+
+    def wait(self, seconds: float) -> bool:
+        """Sleep up to ``seconds``; returns True as soon as the token is cancelled."""
+
+        return self._event.wait(seconds)
+
+    async def arace(self, awaitable: Awaitable[T]) -> T:
+        """Await ``awaitable`` but abort it as soon as the token is cancelled."""
+
+        self.raise_if_cancelled()
+        loop = asyncio.get_running_loop()
+        task = asyncio.ensure_future(awaitable)
+        signal = loop.create_future()
+
+        def _wake() -> None:
+            loop.call_soon_threadsafe(lambda: signal.done() or signal.set_result(None))
+
+        remove = self.add_callback(_wake)
+        aborted = False
+        try:
+            await asyncio.wait({task, signal}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            remove()
+            signal.cancel()
+            if not task.done():
+                # Also reached when the caller itself is cancelled.
+                task.cancel()
+                aborted = True
+        if aborted:
+            with self._lock:
+                self.calls_aborted += 1
+            _count("calls_aborted")
+            raise OperationCancelled(self.reason or "cancelled")
+        return task.result()
+
+
+def cancellation_stats() -> Dict[str, int]:
+    """Snapshot the process-wide cancellation counters."""
+
+    with _STATS_LOCK:
+        return asdict(_STATS)
+
+
+__all__ = [
+    "CancellationToken",
+    "OperationCancelled",
+    "CancellationStats",
+    "cancellation_stats",
+]
@@ -25,6 +25,22 @@ class ModelSettings:
     organization: str | None = None
     reasoning_effort: str | None = None
     max_reasoning_tokens: int | None = None
+    response_cache_path: str | None = None
+    response_cache_ttl_seconds: float | None = None
+    response_cache_max_entries: int = 1024
+    max_concurrency: int = 4
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http2: bool = False
+    rate_limit_rpm: float | None = None
+    rate_limit_tpm: float | None = None
+    answer_mode: str = "per_question"
+    hedge_percentile: float | None = None
+    hedge_min_samples: int = 5
+    circuit_failure_threshold: int = 5
+    circuit_reset_seconds: float = 30.0
+    latency_target_seconds: float | None = None
+    pricing: dict[str, dict[str, float]] = field(default_factory=dict)
 
 
 @dataclass
@@ -35,6 +51,33 @@ class StorageSettings:
     base_path: str = "visibility-results"
 
 
+@dataclass
+class CacheSettings:
+    """Settings for the content-addressed stage cache."""
+
+    enabled: bool = False
+    max_entries: int = 256
+    path: str | None = None
+    max_disk_entries: int = 4096
+
+
+@dataclass
+class TracingSettings:
+    """Settings for sampled span export."""
+
+    export_path: str | None = None
+    sample_rate: float = 1.0
+
+
+@dataclass
+class ProfilingSettings:
+    """Settings for opt-in per-run profiling."""
+
+    enabled: bool = False
+    output_dir: str = "artifacts/profiles"
+    sample_interval_ms: float = 5.0
+
+
 @dataclass
 class ProviderSettings:
     """Default provider metadata used throughout the pipeline."""
@@ -61,19 +104,38 @@ class Settings:
     model: ModelSettings
     storage: StorageSettings
     provider: ProviderSettings
+    cache: CacheSettings = field(default_factory=CacheSettings)
+    tracing: TracingSettings = field(default_factory=TracingSettings)
+    profiling: ProfilingSettings = field(default_factory=ProfilingSettings)
 
 
+def _safe_bool(value: str | None, default: bool = False) -> bool:
+    if value is None:
+        return default
+    value = value.strip().lower()
+    if not value:
+        return default
+    return value in {"1", "true", "yes", "on"}
 
 
 def _safe_int(value: str | None) -> int | None:
     if value is None:
         return None
     value = value.strip()
-    if not value or value.lower() == 'none':
+    if not value or value.lower() == "none":
         return None
     return int(value)
 
 
+def _safe_float(value: str | None) -> float | None:
+    if value is None:
+        return None
+    value = value.strip()
+    if not value or value.lower() == "none":
+        return None
+    return float(value)
+
+
 def _sanitize_optional(value: str | None) -> str | None:
     if value is None:
         return None
@@ -95,6 +157,19 @@ def _load_aliases(raw: str | None) -> list[str]:
         pass
     return [item.strip() for item in raw.split(",") if item.strip()]
 
+
+def _load_pricing(raw: str | None) -> dict[str, dict[str, float]]:
+    if not raw or not raw.strip():
+        return {}
+    loaded = json.loads(raw)
+    if not isinstance(loaded, dict):
+        raise ValueError("MODEL_PRICING must be a JSON object keyed by model name.")
+    return {
+        str(model): {str(key): float(value) for key, value in prices.items()}
+        for model, prices in loaded.items()
+    }
+
+
 def load_settings() -> Settings:
     """Load settings from environment variables with safe defaults."""
 
@@ -117,6 +192,22 @@ def load_settings() -> Settings:
         organization=os.getenv("OPENAI_ORG", None),
         reasoning_effort=_sanitize_optional(os.getenv("MODEL_REASONING_EFFORT")),
         max_reasoning_tokens=_safe_int(os.getenv("MODEL_MAX_REASONING_TOKENS")),
+        response_cache_path=_sanitize_optional(os.getenv("MODEL_RESPONSE_CACHE_PATH")),
+        response_cache_ttl_seconds=_safe_float(os.getenv("MODEL_RESPONSE_CACHE_TTL_SECONDS")),
+        response_cache_max_entries=int(os.getenv("MODEL_RESPONSE_CACHE_MAX_ENTRIES", "1024")),
+        max_concurrency=int(os.getenv("MODEL_MAX_CONCURRENCY", "4")),
+        http_max_connections=int(os.getenv("MODEL_HTTP_MAX_CONNECTIONS", "20")),
+        http_max_keepalive_connections=int(os.getenv("MODEL_HTTP_MAX_KEEPALIVE", "10")),
+        http2=_safe_bool(os.getenv("MODEL_HTTP2")),
+        rate_limit_rpm=_safe_float(os.getenv("MODEL_RATE_LIMIT_RPM")),
+        rate_limit_tpm=_safe_float(os.getenv("MODEL_RATE_LIMIT_TPM")),
+        answer_mode=os.getenv("MODEL_ANSWER_MODE", "per_question"),
+        hedge_percentile=_safe_float(os.getenv("MODEL_HEDGE_PERCENTILE")),
+        hedge_min_samples=int(os.getenv("MODEL_HEDGE_MIN_SAMPLES", "5")),
+        circuit_failure_threshold=int(os.getenv("MODEL_CIRCUIT_FAILURE_THRESHOLD", "5")),
+        circuit_reset_seconds=float(os.getenv("MODEL_CIRCUIT_RESET_SECONDS", "30")),
+        latency_target_seconds=_safe_float(os.getenv("MODEL_LATENCY_TARGET_SECONDS")),
+        pricing=_load_pricing(os.getenv("MODEL_PRICING")),
     )
     storage = StorageSettings(
         bucket=os.getenv("STORAGE_BUCKET", "local-cache"),
@@ -126,12 +217,37 @@ def load_settings() -> Settings:
         name=os.getenv("OPENAI_PROVIDER_NAME", "OpenAI"),
         aliases=_load_aliases(os.getenv("OPENAI_PROVIDER_ALIASES")),
     )
-    return Settings(model=model, storage=storage, provider=provider)
+    cache = CacheSettings(
+        enabled=_safe_bool(os.getenv("STAGE_CACHE_ENABLED")),
+        max_entries=int(os.getenv("STAGE_CACHE_MAX_ENTRIES", "256")),
+        path=_sanitize_optional(os.getenv("STAGE_CACHE_PATH")),
+        max_disk_entries=int(os.getenv("STAGE_CACHE_MAX_DISK_ENTRIES", "4096")),
+    )
+    tracing = TracingSettings(
+        export_path=_sanitize_optional(os.getenv("TRACE_EXPORT_PATH")),
+        sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "1.0")),
+    )
+    profiling = ProfilingSettings(
+        enabled=_safe_bool(os.getenv("PROFILE_ENABLED")),
+        output_dir=os.getenv("PROFILE_OUTPUT_DIR", "artifacts/profiles"),
+        sample_interval_ms=float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5")),
+    )
+    return Settings(
+        model=model,
+        storage=storage,
+        provider=provider,
+        cache=cache,
+        tracing=tracing,
+        profiling=profiling,
+    )
 
 
 __all__ = [
     "ModelSettings",
     "StorageSettings",
+    "CacheSettings",
+    "TracingSettings",
+    "ProfilingSettings",
     "ProviderSettings",
     "Settings",
     "load_settings",
@@ -0,0 +1,44 @@
+"""Wall-clock deadlines shared by every stage and model call of a run."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a run's deadline leaves no time for further work."""
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Absolute expiry on a monotonic clock."""
+
+    expires_at: float
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False, compare=False)
+
+    @classmethod
+    def after(cls, seconds: float, *, clock: Callable[[], float] = time.monotonic) -> Deadline:
+        return cls(expires_at=clock() + seconds, clock=clock)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self.clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self) -> None:
+        if self.expired:
+            raise DeadlineExceeded("Deadline exceeded.")
+
+    def budget(self, cap: float | None = None) -> float:
+        """Time left for one call, capped at ``cap``; raises once nothing is left."""
+
+        self.check()
+        remaining = self.remaining()
+        return remaining if cap is None else min(cap, remaining)
+
+
+__all__ = ["Deadline", "DeadlineExceeded"]
@@ -0,0 +1,212 @@
+"""Latency tracking and request hedging for slow model calls."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_WINDOW = 100
+DEFAULT_MIN_SAMPLES = 5
+
+
+class LatencyTracker:
+    """Rolling per-model latency samples used to pick hedge thresholds."""
+
+    def __init__(
+        self, window: int = DEFAULT_WINDOW, min_samples: int = DEFAULT_MIN_SAMPLES
+    ) -> None:
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(model)
+            if samples is None:
+                samples = deque(maxlen=self.window)
+                self._samples[model] = samples
+            samples.append(seconds)
+
+    def percentile(
+        self, model: str, quantile: float, min_samples: int | None = None
+    ) -> float | None:
+        """Nearest-rank latency percentile, or None until enough samples exist."""
+
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        if len(samples) < (self.min_samples if min_samples is None else min_samples):
+            return None
+        rank = max(1, math.ceil(quantile * len(samples)))
+        return samples[min(rank, len(samples)) - 1]
+
+
+@dataclass
+class HedgeStats:
+    """How often hedges were sent and how often the duplicate won."""
+
+    calls: int = 0
+    fired: int = 0
+    won: int = 0
+    skipped_budget: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = asdict(self)
+        payload["fire_rate"] = self.fired / self.calls if self.calls else 0.0
+        payload["win_rate"] = self.won / self.fired if self.fired else 0.0
+        return payload
+
+
+class Hedger:
+    """Send a duplicate request when the first one outlives the model's percentile.
+
+    ``allow_hedge`` is consulted before the duplicate is sent so callers can
+    charge it against a call budget (returning False suppresses the hedge).
+    The first successful response wins; the primary's error is only raised if
+    the hedge fails too.
+    """
+
+    def __init__(
+        self,
+        tracker: LatencyTracker,
+        *,
+        quantile: float,
+        min_samples: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 < quantile < 1:
+            raise ValueError("Hedge percentile must be between 0 and 1.")
+        self.tracker = tracker
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.stats = HedgeStats()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _count(self, field_name: str) -> None:
+        with self._lock:
+            setattr(self.stats, field_name, getattr(self.stats, field_name) + 1)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="visibility-hedge")
+            return self._executor
+
+    def _timed(self, model: str, call: Callable[[], T]) -> Callable[[], T]:
+        def _run() -> T:
+            started = self._clock()
+            result = call()
+            self.tracker.record(model, self._clock() - started)
+            return result
+
+        return _run
+
+    def call(self, model: str, call: Callable[[], T], allow_hedge: Callable[[], bool]) -> T:
+        """Run ``call``, sending one duplicate if it outlives the latency threshold."""
+
+        self._count("calls")
+        threshold = self.tracker.percentile(model, self.quantile, self.min_samples)
+        if threshold is None:
+            return self._timed(model, call)()
+
+        pool = self._pool()
+        primary = pool.submit(contextvars.copy_context().run, self._timed(model, call))
+        done, _ = wait([primary], timeout=threshold)
+        if done or not self._reserve(allow_hedge):
+            return primary.result()
+
+        hedge = pool.submit(contextvars.copy_context().run, self._timed(model, call))
+        pending: set[Future[T]] = {primary, hedge}
+        error: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._count("won")
+                    return future.result()
+                error = error or future.exception()
+        assert error is not None
+        raise error
+
+    async def acall(
+        self,
+        model: str,
+        call: Callable[[], Awaitable[T]],
+        allow_hedge: Callable[[], bool],
+    ) -> T:
+        """Async :meth:`call`; the losing request is cancelled."""
+
+        self._count("calls")
+        threshold = self.tracker.percentile(model, self.quantile, self.min_samples)
+
+        async def _timed() -> T:
+            started = self._clock()
+            result = await call()
+            self.tracker.record(model, self._clock() - started)
+            return result
+
+        if threshold is None:
+            return await _timed()
+
+        primary = asyncio.ensure_future(_timed())
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=threshold)
+            if done or not self._reserve(allow_hedge):
+                return await primary
+
+            hedge = asyncio.ensure_future(_timed())
+            tasks.append(hedge)
+            pending = {primary, hedge}
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._count("won")
+                        return task.result()
+                    error = error or task.exception()
+            assert error is not None
+            raise error
+        finally:
+            # Also covers the caller being cancelled mid-wait: nothing may outlive it.
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _reserve(self, allow_hedge: Callable[[], bool]) -> bool:
+        if not allow_hedge():
+            self._count("skipped_budget")
+            return False
+        self._count("fired")
+        return True
+
+
+_TRACKER = LatencyTracker()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Return the process-wide tracker so thresholds learn across runs."""
+
+    return _TRACKER
+
+
+__all__ = [
+    "LatencyTracker",
+    "HedgeStats",
+    "Hedger",
+    "get_latency_tracker",
+]
@@ -0,0 +1,372 @@
+"""In-process metrics rendered in the Prometheus text exposition format."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, TypeVar
+
+from src.common.cancellation import cancellation_stats
+from src.common.rate_limit import rate_limit_stats
+from src.common.resilience import endpoint_stats
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+@dataclass
+class MetricFamily:
+    """One metric with its samples, as produced by a collector.
+
+    Each sample is ``(suffix, labels, value)``; the suffix (``_bucket``,
+    ``_sum``, ``_count``) is empty for plain counters and gauges.
+    """
+
+    name: str
+    type: str
+    help: str
+    samples: List[Tuple[str, Dict[str, str], float]] = field(default_factory=list)
+
+    @classmethod
+    def by_model(cls, name: str, type: str, help: str, values: Dict[str, float]) -> MetricFamily:
+        return cls(
+            name, type, help, [("", {"model": model}, value) for model, value in values.items()]
+        )
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}.")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _labels(self, key: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.label_names, key))
+
+    def collect(self) -> MetricFamily:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            samples = [("", self._labels(key), value) for key, value in self._values.items()]
+        return MetricFamily(self.name, self.type, self.help, samples)
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    type = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    @contextmanager
+    def track(self, **labels: str) -> Iterator[None]:
+        """Count the enclosed block as in progress."""
+
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram of observed values."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._series.get(key, ([0] * len(self.buckets), 0.0, 0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._series[key] = (counts, total + value, count + 1)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock duration of the enclosed block."""
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, self.type, self.help)
+        with self._lock:
+            series = {
+                key: (list(counts), total, count)
+                for key, (counts, total, count) in self._series.items()
+            }
+        for key, (counts, total, count) in series.items():
+            labels = self._labels(key)
+            for bound, bucket_count in zip(self.buckets, counts):
+                family.samples.append(
+                    ("_bucket", {**labels, "le": _format_value(bound)}, bucket_count)
+                )
+            family.samples.append(("_bucket", {**labels, "le": "+Inf"}, count))
+            family.samples.append(("_sum", labels, total))
+            family.samples.append(("_count", labels, count))
+        return family
+
+
+Collector = Callable[[], Iterable[MetricFamily]]
+M = TypeVar("M", bound=_Metric)
+
+
+class MetricsRegistry:
+    """Metrics plus collectors that snapshot state kept elsewhere."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Collector] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: M) -> M:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered.")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def add_collector(self, collector: Collector) -> Callable[[], None]:
+        """Include ``collector``'s families in every render; returns a remover."""
+
+        with self._lock:
+            self._collectors.append(collector)
+
+        def _remove() -> None:
+            with self._lock:
+                if collector in self._collectors:
+                    self._collectors.remove(collector)
+
+        return _remove
+
+    def collect(self) -> List[MetricFamily]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        families = [metric.collect() for metric in metrics]
+        for collector in collectors:
+            families.extend(collector())
+        return families
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for family in self.collect():
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            for suffix, labels, value in family.samples:
+                lines.append(
+                    f"{family.name}{suffix}{_format_labels(labels)} {_format_value(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+def _runtime_families() -> Iterable[MetricFamily]:
+    """Expose cancellation, circuit-breaker and rate-limiter counters."""
+
+    cancelled = cancellation_stats()
+    for key in ("cancelled_runs", "calls_avoided", "calls_aborted"):
+        yield MetricFamily(
+            f"visibility_{key}_total",
+            "counter",
+            f"Cancellation: {key.replace('_', ' ')}.",
+            [("", {}, cancelled[key])],
+        )
+
+    endpoints = endpoint_stats()
+    yield MetricFamily.by_model(
+        "visibility_circuit_open",
+        "gauge",
+        "1 while a model's circuit breaker rejects calls.",
+        {model: 0 if stats["state"] == "closed" else 1 for model, stats in endpoints.items()},
+    )
+    yield MetricFamily.by_model(
+        "visibility_circuit_rejected_total",
+        "counter",
+        "Calls rejected by an open circuit.",
+        {model: stats["rejected"] for model, stats in endpoints.items()},
+    )
+    yield MetricFamily.by_model(
+        "visibility_model_concurrency_limit",
+        "gauge",
+        "Adaptive concurrency window per model.",
+        {model: stats["concurrency_limit"] for model, stats in endpoints.items()},
+    )
+
+    limiters = rate_limit_stats()
+    yield MetricFamily.by_model(
+        "visibility_rate_limit_wait_seconds_total",
+        "counter",
+        "Time spent waiting on the client-side rate limiter.",
+        {model: stats["total_wait_seconds"] for model, stats in limiters.items()},
+    )
+    yield MetricFamily.by_model(
+        "visibility_rate_limit_delayed_total",
+        "counter",
+        "Calls delayed by the client-side rate limiter.",
+        {model: stats["delayed"] for model, stats in limiters.items()},
+    )
+
+
+REGISTRY = MetricsRegistry()
+REGISTRY.add_collector(_runtime_families)
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "visibility_stage_duration_seconds",
+    "Wall-clock time per pipeline stage.",
+    labels=("stage",),
+)
+MODEL_CALL_SECONDS = REGISTRY.histogram(
+    "visibility_model_call_duration_seconds",
+    "Latency of live model calls (including retries) by model and stage.",
+    labels=("model", "stage"),
+)
+ANSWER_STAGE_SECONDS = REGISTRY.histogram(
+    "visibility_answer_stage_duration_seconds",
+    "Time from the start of the answering stage until each model's last answer.",
+    labels=("model",),
+)
+MODEL_CALLS = REGISTRY.counter(
+    "visibility_model_calls_total",
+    "Model calls by outcome (ok, error, cached).",
+    labels=("model", "stage", "outcome"),
+)
+MODEL_RETRIES = REGISTRY.counter(
+    "visibility_model_retries_total",
+    "Retried model call attempts.",
+    labels=("model",),
+)
+INCOMPLETE_RESPONSES = REGISTRY.counter(
+    "visibility_incomplete_responses_total",
+    "Responses the provider cut short (status=incomplete).",
+    labels=("model",),
+)
+CALL_BUDGET_EXHAUSTED = REGISTRY.counter(
+    "visibility_call_budget_exhausted_total",
+    "Model calls refused because the run's call budget was spent.",
+)
+PARSE_FALLBACKS = REGISTRY.counter(
+    "visibility_json_parse_fallbacks_total",
+    "Model outputs that were not valid JSON and fell back to defaults.",
+    labels=("stage",),
+)
+PIPELINES_IN_FLIGHT = REGISTRY.gauge(
+    "visibility_pipelines_in_flight",
+    "Pipelines currently running.",
+    labels=("mode",),
+)
+
+
+def render_metrics() -> str:
+    """Render the process-wide registry in text exposition format."""
+
+    return REGISTRY.render()
+
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricFamily",
+    "MetricsRegistry",
+    "REGISTRY",
+    "STAGE_SECONDS",
+    "MODEL_CALL_SECONDS",
+    "ANSWER_STAGE_SECONDS",
+    "MODEL_CALLS",
+    "MODEL_RETRIES",
+    "INCOMPLETE_RESPONSES",
+    "CALL_BUDGET_EXHAUSTED",
+    "PARSE_FALLBACKS",
+    "PIPELINES_IN_FLIGHT",
+    "render_metrics",
+]
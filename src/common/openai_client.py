@@ -2,25 +2,75 @@
 
 from __future__ import annotations
 
+import asyncio
+import random
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass
 from typing import Any, Dict, Iterable, List, Optional
 
+from src.common.cancellation import CancellationToken
 from src.common.config import ModelSettings
+from src.common.deadline import Deadline, DeadlineExceeded
+from src.common.metrics import MODEL_RETRIES
+from src.common.rate_limit import (
+    RateLimiter,
+    estimate_request_tokens,
+    get_rate_limiter,
+    retry_after_seconds,
+)
+from src.common.resilience import CircuitOpenError, EndpointGuard, get_endpoint_guard
+from src.common.tracing import span
 
 try:  # pragma: no cover - live dependency
-    from openai import OpenAI
+    from openai import AsyncOpenAI, OpenAI
 except ImportError:  # pragma: no cover - handled in code
+    AsyncOpenAI = None  # type: ignore
     OpenAI = None  # type: ignore
 
+try:  # pragma: no cover - installed alongside openai
+    import httpx
+except ImportError:  # pragma: no cover - handled in code
+    httpx = None  # type: ignore
+
 
-@dataclass
+@dataclass(frozen=True)
 class OpenAIClientConfig:
     api_key: str
     organization: str | None
     timeout_seconds: float
     max_retries: int
     backoff_seconds: float
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    http2: bool = False
+    rate_limit_rpm: float | None = None
+    rate_limit_tpm: float | None = None
+    circuit_failure_threshold: int = 5
+    circuit_reset_seconds: float = 30.0
+    initial_concurrency: int = 4
+    latency_target_seconds: float | None = None
+
+
+def _config_from_settings(settings: ModelSettings) -> OpenAIClientConfig:
+    if settings.api_key is None:
+        raise ValueError("OPENAI_API_KEY must be set when MODEL_MODE=live.")
+    return OpenAIClientConfig(
+        api_key=settings.api_key,
+        organization=settings.organization,
+        timeout_seconds=settings.timeout_seconds,
+        max_retries=settings.max_retries,
+        backoff_seconds=settings.backoff_seconds,
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        http2=settings.http2,
+        rate_limit_rpm=settings.rate_limit_rpm,
+        rate_limit_tpm=settings.rate_limit_tpm,
+        circuit_failure_threshold=settings.circuit_failure_threshold,
+        circuit_reset_seconds=settings.circuit_reset_seconds,
+        initial_concurrency=settings.max_concurrency,
+        latency_target_seconds=settings.latency_target_seconds,
+    )
 
 
 class OpenAIClient:
@@ -31,23 +81,91 @@ class OpenAIClient:
             raise ValueError("OPENAI_API_KEY is required for live mode.")
         if OpenAI is None:
             raise ImportError(
-                "The 'openai' package is required for live mode. Install it via 'pip install openai'."
+                "The 'openai' package is required for live mode. "
+                "Install it via 'pip install openai'."
             )
         self._config = config
-        self._client = OpenAI(api_key=config.api_key, organization=config.organization)
+        # Retries belong to ``chat``/``achat`` (circuit breaker, deadline,
+        # Retry-After); SDK retries would multiply attempts and timeouts.
+        self._client = OpenAI(
+            api_key=config.api_key,
+            organization=config.organization,
+            max_retries=0,
+            http_client=self._build_http_client(asynchronous=False),
+        )
+        # httpx async pools are bound to the loop that created them.
+        self._async_clients: Dict[asyncio.AbstractEventLoop, Any] = {}
+        self._async_lock = threading.Lock()
 
     @classmethod
     def from_model_settings(cls, settings: ModelSettings) -> OpenAIClient:
-        if settings.api_key is None:
-            raise ValueError("OPENAI_API_KEY must be set when MODEL_MODE=live.")
-        config = OpenAIClientConfig(
-            api_key=settings.api_key,
-            organization=settings.organization,
-            timeout_seconds=settings.timeout_seconds,
-            max_retries=settings.max_retries,
-            backoff_seconds=settings.backoff_seconds,
+        return cls(_config_from_settings(settings))
+
+    def _build_http_client(self, *, asynchronous: bool) -> Any:
+        """Create a pooled httpx client honouring the configured limits."""
+
+        if httpx is None:  # pragma: no cover - SDK falls back to its default client
+            return None
+        limits = httpx.Limits(
+            max_connections=self._config.max_connections,
+            max_keepalive_connections=self._config.max_keepalive_connections,
         )
-        return cls(config)
+        factory = httpx.AsyncClient if asynchronous else httpx.Client
+        try:
+            return factory(
+                limits=limits, http2=self._config.http2, timeout=self._config.timeout_seconds
+            )
+        except ImportError as exc:  # pragma: no cover - depends on optional 'h2'
+            raise ImportError(
+                "HTTP/2 support requires the 'h2' package. "
+                "Install it via 'pip install httpx[http2]'."
+            ) from exc
+
+    def close(self) -> None:
+        """Release pooled connections held by the sync SDK client."""
+
+        self._client.close()
+
+    async def aclose(self) -> None:
+        """Release pooled connections held by both SDK clients."""
+
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            client = self._async_clients.pop(loop, None)
+            self._drop_closed_loops()
+        if client is not None:
+            await client.close()
+        self._client.close()
+
+    @property
+    def async_client(self) -> Any:
+        """The async SDK client for the running event loop, created on first use.
+
+        Each loop gets its own client; clients of loops that have since closed
+        (e.g. earlier ``asyncio.run`` calls) are dropped.
+        """
+
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                if AsyncOpenAI is None:  # pragma: no cover - depends on SDK version
+                    raise ImportError(
+                        "The installed 'openai' package does not provide AsyncOpenAI."
+                    )
+                self._drop_closed_loops()
+                client = AsyncOpenAI(
+                    api_key=self._config.api_key,
+                    organization=self._config.organization,
+                    max_retries=0,
+                    http_client=self._build_http_client(asynchronous=True),
+                )
+                self._async_clients[loop] = client
+            return client
+
+    def _drop_closed_loops(self) -> None:
+        for loop in [loop for loop in self._async_clients if loop.is_closed()]:
+            del self._async_clients[loop]
 
     def chat(  # pragma: no cover - requires live API
         self,
@@ -59,65 +177,327 @@ class OpenAIClient:
         response_format: Optional[Dict[str, Any]] = None,
         reasoning_effort: Optional[str] = None,
         max_reasoning_tokens: Optional[int] = None,
+        prompt_cache_key: Optional[str] = None,
+        timeout: Optional[float] = None,
+        cancellation: Optional[CancellationToken] = None,
     ) -> Dict[str, Any]:
-        """Call the chat completions endpoint with retry/backoff."""
+        """Call the chat completions endpoint with retry/backoff.
 
+        Raises :class:`CircuitOpenError` without calling the API while the
+        model's circuit is open, including when it opens between retries.
+        ``timeout`` bounds all attempts and backoff together; once it is spent
+        :class:`DeadlineExceeded` is raised. A cancelled ``cancellation``
+        token stops further attempts and cuts backoff sleeps short.
+        """
+
+        messages_list = list(messages)
+        limiter = self._rate_limiter(model)
+        guard = self._endpoint_guard(model)
+        estimate = estimate_request_tokens(messages_list, max_tokens)
+        deadline = Deadline.after(timeout) if timeout is not None else None
         for attempt in range(self._config.max_retries + 1):
+            if cancellation is not None:
+                cancellation.raise_if_cancelled()
+            guard.before_call()
             try:
-                messages_list = list(messages)
-                if model.startswith("gpt-5"):
-                    inputs: List[Dict[str, Any]] = [
-                        {
-                            "role": message.get("role", "user"),
-                            "content": [
-                                {
-                                    "type": "input_text",
-                                    "text": message.get("content", ""),
-                                }
-                            ],
-                        }
-                        for message in messages_list
-                    ]
-                    response = self._client.responses.create(  # type: ignore[attr-defined]
-                        model=model,
-                        input=inputs,
-                        temperature=temperature,
-                        max_output_tokens=max_tokens,
-                        timeout=self._config.timeout_seconds,
-                    )
-                    if hasattr(response, "model_dump"):
-                        result = response.model_dump()
-                        result["output_text"] = getattr(response, "output_text", "")
-                        return result
-                    return {
-                        "output_text": getattr(response, "output_text", ""),
-                        "response": response,
-                    }
+                with guard.releasing_probe(), span(
+                    "openai.attempt", model=model, attempt=attempt + 1
+                ):
+                    attempt_timeout = self._attempt_timeout(deadline)
+                    if limiter is not None:
+                        limiter.acquire(estimate, deadline=deadline, cancellation=cancellation)
+                    with guard.attempt(self._slot_timeout(deadline), cancellation):
+                        if model.startswith("gpt-5"):
+                            response = self._client.responses.create(  # type: ignore[attr-defined]
+                                **self._responses_kwargs(
+                                    model,
+                                    messages_list,
+                                    temperature,
+                                    max_tokens,
+                                    prompt_cache_key,
+                                    attempt_timeout,
+                                )
+                            )
+                            return self._coerce_responses_result(response)
+                        result = self._client.chat.completions.create(  # type: ignore[attr-defined]
+                            **self._completions_kwargs(
+                                model,
+                                messages_list,
+                                temperature,
+                                max_tokens,
+                                response_format,
+                                max_reasoning_tokens,
+                                prompt_cache_key,
+                                attempt_timeout,
+                            ),
+                        )
+                        return self._coerce_completions_result(result)
+            except Exception as exc:
+                self._raise_if_tripped(guard, model, exc)
+                if attempt >= self._config.max_retries:
+                    self._raise_if_expired(deadline, exc)
+                    raise
+                delay = self._retry_delay(exc, attempt, limiter)
+                self._raise_if_expired(deadline, exc, delay)
+                MODEL_RETRIES.inc(model=model)
+                if cancellation is None:
+                    time.sleep(delay)
+                elif cancellation.wait(delay):
+                    cancellation.raise_if_cancelled()
+        raise RuntimeError("OpenAI chat completion failed after retries.")
 
-                kwargs: Dict[str, Any] = {
-                    "model": model,
-                    "messages": messages_list,
-                    "temperature": temperature,
-                    "max_completion_tokens": max_tokens,
-                    "timeout": self._config.timeout_seconds,
-                    "response_format": response_format,
-                }
-                if max_reasoning_tokens is not None and model.startswith("gpt-5"):
-                    kwargs["max_reasoning_tokens"] = max_reasoning_tokens
-                result = self._client.chat.completions.create(  # type: ignore[attr-defined]
-                    **kwargs,
-                )
-                if hasattr(result, "model_dump"):
-                    return result.model_dump()  # OpenAI >= 1.0
-                if hasattr(result, "to_dict"):
-                    return result.to_dict()  # Legacy clients
-                return dict(result) if isinstance(result, dict) else {"response": result}
+    async def achat(  # pragma: no cover - requires live API
+        self,
+        *,
+        model: str,
+        messages: Iterable[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict[str, Any]] = None,
+        reasoning_effort: Optional[str] = None,
+        max_reasoning_tokens: Optional[int] = None,
+        prompt_cache_key: Optional[str] = None,
+        timeout: Optional[float] = None,
+        cancellation: Optional[CancellationToken] = None,
+    ) -> Dict[str, Any]:
+        """Async :meth:`chat` whose retries back off without blocking the event loop."""
+
+        messages_list = list(messages)
+        client = self.async_client
+        limiter = self._rate_limiter(model)
+        guard = self._endpoint_guard(model)
+        estimate = estimate_request_tokens(messages_list, max_tokens)
+        deadline = Deadline.after(timeout) if timeout is not None else None
+        for attempt in range(self._config.max_retries + 1):
+            if cancellation is not None:
+                cancellation.raise_if_cancelled()
+            guard.before_call()
+            try:
+                with guard.releasing_probe(), span(
+                    "openai.attempt", model=model, attempt=attempt + 1
+                ):
+                    attempt_timeout = self._attempt_timeout(deadline)
+                    if limiter is not None:
+                        await limiter.aacquire(estimate, deadline=deadline)
+                    async with guard.aattempt(self._slot_timeout(deadline)):
+                        if model.startswith("gpt-5"):
+                            response = await client.responses.create(
+                                **self._responses_kwargs(
+                                    model,
+                                    messages_list,
+                                    temperature,
+                                    max_tokens,
+                                    prompt_cache_key,
+                                    attempt_timeout,
+                                )
+                            )
+                            return self._coerce_responses_result(response)
+                        result = await client.chat.completions.create(
+                            **self._completions_kwargs(
+                                model,
+                                messages_list,
+                                temperature,
+                                max_tokens,
+                                response_format,
+                                max_reasoning_tokens,
+                                prompt_cache_key,
+                                attempt_timeout,
+                            ),
+                        )
+                        return self._coerce_completions_result(result)
             except Exception as exc:
+                self._raise_if_tripped(guard, model, exc)
                 if attempt >= self._config.max_retries:
+                    self._raise_if_expired(deadline, exc)
                     raise
-                sleep_seconds = self._config.backoff_seconds * (2 ** attempt)
-                time.sleep(sleep_seconds)
+                delay = self._retry_delay(exc, attempt, limiter)
+                self._raise_if_expired(deadline, exc, delay)
+                MODEL_RETRIES.inc(model=model)
+                await asyncio.sleep(delay)
         raise RuntimeError("OpenAI chat completion failed after retries.")
 
+    def _rate_limiter(self, model: str) -> RateLimiter | None:
+        return get_rate_limiter(
+            model,
+            requests_per_minute=self._config.rate_limit_rpm,
+            tokens_per_minute=self._config.rate_limit_tpm,
+        )
+
+    def _endpoint_guard(self, model: str) -> EndpointGuard:
+        return get_endpoint_guard(
+            model,
+            failure_threshold=self._config.circuit_failure_threshold,
+            reset_seconds=self._config.circuit_reset_seconds,
+            initial_concurrency=self._config.initial_concurrency,
+            max_concurrency=self._config.max_connections,
+            latency_target=self._config.latency_target_seconds,
+        )
+
+    @staticmethod
+    def _raise_if_tripped(guard: EndpointGuard, model: str, exc: Exception) -> None:
+        """Stop retrying once this failure has opened the model's circuit."""
+
+        if guard.breaker.is_open:
+            raise CircuitOpenError(model, guard.breaker.reset_seconds) from exc
+
+    def _attempt_timeout(self, deadline: Deadline | None) -> float:
+        if deadline is None:
+            return self._config.timeout_seconds
+        return deadline.budget(self._config.timeout_seconds)
+
+    @staticmethod
+    def _slot_timeout(deadline: Deadline | None) -> float | None:
+        """How long an attempt may wait for a concurrency slot."""
+
+        return None if deadline is None else deadline.remaining()
+
+    @staticmethod
+    def _raise_if_expired(deadline: Deadline | None, exc: Exception, delay: float = 0.0) -> None:
+        """Give up when the call budget cannot cover another attempt."""
+
+        if deadline is not None and deadline.remaining() <= delay:
+            raise DeadlineExceeded("Model call exceeded its timeout budget.") from exc
+
+    def _retry_delay(self, exc: BaseException, attempt: int, limiter: RateLimiter | None) -> float:
+        """Honor ``Retry-After`` (pausing the shared limiter) before falling back to backoff."""
+
+        retry_after = retry_after_seconds(exc)
+        if retry_after is None:
+            return self._backoff_delay(attempt)
+        if limiter is not None:
+            # The limiter now holds every caller until the window reopens.
+            limiter.penalize(retry_after)
+            return 0.0
+        return retry_after
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with equal jitter so retries do not synchronize."""
+
+        ceiling = self._config.backoff_seconds * (2**attempt)
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    def _responses_kwargs(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        prompt_cache_key: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        inputs: List[Dict[str, Any]] = [
+            {
+                "role": message.get("role", "user"),
+                "content": [
+                    {
+                        "type": "input_text",
+                        "text": message.get("content", ""),
+                    }
+                ],
+            }
+            for message in messages
+        ]
+        kwargs: Dict[str, Any] = {
+            "model": model,
+            "input": inputs,
+            "temperature": temperature,
+            "max_output_tokens": max_tokens,
+            "timeout": self._config.timeout_seconds if timeout is None else timeout,
+        }
+        if prompt_cache_key:
+            kwargs["extra_body"] = {"prompt_cache_key": prompt_cache_key}
+        return kwargs
+
+    def _completions_kwargs(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict[str, Any]],
+        max_reasoning_tokens: Optional[int],
+        prompt_cache_key: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_completion_tokens": max_tokens,
+            "timeout": self._config.timeout_seconds if timeout is None else timeout,
+            "response_format": response_format,
+        }
+        if max_reasoning_tokens is not None and model.startswith("gpt-5"):
+            kwargs["max_reasoning_tokens"] = max_reasoning_tokens
+        if prompt_cache_key:
+            kwargs["extra_body"] = {"prompt_cache_key": prompt_cache_key}
+        return kwargs
+
+    @staticmethod
+    def _coerce_responses_result(response: Any) -> Dict[str, Any]:
+        if hasattr(response, "model_dump"):
+            result = response.model_dump()
+            result["output_text"] = getattr(response, "output_text", "")
+            return result
+        return {
+            "output_text": getattr(response, "output_text", ""),
+            "response": response,
+        }
+
+    @staticmethod
+    def _coerce_completions_result(result: Any) -> Dict[str, Any]:
+        if hasattr(result, "model_dump"):
+            return result.model_dump()  # OpenAI >= 1.0
+        if hasattr(result, "to_dict"):
+            return result.to_dict()  # Legacy clients
+        return dict(result) if isinstance(result, dict) else {"response": result}
+
+
+_SHARED_CLIENTS: Dict[tuple, OpenAIClient] = {}
+_SHARED_CLIENTS_LOCK = threading.Lock()
+
+
+def get_shared_client(settings: ModelSettings) -> OpenAIClient:
+    """Return the process-wide client for these credentials and pool settings.
+
+    Reusing one client per configuration keeps keep-alive connections warm
+    across requests and threads instead of paying a TLS handshake per run.
+    """
+
+    config = _config_from_settings(settings)
+    key = astuple(config)
+    with _SHARED_CLIENTS_LOCK:
+        client = _SHARED_CLIENTS.get(key)
+        if client is None:
+            client = OpenAIClient(config)
+            _SHARED_CLIENTS[key] = client
+        return client
+
+
+def close_shared_clients() -> None:
+    """Close every pooled client (sync callers, e.g. CLI shutdown)."""
+
+    with _SHARED_CLIENTS_LOCK:
+        clients = list(_SHARED_CLIENTS.values())
+        _SHARED_CLIENTS.clear()
+    for client in clients:
+        client.close()
+
+
+async def aclose_shared_clients() -> None:
+    """Close every pooled client from an event loop (FastAPI lifespan)."""
+
+    with _SHARED_CLIENTS_LOCK:
+        clients = list(_SHARED_CLIENTS.values())
+        _SHARED_CLIENTS.clear()
+    for client in clients:
+        await client.aclose()
+
 
-__all__ = ["OpenAIClient", "OpenAIClientConfig"]
+__all__ = [
+    "OpenAIClient",
+    "OpenAIClientConfig",
+    "get_shared_client",
+    "close_shared_clients",
+    "aclose_shared_clients",
+]
@@ -0,0 +1,238 @@
+"""Opt-in per-run profiling: cProfile, sampled stacks and per-stage wall/CPU time.
+
+A profiled run writes three artifacts named after the profile id:
+
+* ``<id>.pstats`` – deterministic cProfile data for the thread that started
+  the run (load with :mod:`pstats` or snakeviz);
+* ``<id>.collapsed`` – stacks sampled from every thread that is executing
+  pipeline code, in the collapsed format consumed by ``flamegraph.pl`` and
+  speedscope; this is where work done on model-runner threads shows up;
+* ``<id>.stages.json`` – wall and process CPU time per stage. A stage whose
+  wall time far exceeds its CPU time is waiting on the network, not computing.
+
+CPU time is process-wide, so stages overlapping with other runs (concurrent
+API requests) are over-attributed. Only one run holds the deterministic
+profiler at a time; others still record stages and samples.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import FrameType
+from typing import Any, Dict, Iterator, List
+
+from src.common.config import ProfilingSettings
+
+_SRC_ROOT = str(Path(__file__).resolve().parents[1])
+
+# cProfile hooks are per thread but share the event loop thread in the API;
+# overlapping deterministic profiles would corrupt each other.
+_DETERMINISTIC_LOCK = threading.Lock()
+
+
+@dataclass
+class StageTiming:
+    """Wall-clock against process CPU time for one stage."""
+
+    stage: str
+    wall_seconds: float
+    cpu_seconds: float
+
+    @property
+    def wait_seconds(self) -> float:
+        return max(0.0, self.wall_seconds - self.cpu_seconds)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "wait_seconds": round(self.wait_seconds, 6),
+        }
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{Path(code.co_filename).stem}.{code.co_qualname}:{code.co_firstlineno}"
+
+
+def _collapse(frame: FrameType | None) -> str | None:
+    """Root-to-leaf stack starting at the outermost pipeline frame, if any."""
+
+    frames: List[FrameType] = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    if any(item.f_code.co_filename == __file__ for item in frames):
+        return None  # the profiler's own bookkeeping
+    frames.reverse()
+    for start, candidate in enumerate(frames):
+        if candidate.f_code.co_filename.startswith(_SRC_ROOT):
+            return ";".join(_frame_label(item) for item in frames[start:])
+    return None
+
+
+class StackSampler:
+    """Background thread counting the stacks of threads running pipeline code."""
+
+    def __init__(self, interval_seconds: float) -> None:
+        self.interval_seconds = max(0.001, interval_seconds)
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _loop(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = _collapse(frame)
+                if stack:
+                    self.stacks[stack] += 1
+
+
+@dataclass
+class ProfileSession:
+    """One profiled run and the artifacts it produced."""
+
+    name: str
+    output_dir: Path
+    sample_interval_seconds: float
+    stages: List[StageTiming] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    artifacts: Dict[str, Path] = field(default_factory=dict)
+    _profiler: cProfile.Profile | None = field(default=None, init=False, repr=False)
+    _sampler: StackSampler | None = field(default=None, init=False, repr=False)
+    _started: tuple[float, float] = field(default=(0.0, 0.0), init=False, repr=False)
+    _finished: tuple[float, float] = field(default=(0.0, 0.0), init=False, repr=False)
+
+    def start(self) -> None:
+        if _DETERMINISTIC_LOCK.acquire(blocking=False):
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._sampler = StackSampler(self.sample_interval_seconds)
+        self._sampler.start()
+        self._started = (time.perf_counter(), time.process_time())
+
+    def stop(self) -> None:
+        self._finished = (time.perf_counter(), time.process_time())
+        if self._sampler is not None:
+            self._sampler.stop()
+        if self._profiler is not None:
+            self._profiler.disable()
+            _DETERMINISTIC_LOCK.release()
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.stages.append(
+                StageTiming(stage, time.perf_counter() - wall, time.process_time() - cpu)
+            )
+
+    def summary(self) -> Dict[str, Any]:
+        wall = self._finished[0] - self._started[0]
+        cpu = self._finished[1] - self._started[1]
+        samples = self._sampler.stacks if self._sampler is not None else Counter()
+        return {
+            "profile_id": self.name,
+            **self.metadata,
+            "total": StageTiming("total", wall, cpu).as_dict(),
+            "stages": [timing.as_dict() for timing in self.stages],
+            "deterministic": self._profiler is not None,
+            "samples": sum(samples.values()),
+            "sample_interval_ms": self.sample_interval_seconds * 1000,
+        }
+
+    def write(self) -> Dict[str, Path]:
+        """Write the artifacts described in the module docstring."""
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if self._profiler is not None:
+            self.artifacts["pstats"] = self.output_dir / f"{self.name}.pstats"
+            self._profiler.dump_stats(self.artifacts["pstats"])
+        if self._sampler is not None:
+            self.artifacts["collapsed"] = self.output_dir / f"{self.name}.collapsed"
+            lines = [f"{stack} {count}" for stack, count in self._sampler.stacks.most_common()]
+            self.artifacts["collapsed"].write_text("\n".join(lines) + "\n", encoding="utf-8")
+        self.artifacts["stages"] = self.output_dir / f"{self.name}.stages.json"
+        self.artifacts["stages"].write_text(json.dumps(self.summary(), indent=2), encoding="utf-8")
+        return self.artifacts
+
+
+_ACTIVE: ContextVar[ProfileSession | None] = ContextVar("visibility_profile", default=None)
+
+
+def new_profile_id(label: str | None = None) -> str:
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    return f"{label + '-' if label else ''}{stamp}-{uuid.uuid4().hex[:6]}"
+
+
+@contextmanager
+def profile_run(
+    settings: ProfilingSettings, name: str | None = None
+) -> Iterator[ProfileSession | None]:
+    """Profile the enclosed run when ``name`` is given or profiling is enabled.
+
+    Yields the session (``None`` when not profiling); its ``artifacts`` are
+    populated once the block exits, even if the run raised.
+    """
+
+    if name is None and not settings.enabled:
+        yield None
+        return
+    session = ProfileSession(
+        name=name or new_profile_id(),
+        output_dir=Path(settings.output_dir),
+        sample_interval_seconds=settings.sample_interval_ms / 1000,
+    )
+    token = _ACTIVE.set(session)
+    session.start()
+    try:
+        yield session
+    finally:
+        session.stop()
+        _ACTIVE.reset(token)
+        session.write()
+
+
+@contextmanager
+def record_stage(stage: str) -> Iterator[None]:
+    """Record wall and CPU time for ``stage`` in the active profile, if any."""
+
+    session = _ACTIVE.get()
+    if session is None:
+        yield
+        return
+    with session.stage(stage):
+        yield
+
+
+__all__ = [
+    "ProfileSession",
+    "StackSampler",
+    "StageTiming",
+    "new_profile_id",
+    "profile_run",
+    "record_stage",
+]
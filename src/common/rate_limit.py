@@ -0,0 +1,243 @@
+"""Process-wide token-bucket rate limiting for model requests."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Mapping, Tuple
+
+from src.common.cancellation import CancellationToken
+from src.common.deadline import Deadline, DeadlineExceeded
+
+DEFAULT_BURST_SECONDS = 10.0
+
+
+@dataclass
+class _Bucket:
+    """Leaky balance that may go negative to queue reservations fairly."""
+
+    capacity: float
+    rate_per_second: float
+    balance: float
+    updated_at: float
+
+    def reserve(self, amount: float, now: float) -> float:
+        elapsed = max(0.0, now - self.updated_at)
+        self.balance = min(self.capacity, self.balance + elapsed * self.rate_per_second)
+        self.updated_at = now
+        self.balance -= amount
+        if self.balance >= 0:
+            return 0.0
+        return -self.balance / self.rate_per_second
+
+    def refund(self, amount: float) -> None:
+        self.balance = min(self.capacity, self.balance + amount)
+
+
+@dataclass
+class RateLimitStats:
+    """Counters describing how much queueing the limiter introduced."""
+
+    acquired: int = 0
+    delayed: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    retry_after_events: int = 0
+
+
+class RateLimiter:
+    """Proactive requests-per-minute and tokens-per-minute limiter.
+
+    Callers reserve capacity up front and wait out any deficit, so concurrent
+    runs queue smoothly instead of tripping provider 429s together. Bucket
+    capacity is ``burst_seconds`` worth of the per-minute limit.
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        burst_seconds: float = DEFAULT_BURST_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        now = clock()
+        self._requests = self._bucket(requests_per_minute, burst_seconds, now)
+        self._tokens = self._bucket(tokens_per_minute, burst_seconds, now)
+        self._blocked_until = 0.0
+        self.stats = RateLimitStats()
+
+    @staticmethod
+    def _bucket(per_minute: float | None, burst_seconds: float, now: float) -> _Bucket | None:
+        if not per_minute:
+            return None
+        rate = per_minute / 60.0
+        capacity = max(1.0, rate * burst_seconds)
+        return _Bucket(capacity=capacity, rate_per_second=rate, balance=capacity, updated_at=now)
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserve one request plus ``tokens`` and return the seconds to wait."""
+
+        with self._lock:
+            now = self._clock()
+            delay = max(0.0, self._blocked_until - now)
+            if self._requests is not None:
+                delay = max(delay, self._requests.reserve(1, now))
+            if self._tokens is not None:
+                delay = max(delay, self._tokens.reserve(tokens, now))
+            self.stats.acquired += 1
+            if delay > 0:
+                self.stats.delayed += 1
+                self.stats.total_wait_seconds += delay
+                self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, delay)
+            return delay
+
+    def acquire(
+        self,
+        tokens: int = 0,
+        *,
+        deadline: Deadline | None = None,
+        cancellation: CancellationToken | None = None,
+    ) -> float:
+        """Block the calling thread until capacity is available.
+
+        Raises :class:`DeadlineExceeded` (without waiting) when the wait would
+        outlast ``deadline``; a cancelled ``cancellation`` token ends the wait.
+        """
+
+        if cancellation is not None:
+            cancellation.raise_if_cancelled()
+        delay = self._reserve_within(tokens, deadline)
+        if delay > 0:
+            if cancellation is None:
+                self._sleep(delay)
+            elif cancellation.wait(delay):
+                cancellation.raise_if_cancelled()
+        return delay
+
+    async def aacquire(self, tokens: int = 0, *, deadline: Deadline | None = None) -> float:
+        """Await capacity without blocking the event loop."""
+
+        delay = self._reserve_within(tokens, deadline)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def _reserve_within(self, tokens: int, deadline: Deadline | None) -> float:
+        delay = self.reserve(tokens)
+        if deadline is not None and delay > deadline.remaining():
+            self._refund(tokens)
+            raise DeadlineExceeded(f"Rate limit wait of {delay:.1f}s exceeds the deadline.")
+        return delay
+
+    def _refund(self, tokens: int) -> None:
+        """Return a reservation that will not be used."""
+
+        with self._lock:
+            if self._requests is not None:
+                self._requests.refund(1)
+            if self._tokens is not None:
+                self._tokens.refund(tokens)
+
+    def penalize(self, retry_after_seconds: float) -> None:
+        """Pause every caller until the provider's ``Retry-After`` elapses."""
+
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + retry_after_seconds)
+            self.stats.retry_after_events += 1
+
+
+def estimate_request_tokens(messages: Iterable[Mapping[str, str]], max_tokens: int) -> int:
+    """Rough prompt-plus-completion token estimate (~4 characters per token)."""
+
+    characters = sum(len(message.get("content", "")) for message in messages)
+    return characters // 4 + max_tokens
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Extract a ``Retry-After`` delay from an SDK/HTTP error, if present."""
+
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) * scale)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+_LIMITERS: Dict[Tuple[str, float | None, float | None], RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(
+    model: str,
+    *,
+    requests_per_minute: float | None,
+    tokens_per_minute: float | None,
+) -> RateLimiter | None:
+    """Return the limiter shared by every runner in the process for ``model``.
+
+    Limiters are keyed by model and limits, so a configuration with different
+    limits gets its own buckets instead of silently reusing the first one.
+    """
+
+    if not requests_per_minute and not tokens_per_minute:
+        return None
+    key = (model, requests_per_minute, tokens_per_minute)
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            limiter = RateLimiter(
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute,
+            )
+            _LIMITERS[key] = limiter
+        return limiter
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, float]]:
+    """Snapshot queueing metrics per model, summed over its limiters."""
+
+    with _LIMITERS_LOCK:
+        limiters = list(_LIMITERS.items())
+    stats: Dict[str, Dict[str, float]] = {}
+    for (model, _, _), limiter in limiters:
+        totals = stats.setdefault(
+            model,
+            {
+                "acquired": 0,
+                "delayed": 0,
+                "total_wait_seconds": 0.0,
+                "max_wait_seconds": 0.0,
+                "retry_after_events": 0,
+            },
+        )
+        totals["acquired"] += limiter.stats.acquired
+        totals["delayed"] += limiter.stats.delayed
+        totals["total_wait_seconds"] += limiter.stats.total_wait_seconds
+        totals["max_wait_seconds"] = max(totals["max_wait_seconds"], limiter.stats.max_wait_seconds)
+        totals["retry_after_events"] += limiter.stats.retry_after_events
+    return stats
+
+
+__all__ = [
+    "RateLimiter",
+    "RateLimitStats",
+    "estimate_request_tokens",
+    "retry_after_seconds",
+    "get_rate_limiter",
+    "rate_limit_stats",
+]
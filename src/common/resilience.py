@@ -0,0 +1,364 @@
+"""Per-model circuit breaking and adaptive (AIMD) concurrency for model calls."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, Tuple
+
+from src.common.cancellation import CancellationToken
+from src.common.deadline import DeadlineExceeded
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a model whose circuit is open."""
+
+    def __init__(self, model: str, retry_in: float) -> None:
+        super().__init__(f"Circuit for {model} is open; retry in {retry_in:.1f}s.")
+        self.model = model
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Classic closed → open → half-open breaker counting consecutive failures.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast for ``reset_seconds``. The first call after that is let
+    through as a probe: success closes the circuit, failure reopens it.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        *,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.model = model
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_seconds:
+                return HALF_OPEN
+            return self._state
+
+    def before_call(self) -> None:
+        """Raise :class:`CircuitOpenError` unless a call may proceed."""
+
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            remaining = self._opened_at + self.reset_seconds - self._clock()
+            if self._state == OPEN and remaining <= 0:
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.rejected += 1
+            raise CircuitOpenError(self.model, max(0.0, remaining))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = self._clock()
+            self._probing = False
+
+    def abandon_probe(self) -> None:
+        """Let another caller probe when an attempt ended without a verdict."""
+
+        with self._lock:
+            self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+
+class AdaptiveConcurrencyLimiter:
+    """Additive-increase / multiplicative-decrease cap on in-flight calls.
+
+    Each fast success grows the limit by ``1 / limit`` (about one slot per
+    window of calls); an error, overload or call slower than
+    ``latency_target`` halves it. Waiters block on the condition (threads)
+    or on a future woken by :meth:`release` (coroutines, from any loop) and
+    give up with :class:`DeadlineExceeded` after ``timeout`` seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 20,
+        latency_target: float | None = None,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self._limit = float(min(self.maximum, max(self.minimum, initial)))
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._async_waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        with self._condition:
+            if self._in_flight >= self.limit:
+                return False
+            self._in_flight += 1
+            return True
+
+    def acquire(
+        self, timeout: float | None = None, cancellation: CancellationToken | None = None
+    ) -> None:
+        remove = cancellation.add_callback(self._wake_threads) if cancellation else None
+        try:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._in_flight < self.limit
+                    or (cancellation is not None and cancellation.cancelled),
+                    timeout,
+                )
+                if cancellation is not None:
+                    cancellation.raise_if_cancelled()
+                if self._in_flight >= self.limit:
+                    raise DeadlineExceeded("No model concurrency slot freed up in time.")
+                self._in_flight += 1
+        finally:
+            if remove is not None:
+                remove()
+
+    async def aacquire(self, timeout: float | None = None) -> None:
+        loop = asyncio.get_running_loop()
+        expires = None if timeout is None else loop.time() + timeout
+        while True:
+            waiter = loop.create_future()
+            with self._condition:
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return
+                self._async_waiters.append((loop, waiter))
+            remaining = None if expires is None else max(0.0, expires - loop.time())
+            try:
+                done, _ = await asyncio.wait({waiter}, timeout=remaining)
+            finally:
+                self._forget(waiter)
+            if not done:
+                raise DeadlineExceeded("No model concurrency slot freed up in time.")
+
+    def _forget(self, waiter: asyncio.Future) -> None:
+        with self._condition:
+            self._async_waiters = deque(
+                entry for entry in self._async_waiters if entry[1] is not waiter
+            )
+
+    def _wake_threads(self) -> None:
+        with self._condition:
+            self._condition.notify_all()
+
+    def release(self, *, latency: float, ok: bool | None) -> None:
+        """Free a slot; ``ok=None`` releases without adjusting the limit."""
+
+        with self._condition:
+            self._in_flight -= 1
+            if ok is not None:
+                if ok and (self.latency_target is None or latency <= self.latency_target):
+                    self._limit = min(float(self.maximum), self._limit + 1.0 / self._limit)
+                else:
+                    self._limit = max(float(self.minimum), self._limit * self.decrease_factor)
+            self._condition.notify_all()
+            waiters, self._async_waiters = self._async_waiters, deque()
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:  # the waiter's loop has closed
+                pass
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def is_endpoint_failure(exc: BaseException) -> bool:
+    """Whether an error says the endpoint is unhealthy (not that the request was bad)."""
+
+    if isinstance(exc, asyncio.CancelledError):
+        return False
+    status = getattr(exc, "status_code", None)
+    return status is None or status >= 500 or status == 408
+
+
+class EndpointGuard:
+    """Circuit breaker plus adaptive concurrency for one model endpoint."""
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        limiter: AdaptiveConcurrencyLimiter,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.breaker = breaker
+        self.limiter = limiter
+        self._clock = clock
+
+    def before_call(self) -> None:
+        self.breaker.before_call()
+
+    @contextmanager
+    def releasing_probe(self) -> Iterator[None]:
+        """Give up a half-open probe if the enclosed work fails before :meth:`attempt`.
+
+        Rate-limit waits, deadlines and cancellation end an attempt without a
+        verdict; holding on to the probe would keep the circuit half-open and
+        rejecting every call.
+        """
+
+        try:
+            yield
+        except BaseException:
+            self.breaker.abandon_probe()
+            raise
+
+    @contextmanager
+    def attempt(
+        self, timeout: float | None = None, cancellation: CancellationToken | None = None
+    ) -> Iterator[None]:
+        """Hold a concurrency slot for one request attempt and record its outcome.
+
+        Waiting for the slot is bounded by ``timeout`` and cut short by
+        ``cancellation``.
+        """
+
+        with self.releasing_probe():
+            self.limiter.acquire(timeout, cancellation)
+        started = self._clock()
+        try:
+            yield
+        except BaseException as exc:
+            self._record(started, exc)
+            raise
+        self._record(started, None)
+
+    @asynccontextmanager
+    async def aattempt(self, timeout: float | None = None) -> AsyncIterator[None]:
+        """Async :meth:`attempt`; cancellation arrives as task cancellation."""
+
+        with self.releasing_probe():
+            await self.limiter.aacquire(timeout)
+        started = self._clock()
+        try:
+            yield
+        except BaseException as exc:
+            self._record(started, exc)
+            raise
+        self._record(started, None)
+
+    def _record(self, started: float, exc: BaseException | None) -> None:
+        latency = self._clock() - started
+        if exc is None:
+            self.limiter.release(latency=latency, ok=True)
+            self.breaker.record_success()
+        elif is_endpoint_failure(exc):
+            self.limiter.release(latency=latency, ok=False)
+            self.breaker.record_failure()
+        else:
+            # Cancelled hedges and rejected requests say nothing about endpoint
+            # health; only rate limiting should shrink the concurrency window.
+            overloaded = getattr(exc, "status_code", None) == 429
+            self.limiter.release(latency=latency, ok=False if overloaded else None)
+            self.breaker.abandon_probe()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.breaker.state,
+            "rejected": self.breaker.rejected,
+            "concurrency_limit": self.limiter.limit,
+            "in_flight": self.limiter.in_flight,
+        }
+
+
+_GUARDS: Dict[str, EndpointGuard] = {}
+_GUARDS_LOCK = threading.Lock()
+
+
+def get_endpoint_guard(
+    model: str,
+    *,
+    failure_threshold: int,
+    reset_seconds: float,
+    initial_concurrency: int,
+    max_concurrency: int,
+    latency_target: float | None = None,
+) -> EndpointGuard:
+    """Return the guard shared by every client in the process for ``model``."""
+
+    with _GUARDS_LOCK:
+        guard = _GUARDS.get(model)
+        if guard is None:
+            guard = EndpointGuard(
+                CircuitBreaker(
+                    model, failure_threshold=failure_threshold, reset_seconds=reset_seconds
+                ),
+                AdaptiveConcurrencyLimiter(
+                    initial=initial_concurrency,
+                    maximum=max_concurrency,
+                    latency_target=latency_target,
+                ),
+            )
+            _GUARDS[model] = guard
+        return guard
+
+
+def endpoint_stats() -> Dict[str, Dict[str, Any]]:
+    """Snapshot breaker state and concurrency limits for every model."""
+
+    with _GUARDS_LOCK:
+        return {model: guard.snapshot() for model, guard in _GUARDS.items()}
+
+
+__all__ = [
+    "CircuitOpenError",
+    "CircuitBreaker",
+    "AdaptiveConcurrencyLimiter",
+    "EndpointGuard",
+    "is_endpoint_failure",
+    "get_endpoint_guard",
+    "endpoint_stats",
+]
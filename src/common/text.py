@@ -3,10 +3,162 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 _WHITESPACE_RE = re.compile(r"\s+")
 _HTML_TAG_RE = re.compile(r"<[^>]+>")
+# How much of an open '<...' iter_strip_markup keeps in case it never closes.
+_MAX_TAG_CHARS = 4096
+
+
+@dataclass(frozen=True)
+class MaskSpan:
+    """A single replacement made while masking, in source-text offsets."""
+
+    start: int
+    end: int
+    term: str
+
+
+@dataclass(frozen=True)
+class MaskResult:
+    """Masked text plus the spans that were replaced."""
+
+    text: str
+    spans: Tuple[MaskSpan, ...]
+
+
+class TermMatcher:
+    """Case-insensitive multi-term matcher compiled once per term set.
+
+    All terms are folded into a single alternation ordered longest-first, so a
+    transcript is scanned once regardless of how many aliases are configured.
+    Spellings that agree under :meth:`str.casefold` count as one term; each
+    match is mapped back to its term through a named group, since regex case
+    folding and ``str.lower`` disagree for characters such as ``ς`` or ``İ``.
+    """
+
+    def __init__(self, terms: Iterable[str]) -> None:
+        canonical: Dict[str, List[str]] = {}
+        for term in terms:
+            term = term.strip()
+            if not term:
+                continue
+            variants = canonical.setdefault(term.casefold(), [])
+            if term not in variants:
+                variants.append(term)
+        self.terms: Tuple[str, ...] = tuple(
+            term for variants in canonical.values() for term in variants
+        )
+        self.max_length = max((len(term) for term in self.terms), default=0)
+        self._canonical = {key: tuple(variants) for key, variants in canonical.items()}
+        # A match on a long alias also counts every shorter alias nested inside it,
+        # mirroring independent per-term counting.
+        self._nested = {
+            key: tuple(
+                (other, key.count(other)) for other in canonical if other != key and other in key
+            )
+            for key in canonical
+        }
+        # One leftmost-longest pass undercounts aliases that can straddle each
+        # other ("ab" and "bc" in "abc"); such sets are counted per term instead.
+        self.has_overlaps = any(
+            _overlaps(key, other) for key in canonical for other in canonical if other != key
+        )
+        self._keys = tuple(
+            sorted(canonical, key=lambda key: max(map(len, canonical[key])), reverse=True)
+        )
+        groups = [
+            f"(?P<t{index}>{_alternation(canonical[key])})" for index, key in enumerate(self._keys)
+        ]
+        self._pattern = re.compile("|".join(groups), flags=re.IGNORECASE) if groups else None
+
+    def __bool__(self) -> bool:
+        return self._pattern is not None
+
+    def finditer(
+        self, value: str, pos: int = 0, endpos: int | None = None
+    ) -> Iterable[re.Match[str]]:
+        """Yield non-overlapping, longest-first matches in ``value``."""
+
+        if self._pattern is None:
+            return iter(())
+        if endpos is None:
+            return self._pattern.finditer(value, pos)
+        return self._pattern.finditer(value, pos, endpos)
+
+    def _key(self, match: re.Match[str]) -> str:
+        return self._keys[int(match.lastgroup[1:])]  # type: ignore[index]
+
+    def mask(self, value: str, token: str = "<redacted>") -> MaskResult:
+        """Replace every term occurrence with ``token`` in a single pass."""
+
+        pieces: List[str] = []
+        spans: List[MaskSpan] = []
+        cursor = 0
+        for match in self.finditer(value):
+            start, end = match.span()
+            pieces.append(value[cursor:start])
+            pieces.append(token)
+            spans.append(MaskSpan(start=start, end=end, term=self._canonical[self._key(match)][0]))
+            cursor = end
+        if not spans:
+            return MaskResult(text=value, spans=())
+        pieces.append(value[cursor:])
+        return MaskResult(text="".join(pieces), spans=tuple(spans))
+
+    def count_match(self, hits: Dict[str, int], match: re.Match[str]) -> None:
+        """Add the term counts implied by a single :meth:`finditer` ``match`` to ``hits``."""
+
+        key = self._key(match)
+        for term in self._canonical[key]:
+            hits[term] = hits.get(term, 0) + 1
+        for other, count in self._nested[key]:
+            for term in self._canonical[other]:
+                hits[term] = hits.get(term, 0) + count
+
+    def hits(self, value: str) -> Dict[str, int]:
+        """Return how many times each term appears in ``value``.
+
+        Counts match independent per-term ``str.count`` calls on casefolded
+        text, including for aliases that overlap one another.
+        """
+
+        hits: Dict[str, int] = {}
+        if self.has_overlaps:
+            folded = value.casefold()
+            for key, variants in self._canonical.items():
+                count = folded.count(key)
+                if count:
+                    for term in variants:
+                        hits[term] = count
+            return hits
+        for match in self.finditer(value):
+            self.count_match(hits, match)
+        return hits
+
+
+def _alternation(terms: Iterable[str]) -> str:
+    return "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+
+
+def _overlaps(left: str, right: str) -> bool:
+    """True when a proper suffix of ``left`` is a prefix of ``right``."""
+
+    return any(left.endswith(right[:size]) for size in range(1, min(len(left), len(right))))
+
+
+@lru_cache(maxsize=128)
+def _compile_terms(terms: Tuple[str, ...]) -> TermMatcher:
+    return TermMatcher(terms)
+
+
+def compile_terms(terms: Iterable[str]) -> TermMatcher:
+    """Return a cached matcher for the given term set."""
+
+    return _compile_terms(tuple(terms))
 
 
 def normalize_whitespace(value: str) -> str:
@@ -18,13 +170,15 @@ def normalize_whitespace(value: str) -> str:
 def mask_terms(value: str, terms: Iterable[str], token: str = "<redacted>") -> str:
     """Replace sensitive terms in a case-insensitive fashion."""
 
-    masked = value
-    for term in terms:
-        if not term:
-            continue
-        escaped = re.escape(term)
-        masked = re.sub(escaped, token, masked, flags=re.IGNORECASE)
-    return masked
+    return compile_terms(terms).mask(value, token).text
+
+
+def mask_terms_with_spans(
+    value: str, terms: Iterable[str], token: str = "<redacted>"
+) -> MaskResult:
+    """Mask terms in one pass and report the source spans that were replaced."""
+
+    return compile_terms(terms).mask(value, token)
 
 
 def split_paragraphs(value: str) -> list[str]:
@@ -40,19 +194,133 @@ def strip_markup(value: str) -> str:
     return _HTML_TAG_RE.sub(" ", value)
 
 
+def iter_strip_markup(chunks: Iterable[str]) -> Iterator[str]:
+    """Streaming :func:`strip_markup` that handles tags split across chunks.
+
+    Tag bodies are discarded as they stream past, however long they are. Only
+    the first ``_MAX_TAG_CHARS`` characters after a ``<`` are held back; if the
+    stream ends before a ``>``, they are emitted as text and the rest is lost.
+    """
+
+    held: str | None = None  # the open '<...' while inside a possible tag
+    for chunk in chunks:
+        pieces: List[str] = []
+        cursor = 0
+        while cursor < len(chunk):
+            if held is None:
+                opening = chunk.find("<", cursor)
+                if opening == -1:
+                    pieces.append(chunk[cursor:])
+                    break
+                pieces.append(chunk[cursor:opening])
+                held, cursor = "<", opening + 1
+                continue
+            closing = chunk.find(">", cursor)
+            if closing == -1:
+                held += chunk[cursor : cursor + max(0, _MAX_TAG_CHARS - len(held))]
+                break
+            # "<>" is not a tag; anything else up to '>' is, as in _HTML_TAG_RE.
+            empty = held == "<" and closing == cursor
+            pieces.append("<>" if empty else " ")
+            held, cursor = None, closing + 1
+        if pieces:
+            yield "".join(pieces)
+    if held:
+        yield held
+
+
+def iter_normalize_whitespace(chunks: Iterable[str]) -> Iterator[str]:
+    """Streaming :func:`normalize_whitespace`; whitespace runs may span chunks."""
+
+    started = False
+    pending_space = False
+    for chunk in chunks:
+        collapsed = _WHITESPACE_RE.sub(" ", chunk)
+        core = collapsed.strip(" ")
+        if not core:
+            pending_space = pending_space or bool(collapsed)
+            continue
+        if started and (pending_space or collapsed[0] == " "):
+            yield " "
+        yield core
+        started = True
+        pending_space = collapsed[-1] == " "
+
+
+class StreamMasker:
+    """Incrementally mask terms in a chunked stream.
+
+    The last ``max_length - 1`` characters of each chunk are held back so an
+    alias split across a chunk boundary is still matched as a whole.
+    """
+
+    def __init__(self, matcher: TermMatcher, token: str = "<redacted>") -> None:
+        self._matcher = matcher
+        self._token = token
+        self._carry = ""
+        self._written = 0
+        self.token_offsets: List[int] = []
+
+    def feed(self, chunk: str, *, final: bool = False) -> str:
+        """Mask ``chunk`` and return the output that can no longer change."""
+
+        buffer = self._carry + chunk
+        safe = len(buffer) if final else len(buffer) - max(0, self._matcher.max_length - 1)
+        pieces: List[str] = []
+        cursor = 0
+        for match in self._matcher.finditer(buffer):
+            start, end = match.span()
+            if start >= safe:
+                break
+            pieces.append(buffer[cursor:start])
+            self._written += start - cursor
+            self.token_offsets.append(self._written)
+            pieces.append(self._token)
+            self._written += len(self._token)
+            cursor = end
+        stop = max(cursor, safe)
+        pieces.append(buffer[cursor:stop])
+        self._written += stop - cursor
+        self._carry = buffer[stop:]
+        return "".join(pieces)
+
+    def flush(self) -> str:
+        """Emit any held-back tail once the stream is exhausted."""
+
+        return self.feed("", final=True)
+
+
+def iter_mask_terms(chunks: Iterable[str], masker: StreamMasker) -> Iterator[str]:
+    """Apply ``masker`` to a chunk stream, yielding masked output."""
+
+    for chunk in chunks:
+        masked = masker.feed(chunk)
+        if masked:
+            yield masked
+    tail = masker.flush()
+    if tail:
+        yield tail
+
+
 def keyword_hits(value: str, terms: Iterable[str]) -> Dict[str, int]:
     """Return a count of how many times each term appears case-insensitively."""
 
-    lowered = value.lower()
-    hits: Dict[str, int] = {}
-    for term in terms:
-        term = term.strip()
-        if not term:
-            continue
-        count = lowered.count(term.lower())
-        if count:
-            hits[term] = count
-    return hits
+    return compile_terms(terms).hits(value)
 
 
-__all__ = ["normalize_whitespace", "mask_terms", "split_paragraphs", "strip_markup", "keyword_hits"]
+__all__ = [
+    "MaskSpan",
+    "MaskResult",
+    "TermMatcher",
+    "compile_terms",
+    "normalize_whitespace",
+    "mask_terms",
+    "mask_terms_with_spans",
+    "split_paragraphs",
+    "strip_markup",
+    "iter_strip_markup",
+    "iter_normalize_whitespace",
+    "StreamMasker",
+    "iter_mask_terms",
+    "keyword_hits",
+]
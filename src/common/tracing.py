@@ -0,0 +1,233 @@
+"""Lightweight, sampled tracing spans with a local JSONL exporter."""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, Protocol
+
+from src.common.config import TracingSettings
+
+
+class SpanExporter(Protocol):
+    """Destination for finished, sampled spans."""
+
+    def export(self, span: Dict[str, Any]) -> None:
+        ...
+
+
+class JsonlSpanExporter:
+    """Append one JSON object per finished span to a local file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._handle: Any = None
+
+    def export(self, span: Dict[str, Any]) -> None:
+        line = json.dumps(span, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            if self._handle is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._handle = self.path.open("a", encoding="utf-8")
+            self._handle.write(line)
+            self._handle.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Span:
+    """One timed operation. Unsampled spans keep IDs but record nothing."""
+
+    __slots__ = (
+        "tracer",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "sampled",
+        "start",
+        "attributes",
+        "status",
+    )
+
+    def __init__(
+        self,
+        tracer: Tracer | None,
+        name: str,
+        *,
+        trace_id: str = "",
+        parent_id: str | None = None,
+        sampled: bool = False,
+    ) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id(64) if sampled else ""
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.start = time.time()
+        self.attributes: Dict[str, Any] = {}
+        self.status = "ok"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.sampled:
+            self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        if self.sampled:
+            self.attributes.update(attributes)
+
+    def record_error(self, exc: BaseException) -> None:
+        if self.sampled:
+            self.status = "error"
+            self.attributes["error"] = f"{type(exc).__name__}: {exc}"
+
+    def as_dict(self, end: float) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round((end - self.start) * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+# Returned when no trace is active; every operation on it is a no-op.
+NOOP_SPAN = Span(None, "noop")
+
+_CURRENT: ContextVar[Span | None] = ContextVar("visibility_current_span", default=None)
+
+
+class Tracer:
+    """Start root spans, deciding once per trace whether it is sampled."""
+
+    def __init__(self, exporter: SpanExporter, *, sample_rate: float = 1.0) -> None:
+        self.exporter = exporter
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Open ``name`` as a child of the current span, or as a new trace."""
+
+        parent = _CURRENT.get()
+        if parent is not None and parent.tracer is not None:
+            with _child(parent, name, attributes) as child:
+                yield child
+            return
+        root = Span(self, name, trace_id=_new_id(128), sampled=random.random() < self.sample_rate)
+        root.set_attributes(**attributes)
+        with _activate(root):
+            yield root
+
+    def _export(self, span: Span, end: float) -> None:
+        try:
+            self.exporter.export(span.as_dict(end))
+        except Exception:  # pragma: no cover - tracing must never break a run
+            pass
+
+
+@contextmanager
+def _activate(span: Span) -> Iterator[None]:
+    token = _CURRENT.set(span)
+    try:
+        yield
+    except BaseException as exc:
+        span.record_error(exc)
+        raise
+    finally:
+        _CURRENT.reset(token)
+        if span.sampled and span.tracer is not None:
+            span.tracer._export(span, time.time())
+
+
+@contextmanager
+def _child(parent: Span, name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+    if not parent.sampled:
+        # Unsampled traces share the root so nested spans cost nothing.
+        yield parent
+        return
+    child = Span(
+        parent.tracer, name, trace_id=parent.trace_id, parent_id=parent.span_id, sampled=True
+    )
+    child.attributes.update(attributes)
+    with _activate(child):
+        yield child
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Open a child span of the active trace; a no-op outside of one."""
+
+    parent = _CURRENT.get()
+    if parent is None or parent.tracer is None:
+        yield NOOP_SPAN
+        return
+    with _child(parent, name, attributes) as child:
+        yield child
+
+
+def current_span() -> Span:
+    """The innermost active span, or :data:`NOOP_SPAN`."""
+
+    return _CURRENT.get() or NOOP_SPAN
+
+
+_TRACERS: Dict[tuple[str, float], Tracer] = {}
+_TRACERS_LOCK = threading.Lock()
+
+
+def get_tracer(settings: TracingSettings) -> Tracer | None:
+    """Return the process-wide tracer for ``settings``, or None when disabled."""
+
+    if not settings.export_path:
+        return None
+    key = (settings.export_path, settings.sample_rate)
+    with _TRACERS_LOCK:
+        tracer = _TRACERS.get(key)
+        if tracer is None:
+            exporter = JsonlSpanExporter(settings.export_path)
+            tracer = Tracer(exporter, sample_rate=settings.sample_rate)
+            _TRACERS[key] = tracer
+        return tracer
+
+
+@contextmanager
+def trace(tracer: Tracer | None, name: str, **attributes: Any) -> Iterator[Span]:
+    """``tracer.span(...)`` that degrades to :func:`span` when tracing is off."""
+
+    if tracer is None:
+        with span(name, **attributes) as active:
+            yield active
+        return
+    with tracer.span(name, **attributes) as active:
+        yield active
+
+
+__all__ = [
+    "NOOP_SPAN",
+    "JsonlSpanExporter",
+    "Span",
+    "SpanExporter",
+    "Tracer",
+    "current_span",
+    "get_tracer",
+    "span",
+    "trace",
+]
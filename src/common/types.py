@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List
+from typing import Any, Dict, List
 
 
 @dataclass
@@ -19,7 +19,11 @@ class StoryMetadata:
 
 @dataclass
 class StoryDocument:
-    """Normalized and masked story content ready for downstream processing."""
+    """Normalized and masked story content ready for downstream processing.
+
+    Streaming ingestion keeps only ``masked_text``; its ``raw_text`` and
+    ``normalized_text`` are empty.
+    """
 
     metadata: StoryMetadata
     raw_text: str
@@ -66,6 +70,7 @@ class QuestionAnswer:
     answer: str
     kind: str
     ai_provider_inferred: bool = False
+    skipped: bool = False
 
 
 @dataclass
@@ -90,6 +95,9 @@ class VisibilityResult:
     models_run: List[str] = field(default_factory=list)
     metadata: StoryMetadata | None = None
     mode: str | None = None
+    usage: Dict[str, Any] | None = None
+    partial: bool = False
+    unanswered: List[Dict[str, str]] = field(default_factory=list)
 
 
 __all__ = [
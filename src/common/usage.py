@@ -0,0 +1,247 @@
+"""Token accounting and cost metering for model calls."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping
+
+try:  # pragma: no cover - optional dependency
+    import tiktoken
+except ImportError:  # pragma: no cover - handled in code
+    tiktoken = None  # type: ignore
+
+# USD per 1M tokens: (input, cached input, output). Matched by longest model prefix.
+DEFAULT_PRICING: Dict[str, Dict[str, float]] = {
+    "gpt-5": {"input": 1.25, "cached_input": 0.125, "output": 10.0},
+    "gpt-5-mini": {"input": 0.25, "cached_input": 0.025, "output": 2.0},
+    "gpt-4o": {"input": 2.5, "cached_input": 1.25, "output": 10.0},
+    "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.6},
+}
+
+
+@dataclass
+class TokenUsage:
+    """Token counts reported for (or estimated for) a single call."""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    reasoning_tokens: int = 0
+    cached_tokens: int = 0
+    estimated: bool = False
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def __add__(self, other: TokenUsage) -> TokenUsage:
+        return TokenUsage(
+            prompt_tokens=self.prompt_tokens + other.prompt_tokens,
+            completion_tokens=self.completion_tokens + other.completion_tokens,
+            reasoning_tokens=self.reasoning_tokens + other.reasoning_tokens,
+            cached_tokens=self.cached_tokens + other.cached_tokens,
+            estimated=self.estimated or other.estimated,
+        )
+
+    @property
+    def prompt_cache_hit_ratio(self) -> float:
+        """Share of input tokens served from the provider's prompt cache."""
+
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "reasoning_tokens": self.reasoning_tokens,
+            "cached_tokens": self.cached_tokens,
+            "total_tokens": self.total_tokens,
+            "prompt_cache_hit_ratio": round(self.prompt_cache_hit_ratio, 4),
+        }
+
+
+def _as_mapping(value: Any) -> Mapping[str, Any]:
+    if isinstance(value, Mapping):
+        return value
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return {}
+
+
+def _detail(usage: Mapping[str, Any], details_key: str, field_name: str) -> int:
+    details = _as_mapping(usage.get(details_key))
+    return int(details.get(field_name) or 0)
+
+
+def extract_usage(response: Any) -> TokenUsage | None:
+    """Read the ``usage`` block from a Chat Completions or Responses payload."""
+
+    payload = _as_mapping(response)
+    usage = _as_mapping(payload.get("usage"))
+    if not usage:
+        return None
+    if "input_tokens" in usage or "output_tokens" in usage:  # Responses API
+        return TokenUsage(
+            prompt_tokens=int(usage.get("input_tokens") or 0),
+            completion_tokens=int(usage.get("output_tokens") or 0),
+            reasoning_tokens=_detail(usage, "output_tokens_details", "reasoning_tokens"),
+            cached_tokens=_detail(usage, "input_tokens_details", "cached_tokens"),
+        )
+    return TokenUsage(
+        prompt_tokens=int(usage.get("prompt_tokens") or 0),
+        completion_tokens=int(usage.get("completion_tokens") or 0),
+        reasoning_tokens=_detail(usage, "completion_tokens_details", "reasoning_tokens"),
+        cached_tokens=_detail(usage, "prompt_tokens_details", "cached_tokens"),
+    )
+
+
+@lru_cache(maxsize=16)
+def _encoding_for(model: str) -> Any:
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:  # pragma: no cover - unknown model or offline BPE download
+        try:
+            return tiktoken.get_encoding("o200k_base")
+        except Exception:
+            return None
+
+
+def estimate_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Count tokens with tiktoken when available, else ~4 characters per token."""
+
+    if not text:
+        return 0
+    encoding = _encoding_for(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return max(1, (len(text) + 3) // 4)
+
+
+def estimate_usage(
+    messages: Iterable[Mapping[str, str]], completion: str, model: str
+) -> TokenUsage:
+    """Estimate usage locally for stub runs or responses without a usage block."""
+
+    prompt = "\n\n".join(message.get("content", "") for message in messages)
+    return TokenUsage(
+        prompt_tokens=estimate_tokens(prompt, model),
+        completion_tokens=estimate_tokens(completion, model),
+        estimated=True,
+    )
+
+
+def price_for(model: str, pricing: Mapping[str, Mapping[str, float]]) -> Mapping[str, float] | None:
+    """Return the price entry whose key is the longest prefix of ``model``."""
+
+    matches = [key for key in pricing if model == key or model.startswith(f"{key}-")]
+    if not matches:
+        return None
+    return pricing[max(matches, key=len)]
+
+
+def cost_usd(
+    model: str, usage: TokenUsage, pricing: Mapping[str, Mapping[str, float]]
+) -> float | None:
+    """Compute the USD cost of ``usage`` or None when the model is unpriced."""
+
+    price = price_for(model, pricing)
+    if price is None:
+        return None
+    uncached = max(0, usage.prompt_tokens - usage.cached_tokens)
+    cached_rate = price.get("cached_input", price.get("input", 0.0))
+    total = (
+        uncached * price.get("input", 0.0)
+        + usage.cached_tokens * cached_rate
+        + usage.completion_tokens * price.get("output", 0.0)
+    )
+    return round(total / 1_000_000, 6)
+
+
+@dataclass
+class UsageEntry:
+    """One model call recorded in the ledger."""
+
+    stage: str
+    model: str
+    usage: TokenUsage
+    cost_usd: float | None = None
+    from_cache: bool = False
+
+
+@dataclass
+class _Bucket:
+    calls: int = 0
+    usage: TokenUsage = field(default_factory=TokenUsage)
+    cost_usd: float | None = None
+
+    def add(self, entry: UsageEntry) -> None:
+        self.calls += 1
+        self.usage = self.usage + entry.usage
+        if entry.cost_usd is not None:
+            self.cost_usd = (self.cost_usd or 0.0) + entry.cost_usd
+
+    def as_dict(self) -> Dict[str, Any]:
+        cost = round(self.cost_usd, 6) if self.cost_usd is not None else None
+        return {"calls": self.calls, **self.usage.as_dict(), "cost_usd": cost}
+
+
+class UsageLedger:
+    """Thread-safe collection of per-call usage for one story run."""
+
+    def __init__(self, pricing: Mapping[str, Mapping[str, float]] | None = None) -> None:
+        self.pricing = {**DEFAULT_PRICING, **(pricing or {})}
+        self.entries: List[UsageEntry] = []
+        self._lock = threading.Lock()
+
+    def record(
+        self, stage: str, model: str, usage: TokenUsage, *, from_cache: bool = False
+    ) -> UsageEntry:
+        """Record a call; response-cache hits are tracked but not billed."""
+
+        cost = None if from_cache else cost_usd(model, usage, self.pricing)
+        entry = UsageEntry(
+            stage=stage, model=model, usage=usage, cost_usd=cost, from_cache=from_cache
+        )
+        with self._lock:
+            self.entries.append(entry)
+        return entry
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate the ledger into totals plus per-stage and per-model buckets."""
+
+        with self._lock:
+            entries = list(self.entries)
+        total = _Bucket()
+        by_stage: Dict[str, _Bucket] = {}
+        by_model: Dict[str, _Bucket] = {}
+        cache_hits = 0
+        for entry in entries:
+            if entry.from_cache:
+                cache_hits += 1
+                continue
+            total.add(entry)
+            by_stage.setdefault(entry.stage, _Bucket()).add(entry)
+            by_model.setdefault(entry.model, _Bucket()).add(entry)
+        return {
+            **total.as_dict(),
+            "estimated": total.usage.estimated,
+            "response_cache_hits": cache_hits,
+            "by_stage": {stage: bucket.as_dict() for stage, bucket in by_stage.items()},
+            "by_model": {model: bucket.as_dict() for model, bucket in by_model.items()},
+        }
+
+
+__all__ = [
+    "DEFAULT_PRICING",
+    "TokenUsage",
+    "UsageEntry",
+    "UsageLedger",
+    "extract_usage",
+    "estimate_tokens",
+    "estimate_usage",
+    "price_for",
+    "cost_usd",
+]
@@ -2,18 +2,28 @@
 
 from __future__ import annotations
 
-import hashlib
-from dataclasses import replace
-from typing import Iterable, Sequence
+import asyncio
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Sequence
 
 from src.agents.visibility.evaluator import score_visibility
 from src.agents.visibility.ingestion import load_story_document_from_text
 from src.agents.visibility.model_runner import ModelRunner
 from src.agents.visibility.service import VisibilityLLMService
 from src.agents.visibility.storage import serialize_result
+from src.common.cache import StageCache, content_hash, get_stage_cache
+from src.common.cancellation import CancellationToken, OperationCancelled
 from src.common.config import Settings, load_settings
+from src.common.deadline import Deadline, DeadlineExceeded
+from src.common.metrics import PIPELINES_IN_FLIGHT, STAGE_SECONDS
+from src.common.profiling import record_stage
+from src.common.tracing import current_span, get_tracer, trace
 from src.common.types import (
     ClarifyingQuestion,
+    NarrativePillar,
+    QuestionAnswer,
+    StoryDocument,
     StoryMetadata,
     VisibilityResult,
     VisibilityScorecard,
@@ -21,9 +31,13 @@ from src.common.types import (
 )
 
 
+STAGES = ("extract_pillars", "generate_questions", "build_answers")
+
+ProgressCallback = Callable[[str, dict[str, Any]], None]
+
+
 def _generate_story_id(text: str) -> str:
-    digest = hashlib.sha1(text.encode("utf-8")).hexdigest()[:10]
-    return f"story-{digest}"
+    return f"story-{content_hash(text)[:10]}"
 
 
 def _dedupe(sequence: Iterable[str]) -> list[str]:
@@ -38,31 +52,87 @@ def _dedupe(sequence: Iterable[str]) -> list[str]:
     return ordered
 
 
-def _prepare_settings(settings: Settings, mode: str | None) -> Settings:
+def _prepare_settings(
+    settings: Settings, mode: str | None, answer_mode: str | None = None
+) -> Settings:
     final_mode = mode or settings.model.mode
-    if final_mode == settings.model.mode:
+    final_answer_mode = answer_mode or settings.model.answer_mode
+    if final_mode == settings.model.mode and final_answer_mode == settings.model.answer_mode:
         return settings
-    model = replace(settings.model, mode=final_mode)
+    model = replace(settings.model, mode=final_mode, answer_mode=final_answer_mode)
     return replace(settings, model=model)
 
 
-def run_pipeline(
+@contextmanager
+def _timed(stage: str) -> Iterator[None]:
+    with STAGE_SECONDS.time(stage=stage), record_stage(stage):
+        yield
+
+
+@dataclass
+class _PipelineRun:
+    """State shared by the sync and async pipeline drivers."""
+
+    settings: Settings
+    mode: str
+    provider_name: str
+    client_name: str | None
+    source_url: str | None
+    aliases: list[str]
+    metadata: StoryMetadata
+    document: StoryDocument
+    models: list[str]
+    runner: ModelRunner
+    service: VisibilityLLMService
+    deadline: Deadline | None = None
+    on_event: ProgressCallback | None = None
+
+    def check_deadline(self) -> None:
+        if self.deadline is not None:
+            self.deadline.check()
+
+    def emit(self, event: str, **data: Any) -> None:
+        if self.on_event is not None:
+            self.on_event(event, data)
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """Check the deadline, announce ``stage`` and time it."""
+
+        self.check_deadline()
+        self.emit("stage_started", stage=stage)
+        with _timed(stage):
+            yield
+
+    def answer_listener(self) -> Callable[[QuestionAnswer], None] | None:
+        if self.on_event is None:
+            return None
+        return lambda answer: self.emit("answer", answer=asdict(answer))
+
+
+def _prepare_run(
     *,
     text: str,
-    provider_name: str | None = None,
-    provider_aliases: Sequence[str] | None = None,
-    mode: str | None = None,
-    story_id: str | None = None,
-    client_name: str | None = None,
-    source_url: str | None = None,
-    settings: Settings | None = None,
-    models_override: Sequence[str] | None = None,
-) -> dict:
-    """Execute the visibility pipeline and return the serialized result."""
-
+    provider_name: str | None,
+    provider_aliases: Sequence[str] | None,
+    mode: str | None,
+    story_id: str | None,
+    client_name: str | None,
+    source_url: str | None,
+    settings: Settings | None,
+    models_override: Sequence[str] | None,
+    cache: StageCache | None,
+    answer_mode: str | None,
+    deadline: Deadline | None = None,
+    cancellation: CancellationToken | None = None,
+    on_event: ProgressCallback | None = None,
+    service: VisibilityLLMService | None = None,
+    call_limiter: asyncio.Semaphore | None = None,
+) -> _PipelineRun:
     settings = settings or load_settings()
     effective_mode = mode or settings.model.mode
-    settings = _prepare_settings(settings, effective_mode)
+    settings = _prepare_settings(settings, effective_mode, answer_mode)
+    cache = cache or get_stage_cache(settings.cache)
 
     provider_name = provider_name or settings.provider.name
     aliases = list(provider_aliases or settings.provider.aliases)
@@ -75,45 +145,411 @@ def run_pipeline(
         provider_name=provider_name,
     )
 
+    # Ingestion and masking are timed as separate stages inside the loader.
     document = load_story_document_from_text(
         text,
         metadata,
         provider_aliases=aliases,
+        cache=cache,
     )
 
-    service = VisibilityLLMService(settings, ModelRunner(settings))
-
-    pillars = service.extract_pillars(document)
-    questions = service.generate_questions(pillars)
+    runner = ModelRunner(
+        settings,
+        deadline=deadline,
+        cancellation=cancellation,
+        call_limiter=call_limiter,
+    )
+    if service is None:
+        service = VisibilityLLMService(settings, runner, cache=cache)
+    else:
+        service = service.with_runner(runner)
 
     if models_override:
         models = _dedupe(models_override)
     else:
         models = _dedupe([settings.model.name, *settings.model.comparison_models])
-    answers = service.build_answers(models, questions, transcript=document.masked_text)
+    current_span().set_attributes(
+        story_id=metadata.story_id,
+        mode=effective_mode,
+        answer_mode=settings.model.answer_mode,
+        models=models,
+    )
+
+    return _PipelineRun(
+        settings=settings,
+        mode=effective_mode,
+        provider_name=provider_name,
+        client_name=client_name,
+        source_url=source_url,
+        aliases=aliases,
+        metadata=metadata,
+        document=document,
+        models=models,
+        runner=runner,
+        service=service,
+        deadline=deadline,
+        on_event=on_event,
+    )
 
+
+def _finalize_run(
+    run: _PipelineRun,
+    pillars: list[NarrativePillar],
+    questions: list[ClarifyingQuestion],
+    answers: list[QuestionAnswer],
+    *,
+    timed_out: bool = False,
+) -> dict:
+    unanswered = _unanswered(run.models, questions, answers)
     result = VisibilityResult(
-        story_id=metadata.story_id,
+        story_id=run.metadata.story_id,
         pillars=pillars,
         questions=questions,
         answers=answers,
         scores=VisibilityScorecard(),
         summary=VisibilitySummary(),
-        models_run=models,
-        metadata=metadata,
-        mode=effective_mode,
+        models_run=run.models,
+        metadata=run.metadata,
+        mode=run.mode,
+        partial=timed_out or bool(unanswered),
+        unanswered=unanswered,
+    )
+    result.usage = run.runner.ledger.summary()
+    current_span().set_attributes(
+        partial=result.partial,
+        unanswered=len(unanswered),
+        total_tokens=result.usage.get("total_tokens"),
     )
 
-    provider_terms = _dedupe([metadata.provider_name, *aliases])
-    score_visibility(result, provider_terms)
+    provider_terms = _dedupe([run.metadata.provider_name, *run.aliases])
+    with _timed("scoring"):
+        score_visibility(result, provider_terms)
 
-    payload = serialize_result(result)
+    with _timed("serialization"):
+        payload = serialize_result(result)
     metadata_payload = payload.setdefault("metadata", {})
-    metadata_payload.setdefault("provider_name", provider_name)
-    metadata_payload.setdefault("client_name", client_name)
-    metadata_payload.setdefault("source_url", source_url)
-    metadata_payload["mode"] = effective_mode
+    metadata_payload.setdefault("provider_name", run.provider_name)
+    metadata_payload.setdefault("client_name", run.client_name)
+    metadata_payload.setdefault("source_url", run.source_url)
+    metadata_payload["mode"] = run.mode
+    metadata_payload["answer_mode"] = run.settings.model.answer_mode
+    cache_stats = run.runner.cache_stats()
+    if cache_stats is not None:
+        metadata_payload["response_cache"] = cache_stats
+    skipped = sum(1 for answer in answers if answer.skipped)
+    if skipped:
+        metadata_payload["skipped_answers"] = skipped
+    hedge_stats = run.runner.hedge_stats()
+    if hedge_stats is not None:
+        metadata_payload["hedging"] = hedge_stats
     return payload
 
 
-__all__ = ["run_pipeline"]
+def _unanswered(
+    models: Sequence[str],
+    questions: Sequence[ClarifyingQuestion],
+    answers: Sequence[QuestionAnswer],
+) -> list[dict[str, str]]:
+    """List the question/model pairs that never received an answer record."""
+
+    answered = {(answer.question_id, answer.model) for answer in answers}
+    missing: list[dict[str, str]] = []
+    for model in models:
+        for index, question in enumerate(questions, start=1):
+            question_id = ModelRunner.question_identifier(question, index)
+            if (question_id, model) not in answered:
+                missing.append({"question_id": question_id, "model": model})
+    return missing
+
+
+def _run_stages(run: _PipelineRun) -> dict:
+    pillars: list[NarrativePillar] = []
+    questions: list[ClarifyingQuestion] = []
+    answers: list[QuestionAnswer] = []
+    with PIPELINES_IN_FLIGHT.track(mode=run.mode):
+        try:
+            with run.stage("extract_pillars"):
+                pillars = run.service.extract_pillars(run.document)
+            run.emit(
+                "stage_completed",
+                stage="extract_pillars",
+                pillars=[asdict(pillar) for pillar in pillars],
+            )
+            with run.stage("generate_questions"):
+                questions = run.service.generate_questions(pillars)
+            run.emit(
+                "stage_completed",
+                stage="generate_questions",
+                questions=[asdict(question) for question in questions],
+            )
+            with run.stage("build_answers"):
+                answers = run.service.build_answers(
+                    run.models,
+                    questions,
+                    transcript=run.document.masked_text,
+                    on_answer=run.answer_listener(),
+                )
+            run.emit("stage_completed", stage="build_answers")
+        except DeadlineExceeded:
+            return _finalize_run(run, pillars, questions, answers, timed_out=True)
+        return _finalize_run(run, pillars, questions, answers)
+
+
+async def _arun_stages(run: _PipelineRun) -> dict:
+    if not run.runner.is_live:
+        # Stub stages are pure CPU; keep them off the event loop.
+        return await asyncio.to_thread(_run_stages, run)
+    pillars: list[NarrativePillar] = []
+    questions: list[ClarifyingQuestion] = []
+    answers: list[QuestionAnswer] = []
+    with PIPELINES_IN_FLIGHT.track(mode=run.mode):
+        try:
+            with run.stage("extract_pillars"):
+                pillars = await run.service.aextract_pillars(run.document)
+            run.emit(
+                "stage_completed",
+                stage="extract_pillars",
+                pillars=[asdict(pillar) for pillar in pillars],
+            )
+            with run.stage("generate_questions"):
+                questions = await run.service.agenerate_questions(pillars)
+            run.emit(
+                "stage_completed",
+                stage="generate_questions",
+                questions=[asdict(question) for question in questions],
+            )
+            with run.stage("build_answers"):
+                answers = await run.service.abuild_answers(
+                    run.models,
+                    questions,
+                    transcript=run.document.masked_text,
+                    on_answer=run.answer_listener(),
+                )
+            run.emit("stage_completed", stage="build_answers")
+        except DeadlineExceeded:
+            return await asyncio.to_thread(
+                _finalize_run, run, pillars, questions, answers, timed_out=True
+            )
+        # Scoring and serialization are CPU-bound.
+        return await asyncio.to_thread(_finalize_run, run, pillars, questions, answers)
+
+
+def run_pipeline(
+    *,
+    text: str,
+    provider_name: str | None = None,
+    provider_aliases: Sequence[str] | None = None,
+    mode: str | None = None,
+    story_id: str | None = None,
+    client_name: str | None = None,
+    source_url: str | None = None,
+    settings: Settings | None = None,
+    models_override: Sequence[str] | None = None,
+    cache: StageCache | None = None,
+    answer_mode: str | None = None,
+    deadline: Deadline | None = None,
+    cancellation: CancellationToken | None = None,
+    on_event: ProgressCallback | None = None,
+) -> dict:
+    """Execute the visibility pipeline and return the serialized result.
+
+    With a ``deadline`` every stage and model call is bounded by the time left;
+    when it runs out the result is returned with ``partial: true`` and the
+    unanswered question/model pairs instead of raising. Cancelling
+    ``cancellation`` stops new model calls and raises ``OperationCancelled``.
+    ``on_event(event, data)`` is called as each stage starts and finishes
+    (``stage_completed`` carries the pillars or questions) and with every
+    ``answer`` as it arrives.
+    """
+
+    settings = settings or load_settings()
+    with trace(get_tracer(settings.tracing), "pipeline"):
+        run = _prepare_run(
+            text=text,
+            provider_name=provider_name,
+            provider_aliases=provider_aliases,
+            mode=mode,
+            story_id=story_id,
+            client_name=client_name,
+            source_url=source_url,
+            settings=settings,
+            models_override=models_override,
+            cache=cache,
+            answer_mode=answer_mode,
+            deadline=deadline,
+            cancellation=cancellation,
+            on_event=on_event,
+        )
+        return _run_stages(run)
+
+
+async def arun_pipeline(
+    *,
+    text: str,
+    provider_name: str | None = None,
+    provider_aliases: Sequence[str] | None = None,
+    mode: str | None = None,
+    story_id: str | None = None,
+    client_name: str | None = None,
+    source_url: str | None = None,
+    settings: Settings | None = None,
+    models_override: Sequence[str] | None = None,
+    cache: StageCache | None = None,
+    answer_mode: str | None = None,
+    deadline: Deadline | None = None,
+    cancellation: CancellationToken | None = None,
+    on_event: ProgressCallback | None = None,
+) -> dict:
+    """Async :func:`run_pipeline`; live model calls run on the event loop.
+
+    Ingestion, masking, stage-cache I/O, scoring and the whole stub-mode run
+    happen in worker threads so they do not stall other requests on the loop.
+    """
+
+    settings = settings or load_settings()
+    with trace(get_tracer(settings.tracing), "pipeline"):
+        run = await asyncio.to_thread(
+            _prepare_run,
+            text=text,
+            provider_name=provider_name,
+            provider_aliases=provider_aliases,
+            mode=mode,
+            story_id=story_id,
+            client_name=client_name,
+            source_url=source_url,
+            settings=settings,
+            models_override=models_override,
+            cache=cache,
+            answer_mode=answer_mode,
+            deadline=deadline,
+            cancellation=cancellation,
+            on_event=on_event,
+        )
+        return await _arun_stages(run)
+
+
+@dataclass
+class BatchItem:
+    """Outcome for one distinct story of a batch.
+
+    ``indices`` lists every input position carrying this text; duplicates are
+    analysed once. Exactly one of ``result`` and ``error`` is set.
+    """
+
+    indices: list[int]
+    story_id: str
+    result: dict | None = None
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {"indices": self.indices, "story_id": self.story_id}
+        if self.error is not None:
+            payload["error"] = self.error
+        else:
+            payload["result"] = self.result
+        return payload
+
+
+async def arun_pipeline_batch(
+    texts: Sequence[str],
+    *,
+    provider_name: str | None = None,
+    provider_aliases: Sequence[str] | None = None,
+    mode: str | None = None,
+    settings: Settings | None = None,
+    models_override: Sequence[str] | None = None,
+    cache: StageCache | None = None,
+    answer_mode: str | None = None,
+    max_concurrency: int | None = None,
+    deadline: Deadline | None = None,
+    cancellation: CancellationToken | None = None,
+) -> AsyncIterator[BatchItem]:
+    """Analyse several stories at once, yielding each as soon as it finishes.
+
+    Texts are deduplicated by content hash. All stories share one settings
+    object, template set and client, and their live model calls interleave
+    under a single ``max_concurrency`` limit (default
+    ``settings.model.max_concurrency``). A story that fails is reported as a
+    :class:`BatchItem` with ``error`` instead of aborting the batch;
+    cancellation still propagates.
+    """
+
+    settings = settings or load_settings()
+    limit = max_concurrency if max_concurrency is not None else settings.model.max_concurrency
+    call_limiter = asyncio.Semaphore(max(1, limit))
+    tracer = get_tracer(settings.tracing)
+
+    positions: dict[str, list[int]] = {}
+    for index, text in enumerate(texts):
+        positions.setdefault(content_hash(text), []).append(index)
+
+    # One service (templates, prompt digests) for the whole batch; each story
+    # swaps in its own runner via ``with_runner``.
+    service_settings = _prepare_settings(settings, mode, answer_mode)
+    cache = cache or get_stage_cache(service_settings.cache)
+    shared_service = await asyncio.to_thread(
+        VisibilityLLMService, service_settings, ModelRunner(service_settings), cache=cache
+    )
+
+    async def _story(indices: list[int]) -> BatchItem:
+        text = texts[indices[0]]
+        story_id = _generate_story_id(text)
+        try:
+            with trace(tracer, "pipeline", batch_size=len(positions)):
+                run = await asyncio.to_thread(
+                    _prepare_run,
+                    text=text,
+                    provider_name=provider_name,
+                    provider_aliases=provider_aliases,
+                    mode=mode,
+                    story_id=story_id,
+                    client_name=None,
+                    source_url=None,
+                    settings=settings,
+                    models_override=models_override,
+                    cache=cache,
+                    answer_mode=answer_mode,
+                    deadline=deadline,
+                    cancellation=cancellation,
+                    service=shared_service,
+                    call_limiter=call_limiter,
+                )
+                result = await _arun_stages(run)
+        except OperationCancelled:
+            raise
+        except Exception as exc:
+            return BatchItem(indices=indices, story_id=story_id, error=str(exc))
+        return BatchItem(indices=indices, story_id=story_id, result=result)
+
+    tasks = [asyncio.ensure_future(_story(indices)) for indices in positions.values()]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def run_pipeline_batch(texts: Sequence[str], **kwargs: Any) -> list[BatchItem]:
+    """Blocking :func:`arun_pipeline_batch`, returning items in input order.
+
+    Accepts the same keyword arguments; must not be called from a running
+    event loop.
+    """
+
+    async def _collect() -> list[BatchItem]:
+        return [item async for item in arun_pipeline_batch(texts, **kwargs)]
+
+    items = asyncio.run(_collect())
+    return sorted(items, key=lambda item: item.indices[0])
+
+
+__all__ = [
+    "STAGES",
+    "BatchItem",
+    "run_pipeline",
+    "arun_pipeline",
+    "run_pipeline_batch",
+    "arun_pipeline_batch",
+]
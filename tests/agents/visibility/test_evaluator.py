@@ -1,4 +1,4 @@
-from src.agents.visibility.evaluator import score_visibility
+from src.agents.visibility.evaluator import detect_provider_hits, score_results, score_visibility
 from src.common.types import (
     ClarifyingQuestion,
     NarrativePillar,
@@ -57,3 +57,48 @@ def test_score_visibility_scales_with_inputs() -> None:
     assert 0 < scorecard.confidence <= 1
     assert result.summary.ai_provider_recognized_in == 2
     assert all(answer.ai_provider_inferred for answer in result.answers)
+
+
+def test_detect_provider_hits_keeps_counts_per_answer() -> None:
+    answers = [
+        QuestionAnswer(
+            question_id="q1", model="gpt-4o", prompt="", answer="OpenAI and ChatGPT", kind="x"
+        ),
+        QuestionAnswer(question_id="q2", model="gpt-4o", prompt="", answer="Unsure.", kind="x"),
+        QuestionAnswer(
+            question_id="q3", model="gpt-4o", prompt="", answer="openai, openai", kind="x"
+        ),
+    ]
+    hits = detect_provider_hits(answers, ["OpenAI", "ChatGPT"])
+    assert hits == [{"OpenAI": 1, "ChatGPT": 1}, {}, {"OpenAI": 2}]
+
+
+def test_detect_provider_hits_counts_overlapping_aliases() -> None:
+    answers = [
+        QuestionAnswer(question_id="q1", model="gpt-4o", prompt="", answer="OpenAIChat", kind="x"),
+        QuestionAnswer(question_id="q2", model="gpt-4o", prompt="", answer="AIChat", kind="x"),
+    ]
+    hits = detect_provider_hits(answers, ["OpenAI", "AIChat"])
+    assert hits == [{"OpenAI": 1, "AIChat": 1}, {"AIChat": 1}]
+
+
+def test_score_results_rescoring_matches_single_result_scoring() -> None:
+    def build(answer_text: str) -> VisibilityResult:
+        return VisibilityResult(
+            story_id="s",
+            pillars=[NarrativePillar(title="Adoption Momentum", summary="")],
+            questions=[],
+            answers=[
+                QuestionAnswer(
+                    question_id="q1", model="m", prompt="", answer=answer_text, kind="x"
+                ),
+            ],
+            scores=VisibilityScorecard(),
+            summary=VisibilitySummary(),
+        )
+
+    results = [build("OpenAI powers it."), build("Unsure.")]
+    scorecards = score_results(results, ["OpenAI"])
+    assert [card.coverage for card in scorecards] == [1.0, 0.0]
+    assert results[0].answers[0].ai_provider_inferred is True
+    assert results[1].summary.ai_provider_recognized_in == 0
@@ -69,3 +69,27 @@ def test_load_story_document_raises_when_mask_fails() -> None:
             assert "provider alias" in str(exc)
         else:  # pragma: no cover - defensive
             raise AssertionError("Expected masking failure for missing provider name")
+
+
+def test_mask_provider_terms_flags_alias_reintroduced_by_token() -> None:
+    summary = mask_provider_terms("Mask vendors hide their Mask.", ["mask"], token="[MASK]")
+    assert summary.masked_text == "[MASK] vendors hide their [MASK]."
+    assert summary.issues == ["Unmasked term 'mask' found 2 time(s)."]
+
+
+def test_streaming_load_matches_in_memory_across_chunk_boundaries() -> None:
+    raw = "<p>Intro</p>\n\n<div class='x'>OpenAI,   Inc. partnered</div>  with Open AI.\n"
+    with TemporaryDirectory() as tmp_dir:
+        raw_path = Path(tmp_dir) / "story.txt"
+        raw_path.write_text(raw, encoding="utf-8")
+        metadata = StoryMetadata(story_id="story", provider_name="OpenAI")
+        aliases = ["OpenAI, Inc.", "Open AI"]
+
+        expected = load_story_document(raw_path, metadata, provider_aliases=aliases)
+        for chunk_size in (1, 3, 5):
+            assert load_transcript(raw_path, chunk_size=chunk_size) == expected.normalized_text
+            streamed = load_story_document(
+                raw_path, metadata, provider_aliases=aliases, streaming=True, chunk_size=chunk_size
+            )
+            assert streamed.masked_text == expected.masked_text
+            assert streamed.raw_text == ""
@@ -1,14 +1,31 @@
+import asyncio
+import json
+import threading
+import time
+from dataclasses import replace
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
 from src.agents.visibility.model_runner import ModelRunner
+from src.common.cache import ResponseCache, SQLiteCache
+from src.common.cancellation import CancellationToken, OperationCancelled
 from src.common.config import load_settings
+from src.common.deadline import Deadline
+from src.common.hedging import LatencyTracker
+from src.common.resilience import CircuitOpenError
 from src.common.types import ClarifyingQuestion
 
 
 def test_model_runner_echoes_messages() -> None:
     runner = ModelRunner(load_settings())
-    response = runner.invoke([
-        {"role": "system", "content": "Act as a strategist."},
-        {"role": "user", "content": "Provide insights."},
-    ])
+    response = runner.invoke(
+        [
+            {"role": "system", "content": "Act as a strategist."},
+            {"role": "user", "content": "Provide insights."},
+        ]
+    )
     assert "[stub-response]" in response.content
     assert response.tokens_used > 0
 
@@ -34,3 +51,387 @@ def test_answer_questions_returns_structured_answers() -> None:
     assert answers[0].question_id == "sp1_q1_masked_client"
     assert answers[0].answer
     assert answers[0].model == "gpt-4o"
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+
+    def chat(self, **kwargs):
+        self.calls.append(kwargs)
+        return {"output_text": f"answer {len(self.calls)}"}
+
+
+def live_settings(**overrides):
+    settings = load_settings()
+    model = replace(settings.model, mode="live", **overrides)
+    return replace(settings, model=model)
+
+
+def test_response_cache_skips_repeat_calls_and_budget() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        cache = ResponseCache(SQLiteCache(Path(tmp_dir) / "responses.sqlite", ttl_seconds=60))
+        client = FakeClient()
+        runner = ModelRunner(live_settings(call_budget=1), client=client, response_cache=cache)
+        messages = [{"role": "user", "content": "Summarize."}]
+
+        first = runner.invoke(messages)
+        second = runner.invoke(messages)
+        assert first.content == second.content == "answer 1"
+        assert len(client.calls) == 1
+        assert runner.cache_stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "saved_calls": 1}
+
+        try:
+            runner.invoke(messages, bypass_cache=True)
+        except RuntimeError as exc:
+            assert "budget" in str(exc)
+        else:  # pragma: no cover - defensive
+            raise AssertionError("Bypassing the cache should spend call budget")
+
+
+class SlowEchoClient:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def chat(self, *, model, messages, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+        question = messages[-1]["content"].split("Question:\n")[1].split("\n")[0]
+        return {"output_text": f"{model}: {question}"}
+
+
+def test_answer_matrix_fans_out_with_deterministic_order() -> None:
+    client = SlowEchoClient()
+    runner = ModelRunner(live_settings(call_budget=6, max_concurrency=3), client=client)
+    questions = [
+        ClarifyingQuestion(prompt=f"Question {index}?", identifier=f"q{index}")
+        for index in range(3)
+    ]
+
+    answers = runner.answer_matrix(
+        ["gpt-5", "gpt-4o"], questions, transcript="T", system_prompt="S"
+    )
+
+    assert [(answer.model, answer.question_id) for answer in answers] == [
+        (model, f"q{index}") for model in ("gpt-5", "gpt-4o") for index in range(3)
+    ]
+    assert answers[4].answer == "gpt-4o: Question 1?"
+    assert 1 < client.peak <= 3
+    assert runner._calls_made == 6
+
+
+class AsyncEchoClient:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+
+    async def achat(self, *, model, messages, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return {"output_text": f"{model} async"}
+
+
+def test_aanswer_matrix_runs_on_event_loop_with_limit() -> None:
+    client = AsyncEchoClient()
+    runner = ModelRunner(live_settings(call_budget=4, max_concurrency=2), client=client)
+    questions = [ClarifyingQuestion(prompt="Q?", identifier=f"q{index}") for index in range(2)]
+
+    answers = asyncio.run(
+        runner.aanswer_matrix(["gpt-5", "gpt-4o"], questions, transcript="T", system_prompt="S")
+    )
+
+    assert [answer.answer for answer in answers] == ["gpt-5 async"] * 2 + ["gpt-4o async"] * 2
+    assert client.peak == 2
+    assert runner._calls_made == 4
+
+
+class SlowAsyncClient:
+    def __init__(self) -> None:
+        self.finished = 0
+        self.cancelled = 0
+
+    async def achat(self, *, model, messages, **kwargs):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        self.finished += 1
+        return {"output_text": "late"}
+
+
+def test_failed_answer_cancels_sibling_calls() -> None:
+    client = SlowAsyncClient()
+    runner = ModelRunner(live_settings(call_budget=1, max_concurrency=2), client=client)
+    questions = [ClarifyingQuestion(prompt="Q?", identifier=f"q{index}") for index in range(2)]
+
+    async def scenario() -> None:
+        with pytest.raises(RuntimeError, match="budget"):
+            await runner.aanswer_matrix(["gpt-4o"], questions, transcript="T", system_prompt="S")
+        # Checked before the loop shuts down, which would cancel leftovers anyway.
+        assert client.cancelled == 1 and client.finished == 0
+
+    asyncio.run(scenario())
+
+
+def test_runners_sharing_a_call_limiter_interleave_under_one_cap() -> None:
+    client = AsyncEchoClient()
+    settings = live_settings(call_budget=4, max_concurrency=4)
+    questions = [ClarifyingQuestion(prompt="Q?", identifier=f"q{index}") for index in range(4)]
+
+    async def scenario() -> None:
+        limiter = asyncio.Semaphore(2)
+        runners = [ModelRunner(settings, client=client, call_limiter=limiter) for _ in range(2)]
+        await asyncio.gather(
+            *(
+                runner.aanswer_matrix(
+                    ["gpt-5"],
+                    questions,
+                    transcript=f"shared limiter {index}",
+                    system_prompt="S",
+                    bypass_cache=True,
+                )
+                for index, runner in enumerate(runners)
+            )
+        )
+
+    asyncio.run(scenario())
+    assert client.peak == 2
+
+
+class BatchClient:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def chat(self, *, model, messages, **kwargs):
+        content = messages[-1]["content"]
+        self.calls.append("\n".join(message["content"] for message in messages))
+        if "Questions (JSON)" in content:
+            return {"output_text": '```json\n{"answers": [{"id": "q1", "answer": "OpenAI."}]}\n```'}
+        return {"output_text": "Unsure."}
+
+
+def test_batched_answer_mode_falls_back_only_for_unparsed_questions() -> None:
+    client = BatchClient()
+    runner = ModelRunner(live_settings(answer_mode="batched"), client=client)
+    questions = [
+        ClarifyingQuestion(prompt=f"Q{index}?", identifier=f"q{index}") for index in (1, 2)
+    ]
+
+    answers = runner.answer_matrix(["gpt-4o"], questions, transcript="T", system_prompt="S")
+
+    assert [answer.answer for answer in answers] == ["OpenAI.", "Unsure."]
+    assert len(client.calls) == 2
+    assert client.calls[0].count("Transcript:") == 1
+    assert "Q2?" in client.calls[1] and "Questions (JSON)" not in client.calls[1]
+
+
+class PrefixCachingClient:
+    """Stand-in for a provider that caches previously seen message prefixes."""
+
+    def __init__(self) -> None:
+        self.seen: set[str] = set()
+        self.cache_keys: list[str] = []
+
+    def chat(self, *, model, messages, prompt_cache_key=None, **kwargs):
+        self.cache_keys.append(prompt_cache_key)
+        prefix = json.dumps(messages[:-1])
+        prompt_tokens = sum(len(message["content"]) for message in messages)
+        cached_tokens = (
+            sum(len(message["content"]) for message in messages[:-1]) if prefix in self.seen else 0
+        )
+        self.seen.add(prefix)
+        return {
+            "output_text": "Answer.",
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": 1,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens},
+            },
+        }
+
+
+def test_answer_prompts_share_a_cacheable_prefix() -> None:
+    client = PrefixCachingClient()
+    runner = ModelRunner(live_settings(), client=client)
+    questions = [
+        ClarifyingQuestion(prompt=f"Question {index}?", identifier=f"q{index}")
+        for index in range(4)
+    ]
+
+    runner.answer_matrix(
+        ["gpt-4o"], questions, transcript="T" * 400, system_prompt="S" * 100, max_concurrency=1
+    )
+
+    summary = runner.ledger.summary()
+    assert len(set(client.cache_keys)) == 1
+    assert summary["by_stage"]["answer"]["prompt_cache_hit_ratio"] > 0.6
+
+
+class InjectedLatencyClient:
+    """Fake endpoint that stalls on scripted requests."""
+
+    def __init__(self, stalls: set[int], stall_seconds: float = 0.5) -> None:
+        self.stalls = stalls
+        self.stall_seconds = stall_seconds
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def chat(self, *, model, messages, **kwargs):
+        with self._lock:
+            self.requests += 1
+            number = self.requests
+        time.sleep(self.stall_seconds if number in self.stalls else 0.005)
+        return {"output_text": f"reply {number}"}
+
+
+def test_hedged_requests_cut_tail_latency_and_count_against_budget() -> None:
+    client = InjectedLatencyClient(stalls={6})
+    settings = live_settings(hedge_percentile=0.9, hedge_min_samples=5, call_budget=10)
+    runner = ModelRunner(settings, client=client, latency_tracker=LatencyTracker())
+    questions = [
+        ClarifyingQuestion(prompt=f"Q{index}?", identifier=f"q{index}") for index in range(6)
+    ]
+
+    started = time.monotonic()
+    answers = runner.answer_matrix(
+        ["gpt-4o"], questions, transcript="T", system_prompt="S", max_concurrency=1
+    )
+
+    assert time.monotonic() - started < 0.4
+    assert answers[-1].answer == "reply 7"
+    assert runner.hedge_stats()["fired"] == 1
+    assert runner.hedge_stats()["won"] == 1
+    assert runner._calls_made == 7
+
+
+class OpenCircuitClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def chat(self, *, model, messages, **kwargs):
+        if model == "broken-model":
+            raise CircuitOpenError(model, 30.0)
+        self.calls += 1
+        return {"output_text": "Fine."}
+
+
+def test_open_circuit_marks_answers_skipped_without_spending_budget() -> None:
+    client = OpenCircuitClient()
+    runner = ModelRunner(live_settings(call_budget=2), client=client)
+    questions = [
+        ClarifyingQuestion(prompt=f"Q{index}?", identifier=f"q{index}") for index in (1, 2)
+    ]
+
+    answers = runner.answer_matrix(
+        ["broken-model", "gpt-4o"], questions, transcript="T", system_prompt="S"
+    )
+
+    assert [answer.skipped for answer in answers] == [True, True, False, False]
+    assert [answer.answer for answer in answers[2:]] == ["Fine.", "Fine."]
+    assert client.calls == 2
+
+
+class TimeoutRecordingClient:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.timeouts: list[float] = []
+
+    def chat(self, *, model, messages, timeout=None, **kwargs):
+        self.timeouts.append(timeout)
+        time.sleep(self.latency)
+        return {"output_text": "Answer."}
+
+
+def test_deadline_bounds_call_timeouts_and_drops_late_answers() -> None:
+    client = TimeoutRecordingClient(latency=0.15)
+    runner = ModelRunner(
+        live_settings(timeout_seconds=60), client=client, deadline=Deadline.after(0.2)
+    )
+    questions = [
+        ClarifyingQuestion(prompt=f"Q{index}?", identifier=f"q{index}") for index in range(4)
+    ]
+
+    answers = runner.answer_matrix(
+        ["gpt-4o"], questions, transcript="T", system_prompt="S", max_concurrency=1
+    )
+
+    assert 0 < len(answers) < 4
+    assert len(client.timeouts) == len(answers)
+    assert all(timeout <= 0.2 for timeout in client.timeouts)
+    assert runner._calls_made == len(answers)
+
+
+class CancellingClient:
+    def __init__(self, token: CancellationToken) -> None:
+        self.token = token
+        self.calls = 0
+
+    def chat(self, *, model, messages, **kwargs):
+        self.calls += 1
+        self.token.cancel("client disconnected")
+        return {"output_text": "Answer."}
+
+    async def achat(self, *, model, messages, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(5)
+        return {"output_text": "Too late."}
+
+
+def test_cancellation_stops_new_calls() -> None:
+    token = CancellationToken()
+    client = CancellingClient(token)
+    runner = ModelRunner(live_settings(), client=client, cancellation=token)
+    questions = [
+        ClarifyingQuestion(prompt=f"Q{index}?", identifier=f"q{index}") for index in range(5)
+    ]
+
+    with pytest.raises(OperationCancelled):
+        runner.answer_matrix(
+            ["gpt-4o"], questions, transcript="T", system_prompt="S", max_concurrency=1
+        )
+
+    assert client.calls == 1
+    assert token.calls_avoided == 1
+
+
+def test_cancellation_aborts_in_flight_async_calls() -> None:
+    token = CancellationToken()
+    client = CancellingClient(token)
+    runner = ModelRunner(live_settings(), client=client, cancellation=token)
+    questions = [
+        ClarifyingQuestion(prompt=f"Q{index}?", identifier=f"q{index}") for index in range(3)
+    ]
+
+    async def main() -> None:
+        asyncio.get_running_loop().call_later(0.05, token.cancel, "timeout")
+        await runner.aanswer_matrix(["gpt-4o"], questions, transcript="T", system_prompt="S")
+
+    started = time.monotonic()
+    with pytest.raises(OperationCancelled):
+        asyncio.run(main())
+    assert time.monotonic() - started < 1.0
+    assert token.calls_aborted >= 1
+
+
+def test_on_answer_reports_each_answer_as_it_completes() -> None:
+    seen = []
+    client = SlowEchoClient()
+    runner = ModelRunner(live_settings(), client=client)
+    questions = [
+        ClarifyingQuestion(prompt=f"Q{index}?", identifier=f"q{index}") for index in range(3)
+    ]
+
+    answers = runner.answer_matrix(
+        ["gpt-4o", "gpt-5"], questions, transcript="T", system_prompt="S", on_answer=seen.append
+    )
+
+    assert sorted(id(answer) for answer in seen) == sorted(id(answer) for answer in answers)
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from src.agents.visibility.prompt_assembler import (
+    TemplateError,
+    TemplateRegistry,
+    compile_template,
+    render_template,
+)
+from src.agents.visibility.service import VisibilityLLMService
+from src.common.config import load_settings
+
+
+def test_compiled_template_renders_segments_and_keeps_literal_braces() -> None:
+    template = compile_template("For {{CLIENT_NAME}}: {{ story }} / {{ story }} {{ pillars }}")
+
+    assert template.fields == ("story", "story", "pillars")
+    rendered = template.render(story="S", pillars=[{"title": "T"}])
+    assert rendered.startswith("For {{CLIENT_NAME}}: S / S [")
+    assert '"title": "T"' in rendered
+
+
+def test_mismatched_placeholders_are_rejected() -> None:
+    with pytest.raises(TemplateError, match="no placeholder"):
+        compile_template("Story only", placeholders=("transcript",))
+    with pytest.raises(TemplateError, match="unknown placeholders"):
+        compile_template("{{ transcript }} {{ extra }}", placeholders=("transcript",))
+    with pytest.raises(TemplateError):
+        render_template("{{ transcript }}", pillars_json="[]")
+
+
+def test_registry_reuses_compiled_template_until_mtime_changes(tmp_path) -> None:
+    path = tmp_path / "prompt.md"
+    path.write_text("v1 {{ transcript }}", encoding="utf-8")
+    registry = TemplateRegistry()
+
+    first = registry.get(path, placeholders=("transcript",))
+    assert registry.get(path) is first
+
+    path.write_text("v2 {{ transcript }}", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, first.mtime_ns + 1_000_000))
+    assert registry.get(path).render(transcript="x") == "v2 x"
+
+
+def test_service_prompts_include_their_inputs() -> None:
+    service = VisibilityLLMService(load_settings())
+
+    assert service.extract_template.render(transcript="STORY-BODY").rstrip().endswith("STORY-BODY")
+    assert "{{" not in service.system_prompt.replace("{{CLIENT_NAME}}", "")
@@ -1,8 +1,11 @@
 from pathlib import Path
+from types import SimpleNamespace
 
 from src.agents.visibility.ingestion import load_story_document
 from src.agents.visibility.service import VisibilityLLMService
+from src.common.cache import LRUCache, StageCache
 from src.common.config import load_settings
+from src.common.metrics import ANSWER_STAGE_SECONDS
 from src.common.types import StoryMetadata
 
 FIXTURES = Path(__file__).resolve().parents[2] / "fixtures"
@@ -17,7 +20,9 @@ def test_service_stub_flow_produces_outputs() -> None:
         source_url="https://openai.com/index/blue-j/",
         client_name="Blue J",
     )
-    document = load_story_document(FIXTURES / "bluej_raw.txt", metadata, provider_aliases=["OpenAI"])
+    document = load_story_document(
+        FIXTURES / "bluej_raw.txt", metadata, provider_aliases=["OpenAI"]
+    )
 
     pillars = service.extract_pillars(document)
     assert len(pillars) >= 1
@@ -28,3 +33,47 @@ def test_service_stub_flow_produces_outputs() -> None:
     answers = service.build_answers(["gpt-4o", "gpt-5"], questions, transcript=document.masked_text)
     assert answers
     assert all(answer.answer for answer in answers)
+
+
+def test_build_answers_records_answer_stage_per_model() -> None:
+    service = VisibilityLLMService(load_settings())
+    metadata = StoryMetadata(story_id="clock", provider_name="OpenAI")
+    document = load_story_document(
+        FIXTURES / "bluej_raw.txt", metadata, provider_aliases=["OpenAI"]
+    )
+    questions = service.generate_questions(service.extract_pillars(document))
+    before = {model: ANSWER_STAGE_SECONDS.count(model=model) for model in ("gpt-4o", "gpt-5")}
+    seen = []
+
+    service.build_answers(
+        ["gpt-4o", "gpt-5"], questions, transcript=document.masked_text, on_answer=seen.append
+    )
+
+    assert len(seen) == 2 * len(questions)
+    for model, count in before.items():
+        assert ANSWER_STAGE_SECONDS.count(model=model) == count + 1
+
+
+def test_fallback_for_unparseable_model_output_is_not_cached() -> None:
+    replies = iter(["not json", '{"pillars": [{"title": "Live", "summary": "From the model"}]}'])
+    calls = []
+
+    def invoke(messages, stage):
+        calls.append(stage)
+        return SimpleNamespace(content=next(replies))
+
+    runner = SimpleNamespace(
+        is_live=True, mode="live", raise_if_cancelled=lambda: None, invoke=invoke
+    )
+    cache = StageCache(LRUCache(8))
+    service = VisibilityLLMService(load_settings(), runner=runner, cache=cache)
+    metadata = StoryMetadata(story_id="fallback", provider_name="OpenAI")
+    document = load_story_document(
+        FIXTURES / "bluej_raw.txt", metadata, provider_aliases=["OpenAI"]
+    )
+
+    fallback = service.extract_pillars(document)
+    assert fallback and fallback[0].title != "Live"
+    assert [pillar.title for pillar in service.extract_pillars(document)] == ["Live"]
+    assert [pillar.title for pillar in service.extract_pillars(document)] == ["Live"]
+    assert calls == ["extract_pillars", "extract_pillars"]
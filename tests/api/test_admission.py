@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import main
+from src.api.admission import AdmissionController, AdmissionLane, AdmissionRejected
+from src.common.cancellation import CancellationToken, OperationCancelled
+
+
+def test_lane_queues_in_order_then_rejects_when_full() -> None:
+    async def scenario() -> list[str]:
+        lane = AdmissionLane("live", max_concurrent=1, max_queue=2, max_wait_seconds=5)
+        order: list[str] = []
+
+        async def pipeline(name: str) -> None:
+            async with lane.slot():
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        first = asyncio.ensure_future(pipeline("a"))
+        await asyncio.sleep(0)
+        queued = [asyncio.ensure_future(pipeline(name)) for name in ("b", "c")]
+        await asyncio.sleep(0)
+        assert lane.waiting == 2
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await lane.acquire()
+        assert rejected.value.status_code == 429
+
+        await asyncio.gather(first, *queued)
+        assert lane.snapshot()["active"] == 0
+        return order
+
+    assert asyncio.run(scenario()) == ["a", "b", "c"]
+
+
+def test_lane_rejects_waiters_that_wait_too_long() -> None:
+    async def scenario() -> None:
+        lane = AdmissionLane("live", max_concurrent=1, max_queue=4, max_wait_seconds=0.01)
+        await lane.acquire()
+        with pytest.raises(AdmissionRejected) as rejected:
+            await lane.acquire()
+        assert rejected.value.status_code == 503
+        assert rejected.value.retry_after >= 1
+        assert lane.waiting == 0
+
+        lane.release(held_seconds=12)
+        assert lane.active == 0
+        assert lane.retry_after() == 12
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_leak_its_slot() -> None:
+    async def scenario() -> AdmissionLane:
+        lane = AdmissionLane("live", max_concurrent=1, max_queue=4, max_wait_seconds=5)
+        await lane.acquire()
+        waiter = asyncio.ensure_future(lane.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        lane.release()
+        return lane
+
+    lane = asyncio.run(scenario())
+    assert lane.active == 0 and lane.waiting == 0
+
+
+def test_thread_slot_counts_workers_and_gives_up_when_cancelled() -> None:
+    loop = asyncio.new_event_loop()
+    runner = threading.Thread(target=loop.run_forever, daemon=True)
+    runner.start()
+    lane = AdmissionLane("live", max_concurrent=1, max_queue=4, max_wait_seconds=5)
+    token = CancellationToken()
+    outcome: list[BaseException] = []
+
+    def queued_worker() -> None:
+        try:
+            with lane.thread_slot(loop, token):
+                pass
+        except BaseException as exc:
+            outcome.append(exc)
+
+    try:
+        with lane.thread_slot(loop):
+            assert lane.active == 1
+            worker = threading.Thread(target=queued_worker)
+            worker.start()
+            while lane.waiting == 0:
+                time.sleep(0.01)
+            token.cancel()
+            worker.join(5)
+        assert len(outcome) == 1 and isinstance(outcome[0], OperationCancelled)
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result()
+        assert lane.active == 0 and lane.waiting == 0
+        assert lane.snapshot()["admitted"] == 1
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        runner.join(5)
+        loop.close()
+
+
+def test_saturated_live_lane_does_not_block_stub_requests(monkeypatch) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(main, "_coalescer", None)
+    stub = AdmissionLane("stub", max_concurrent=1, max_queue=0, max_wait_seconds=1)
+    live = AdmissionLane("live", max_concurrent=1, max_queue=0, max_wait_seconds=1)
+    asyncio.run(live.acquire())
+    monkeypatch.setattr(main, "_admission", AdmissionController({"stub": stub, "live": live}))
+    client = TestClient(main.app)
+    payload = {"text": "Admission: OpenAI partnered with Oscar Health.", "mode": "stub"}
+
+    assert client.post("/analyze", json=payload).status_code == 200
+
+    asyncio.run(stub.acquire())
+    response = client.post("/analyze", json={**payload, "text": "Admission, second post."})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.json()["detail"]["code"] == "OVERLOADED"
@@ -1,7 +1,8 @@
-import os
+import json
 
 from fastapi.testclient import TestClient
 
+from src.api import main
 from src.api.main import app
 
 
@@ -35,3 +36,131 @@ def test_analyze_live_without_key(monkeypatch) -> None:
         json={"text": "Sample", "mode": "live"},
     )
     assert response.status_code == 400
+
+
+def parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_analyze_stream_emits_stages_answers_then_result(monkeypatch) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    client = TestClient(app)
+    response = client.post(
+        "/analyze/stream",
+        json={
+            "text": "OpenAI partnered with Oscar Health to modernize medical records.",
+            "mode": "stub",
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = parse_sse(response.text)
+    names = [name for name, _ in events]
+    assert names[0] == "stage_started"
+    assert names[-1] == "result"
+    pillars_event = events[1][1]
+    assert pillars_event["stage"] == "extract_pillars" and pillars_event["pillars"]
+    answers = [data["answer"] for name, data in events if name == "answer"]
+    result = events[-1][1]
+    assert len(answers) == result["summary"]["total_questions"] * len(
+        result["metadata"]["models_run"]
+    )
+    assert names.index("answer") < names.index("result")
+
+
+def test_analyze_batch_streams_one_json_line_per_story(monkeypatch) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    client = TestClient(app)
+    texts = [
+        "OpenAI partnered with Oscar Health to modernize medical records.",
+        "Anthropic helped Acme Bank summarize support tickets.",
+        "OpenAI partnered with Oscar Health to modernize medical records.",
+    ]
+    response = client.post("/analyze/batch", json={"texts": texts, "mode": "stub"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["indices"] for line in lines) == [[0, 2], [1]]
+    assert all(line["result"]["metadata"]["mode"] == "stub" for line in lines)
+    assert client.post("/analyze/batch", json={"texts": []}).status_code == 422
+
+
+def test_metrics_endpoint_reports_stage_histograms(monkeypatch) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    client = TestClient(app)
+    client.post(
+        "/analyze", json={"text": "Metrics: OpenAI partnered with Oscar Health.", "mode": "stub"}
+    )
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    stages = (
+        "ingestion",
+        "masking",
+        "extract_pillars",
+        "generate_questions",
+        "build_answers",
+        "scoring",
+        "serialization",
+    )
+    for stage in stages:
+        assert f'visibility_stage_duration_seconds_count{{stage="{stage}"}}' in body
+    assert 'visibility_pipelines_in_flight{mode="stub"} 0' in body
+    assert "# TYPE visibility_model_calls_total counter" in body
+    assert "visibility_calls_avoided_total" in body
+
+
+def test_trace_id_header_and_exported_spans(monkeypatch, tmp_path) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    export_path = tmp_path / "spans.jsonl"
+    monkeypatch.setenv("TRACE_EXPORT_PATH", str(export_path))
+    payload = {"text": "Tracing: OpenAI partnered with Oscar Health.", "mode": "stub"}
+    # Settings and the tracer are resolved once, at startup.
+    with TestClient(app) as client:
+        response = client.post("/analyze", json=payload)
+
+    assert response.status_code == 200
+    trace_id = response.headers["X-Trace-Id"]
+    spans = [json.loads(line) for line in export_path.read_text().splitlines()]
+    assert {span["trace_id"] for span in spans} == {trace_id}
+    by_name = {span["name"]: span for span in spans}
+    assert by_name["http.request"]["parent_id"] is None
+    assert by_name["http.request"]["attributes"]["status_code"] == 200
+    assert by_name["pipeline"]["parent_id"] == by_name["http.request"]["span_id"]
+    assert by_name["pipeline"]["attributes"]["mode"] == "stub"
+
+
+def test_profile_header_writes_artifacts(monkeypatch, tmp_path) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("PROFILE_OUTPUT_DIR", str(tmp_path))
+    payload = {"text": "Profiling: OpenAI partnered with Oscar Health.", "mode": "stub"}
+    with TestClient(app) as client:
+        response = client.post("/analyze", json=payload, headers={"X-Profile": "1"})
+
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+    summary = json.loads((tmp_path / f"{profile_id}.stages.json").read_text())
+    assert summary["story_id"] == response.json()["story_id"]
+    assert (tmp_path / f"{profile_id}.collapsed").exists()
+
+
+def test_settings_are_resolved_once_per_app_lifetime(monkeypatch, tmp_path) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    calls = []
+    original = main.load_settings
+    monkeypatch.setattr(main, "load_settings", lambda: calls.append(1) or original())
+    payload = {"text": "Settings: OpenAI partnered with Oscar Health.", "mode": "stub"}
+
+    with TestClient(app) as client:
+        for _ in range(3):
+            assert client.post("/analyze", json=payload).status_code == 200
+
+    assert len(calls) == 1
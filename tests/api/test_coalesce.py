@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import main
+from src.api.coalesce import RequestCoalescer
+
+
+def test_concurrent_identical_requests_share_one_run() -> None:
+    calls = 0
+
+    async def factory() -> dict:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"answer": 42}
+
+    async def scenario() -> list[dict]:
+        coalescer = RequestCoalescer(ttl_seconds=0)
+        results = await asyncio.gather(*(coalescer.run("key", factory) for _ in range(5)))
+        assert coalescer.snapshot() == {
+            "leaders": 1,
+            "coalesced": 4,
+            "result_cache_hits": 0,
+            "in_flight": 0,
+        }
+        return results
+
+    results = asyncio.run(scenario())
+    assert calls == 1
+    assert results == [{"answer": 42}] * 5
+
+
+def test_recent_results_are_served_from_cache_unless_rejected() -> None:
+    calls = 0
+
+    async def factory() -> dict:
+        nonlocal calls
+        calls += 1
+        return {"partial": calls == 1}
+
+    async def scenario() -> RequestCoalescer:
+        coalescer = RequestCoalescer(cacheable=lambda result: not result["partial"])
+        for _ in range(3):
+            await coalescer.run("key", factory)
+        return coalescer
+
+    coalescer = asyncio.run(scenario())
+    assert calls == 2
+    assert coalescer.stats.result_cache_hits == 1
+
+
+def test_run_survives_one_waiter_leaving_and_stops_when_all_leave() -> None:
+    started = 0
+    cancelled = 0
+
+    async def factory() -> str:
+        nonlocal started, cancelled
+        started += 1
+        try:
+            await asyncio.sleep(0.1)
+        except asyncio.CancelledError:
+            cancelled += 1
+            raise
+        return "done"
+
+    async def scenario() -> None:
+        coalescer = RequestCoalescer(ttl_seconds=0)
+        impatient = asyncio.ensure_future(coalescer.run("key", factory))
+        patient = asyncio.ensure_future(coalescer.run("key", factory))
+        await asyncio.sleep(0.01)
+        impatient.cancel()
+        assert await patient == "done"
+
+        abandoned = asyncio.ensure_future(coalescer.run("other", factory))
+        await asyncio.sleep(0.01)
+        abandoned.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await abandoned
+        await asyncio.sleep(0)
+        assert coalescer.in_flight == 0
+
+    asyncio.run(scenario())
+    assert started == 2
+    assert cancelled == 1
+
+
+def test_analyze_serves_repeat_requests_from_coalescer(monkeypatch) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(main, "_coalescer", None)
+    client = TestClient(main.app)
+    payload = {"text": "Coalesce me: OpenAI partnered with Oscar Health.", "mode": "stub"}
+
+    first = client.post("/analyze", json=payload)
+    second = client.post("/analyze", json=payload)
+    other = client.post("/analyze", json={**payload, "answer_mode": "batched"})
+
+    assert first.json() == second.json()
+    assert other.status_code == 200
+    assert main.get_coalescer().snapshot()["result_cache_hits"] == 1
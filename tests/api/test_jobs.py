@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.jobs import JobManager, QueueFullError
+from src.api.main import app
+
+
+def wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting for job"
+        time.sleep(0.01)
+
+
+def test_job_api_returns_id_then_progress_and_result(monkeypatch) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    # Jobs queue on the app's event loop, so keep it running between requests.
+    with TestClient(app) as client:
+        response = client.post(
+            "/jobs", json={"text": "OpenAI partnered with Oscar Health.", "mode": "stub"}
+        )
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        wait_for(lambda: client.get(f"/jobs/{job_id}").json()["status"] == "succeeded")
+        job = client.get(f"/jobs/{job_id}").json()
+    assert job["progress"]["completed_stages"] == [
+        "extract_pillars",
+        "generate_questions",
+        "build_answers",
+    ]
+    assert job["result"]["metadata"]["mode"] == "stub"
+    assert client.get("/jobs/missing").status_code == 404
+
+
+def test_full_queue_rejects_new_jobs() -> None:
+    release = threading.Event()
+    manager = JobManager(max_workers=1, max_queue=1)
+    try:
+        manager.submit(lambda job: release.wait(5) and {})
+        manager.submit(lambda job: {})
+        with pytest.raises(QueueFullError):
+            manager.submit(lambda job: {})
+    finally:
+        release.set()
+        manager.shutdown()
+
+
+def test_finished_jobs_are_evicted_after_ttl() -> None:
+    now = [0.0]
+    manager = JobManager(ttl_seconds=10, clock=lambda: now[0])
+    try:
+        job = manager.submit(lambda job: {"ok": True})
+        wait_for(lambda: job.finished)
+        assert manager.get(job.id).result == {"ok": True}
+        now[0] = 10.0
+        assert manager.get(job.id) is None
+    finally:
+        manager.shutdown()
+
+
+def test_cancelling_a_running_job_stops_it() -> None:
+    manager = JobManager(max_workers=1)
+    try:
+        job = manager.submit(lambda job: job.token.wait(5) and job.token.raise_if_cancelled())
+        wait_for(lambda: job.status == "running")
+        manager.cancel(job.id)
+        wait_for(lambda: job.finished)
+        assert job.status == "cancelled"
+    finally:
+        manager.shutdown()
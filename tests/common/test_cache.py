@@ -0,0 +1,61 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from src.common.cache import LRUCache, SQLiteCache, StageCache, TieredCache
+from src.common.config import load_settings
+from src.pipeline import run_pipeline
+
+TEXT = "OpenAI partnered with Oscar Health to modernize medical records."
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    cache = LRUCache(max_entries=2)
+    cache.set("a", [1])
+    cache.set("b", [2])
+    assert cache.get("a") == [1]
+    cache.set("c", [3])
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_sqlite_cache_persists_and_bounds_entries() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "cache.sqlite"
+        cache = SQLiteCache(path, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, {"key": key})
+        cache.close()
+
+        reopened = SQLiteCache(path, max_entries=2)
+        assert len(reopened) == 2
+        assert reopened.get("c") == {"key": "c"}
+        reopened.close()
+
+
+def test_pipeline_reuses_cached_stages_for_same_content() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        cache = StageCache(TieredCache(LRUCache(8), SQLiteCache(Path(tmp_dir) / "stages.sqlite")))
+        settings = load_settings()
+        first = run_pipeline(text=TEXT, mode="stub", settings=settings, cache=cache)
+        second = run_pipeline(
+            text=TEXT, mode="stub", settings=settings, cache=cache, story_id="again"
+        )
+
+        stats = cache.stats()
+        assert stats["ingestion"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+        assert stats["extract_pillars"]["hits"] == 1
+        assert stats["generate_questions"]["hits"] == 1
+        assert second["story_id"] == "again"
+        assert second["selling_points"] == first["selling_points"]
+
+
+def test_sqlite_cache_expires_entries_after_ttl() -> None:
+    now = [1000.0]
+    with TemporaryDirectory() as tmp_dir:
+        cache = SQLiteCache(Path(tmp_dir) / "ttl.sqlite", ttl_seconds=10, clock=lambda: now[0])
+        cache.set("key", {"value": 1})
+        now[0] += 5
+        assert cache.get("key") == {"value": 1}
+        now[0] += 10
+        assert cache.get("key") is None
+        cache.close()
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.common.cancellation import CancellationToken, OperationCancelled, cancellation_stats
+
+
+def test_cancelled_token_refuses_new_work_and_counts_avoided_calls() -> None:
+    token = CancellationToken()
+    token.raise_if_cancelled()
+    before = cancellation_stats()["calls_avoided"]
+
+    token.cancel("timeout")
+    with pytest.raises(OperationCancelled, match="timeout"):
+        token.raise_if_cancelled()
+    assert token.calls_avoided == 1
+    assert cancellation_stats()["calls_avoided"] == before + 1
+
+
+def test_wait_wakes_up_when_cancelled_from_another_thread() -> None:
+    token = CancellationToken()
+    threading.Timer(0.05, token.cancel).start()
+
+    started = time.monotonic()
+    assert token.wait(5.0) is True
+    assert time.monotonic() - started < 1.0
+
+
+def test_arace_aborts_in_flight_coroutine() -> None:
+    token = CancellationToken()
+    finished = []
+
+    async def slow_call() -> str:
+        await asyncio.sleep(5)
+        finished.append(True)
+        return "late"
+
+    async def main() -> None:
+        asyncio.get_running_loop().call_later(0.05, token.cancel, "client disconnected")
+        with pytest.raises(OperationCancelled):
+            await token.arace(slow_call())
+
+    started = time.monotonic()
+    asyncio.run(main())
+    assert time.monotonic() - started < 1.0
+    assert finished == []
+    assert token.calls_aborted == 1
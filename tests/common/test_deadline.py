@@ -0,0 +1,16 @@
+import pytest
+
+from src.common.deadline import Deadline, DeadlineExceeded
+
+
+def test_budget_is_capped_and_raises_once_spent() -> None:
+    now = [0.0]
+    deadline = Deadline.after(10, clock=lambda: now[0])
+
+    assert deadline.budget(4) == 4
+    now[0] = 8.0
+    assert deadline.budget(4) == 2
+    now[0] = 10.0
+    assert deadline.expired
+    with pytest.raises(DeadlineExceeded):
+        deadline.budget(4)
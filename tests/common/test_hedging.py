@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+
+from src.common.hedging import Hedger, LatencyTracker
+
+
+def warmed_tracker(
+    model: str = "gpt-4o", seconds: float = 0.01, samples: int = 5
+) -> LatencyTracker:
+    tracker = LatencyTracker(min_samples=samples)
+    for _ in range(samples):
+        tracker.record(model, seconds)
+    return tracker
+
+
+def test_percentile_needs_min_samples() -> None:
+    tracker = LatencyTracker(min_samples=3)
+    tracker.record("m", 1.0)
+    assert tracker.percentile("m", 0.9) is None
+    tracker.record("m", 2.0)
+    tracker.record("m", 3.0)
+    assert tracker.percentile("m", 0.5) == 2.0
+    assert tracker.percentile("m", 0.9) == 3.0
+
+
+def test_slow_call_is_hedged_and_duplicate_wins() -> None:
+    latencies = iter([0.5, 0.01])
+
+    def call() -> str:
+        delay = next(latencies)
+        time.sleep(delay)
+        return f"slept {delay}"
+
+    hedger = Hedger(warmed_tracker(), quantile=0.9)
+    started = time.monotonic()
+    result = hedger.call("gpt-4o", call, lambda: True)
+
+    assert result == "slept 0.01"
+    assert time.monotonic() - started < 0.3
+    assert hedger.stats.as_dict()["fired"] == 1
+    assert hedger.stats.won == 1
+
+
+def test_hedge_suppressed_when_budget_refuses() -> None:
+    hedger = Hedger(warmed_tracker(), quantile=0.9)
+
+    result = hedger.call("gpt-4o", lambda: time.sleep(0.05) or "primary", lambda: False)
+
+    assert result == "primary"
+    assert hedger.stats.fired == 0
+    assert hedger.stats.skipped_budget == 1
+
+
+def test_async_hedge_cancels_loser() -> None:
+    cancelled = []
+    latencies = iter([1.0, 0.01])
+
+    async def call() -> float:
+        delay = next(latencies)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    hedger = Hedger(warmed_tracker(), quantile=0.9)
+    result = asyncio.run(hedger.acall("gpt-4o", call, lambda: True))
+
+    assert result == 0.01
+    assert cancelled == [1.0]
+    assert hedger.stats.won == 1
+
+
+def test_primary_error_is_raised_only_if_hedge_also_fails() -> None:
+    outcomes = iter([(0.05, ValueError("primary")), (0.0, None)])
+
+    def call() -> str:
+        delay, error = next(outcomes)
+        time.sleep(delay)
+        if error:
+            raise error
+        return "hedge"
+
+    hedger = Hedger(warmed_tracker(), quantile=0.9)
+    assert hedger.call("gpt-4o", call, lambda: True) == "hedge"
+
+    with pytest.raises(ValueError):
+        Hedger(LatencyTracker(), quantile=1.5)
+
+
+def test_async_primary_is_cancelled_with_its_caller() -> None:
+    cancelled = []
+
+    async def call() -> None:
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def scenario() -> None:
+        hedger = Hedger(warmed_tracker(seconds=0.5), quantile=0.9)
+        outer = asyncio.ensure_future(hedger.acall("gpt-4o", call, lambda: True))
+        await asyncio.sleep(0.01)  # still inside the threshold wait
+        outer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await outer
+        await asyncio.sleep(0)
+        assert cancelled == [True]
+
+    asyncio.run(scenario())
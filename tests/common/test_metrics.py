@@ -0,0 +1,38 @@
+import pytest
+
+from src.common.metrics import MetricsRegistry
+
+
+def test_render_uses_text_exposition_format() -> None:
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls.", labels=("model",))
+    latency = registry.histogram(
+        "latency_seconds", "Latency.", labels=("stage",), buckets=(0.1, 1.0)
+    )
+    in_flight = registry.gauge("in_flight", "Running.")
+
+    calls.inc(model='gpt-"5"')
+    calls.inc(2, model='gpt-"5"')
+    latency.observe(0.05, stage="answer")
+    latency.observe(0.5, stage="answer")
+    with in_flight.track():
+        assert in_flight.value() == 1
+
+    lines = registry.render().splitlines()
+    assert "# TYPE calls_total counter" in lines
+    assert 'calls_total{model="gpt-\\"5\\""} 3' in lines
+    assert 'latency_seconds_bucket{stage="answer",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{stage="answer",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{stage="answer",le="+Inf"} 2' in lines
+    assert 'latency_seconds_sum{stage="answer"} 0.55' in lines
+    assert 'latency_seconds_count{stage="answer"} 2' in lines
+    assert "in_flight 0" in lines
+
+
+def test_metrics_reject_wrong_labels_and_duplicate_names() -> None:
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls.", labels=("model",))
+    with pytest.raises(ValueError):
+        calls.inc(stage="answer")
+    with pytest.raises(ValueError):
+        registry.counter("calls_total", "Again.")
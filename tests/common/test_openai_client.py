@@ -0,0 +1,97 @@
+from dataclasses import replace
+from types import SimpleNamespace
+
+import pytest
+
+from src.common.config import load_settings
+from src.common.deadline import DeadlineExceeded
+from src.common.openai_client import OpenAIClient, close_shared_clients, get_shared_client
+from src.common.resilience import CircuitOpenError, endpoint_stats
+
+
+def test_shared_client_is_reused_per_configuration() -> None:
+    model = replace(load_settings().model, api_key="sk-test", http_max_connections=4)
+    try:
+        first = get_shared_client(model)
+        assert first._client.max_retries == 0  # the wrapper owns retries
+        assert get_shared_client(replace(model)) is first
+        assert get_shared_client(replace(model, timeout_seconds=5.0)) is not first
+    finally:
+        close_shared_clients()
+    assert get_shared_client(model) is not first
+    close_shared_clients()
+
+
+class FailingCompletions:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        raise ConnectionError("endpoint down")
+
+
+def test_open_circuit_stops_retries_and_fails_fast() -> None:
+    model = replace(
+        load_settings().model,
+        api_key="sk-test",
+        max_retries=5,
+        backoff_seconds=0.0,
+        circuit_failure_threshold=2,
+        circuit_reset_seconds=60.0,
+    )
+    client = OpenAIClient.from_model_settings(model)
+    completions = FailingCompletions()
+    client._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    messages = [{"role": "user", "content": "hi"}]
+
+    with pytest.raises(CircuitOpenError):
+        client.chat(model="flaky-breaker-test", messages=messages, temperature=0.0, max_tokens=8)
+    assert completions.calls == 2
+
+    with pytest.raises(CircuitOpenError):
+        client.chat(model="flaky-breaker-test", messages=messages, temperature=0.0, max_tokens=8)
+    assert completions.calls == 2
+    assert endpoint_stats()["flaky-breaker-test"]["state"] == "open"
+
+
+def test_timeout_budget_stops_retries_that_cannot_fit() -> None:
+    model = replace(load_settings().model, api_key="sk-test", max_retries=3, backoff_seconds=1.0)
+    client = OpenAIClient.from_model_settings(model)
+    completions = FailingCompletions()
+    client._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    with pytest.raises(DeadlineExceeded):
+        client.chat(
+            model="deadline-budget-test",
+            messages=[{"role": "user", "content": "hi"}],
+            temperature=0.0,
+            max_tokens=8,
+            timeout=0.2,
+        )
+    assert completions.calls == 1
+
+
+def test_half_open_probe_is_released_when_the_attempt_never_starts() -> None:
+    model = replace(
+        load_settings().model,
+        api_key="sk-test",
+        circuit_failure_threshold=1,
+        circuit_reset_seconds=0.0,
+    )
+    client = OpenAIClient.from_model_settings(model)
+    completions = FailingCompletions()
+    client._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    guard = client._endpoint_guard("probe-release-test")
+    guard.breaker.record_failure()
+
+    with pytest.raises(DeadlineExceeded):
+        client.chat(
+            model="probe-release-test",
+            messages=[{"role": "user", "content": "hi"}],
+            temperature=0.0,
+            max_tokens=8,
+            timeout=0.0,
+        )
+    assert completions.calls == 0
+    guard.before_call()  # the probe was given up, not leaked
@@ -0,0 +1,37 @@
+import json
+import pstats
+
+from src.common.config import ProfilingSettings
+from src.common.profiling import profile_run, record_stage
+from src.pipeline import run_pipeline
+
+TEXT = "OpenAI partnered with Oscar Health to modernize medical records."
+
+
+def test_profile_run_writes_pstats_stacks_and_stage_timings(tmp_path) -> None:
+    settings = ProfilingSettings(output_dir=str(tmp_path), sample_interval_ms=1)
+
+    with profile_run(settings, "oscar") as profile:
+        run_pipeline(text=TEXT, mode="stub", story_id="oscar")
+
+    assert set(profile.artifacts) == {"pstats", "collapsed", "stages"}
+    assert pstats.Stats(str(profile.artifacts["pstats"])).total_calls > 0
+    assert profile.artifacts["collapsed"].exists()
+    summary = json.loads(profile.artifacts["stages"].read_text())
+    stages = [timing["stage"] for timing in summary["stages"]]
+    for stage in ("ingestion", "masking", "extract_pillars", "build_answers", "serialization"):
+        assert stage in stages
+    # Stages are listed as they finish: ingestion no longer wraps masking.
+    assert stages.index("ingestion") < stages.index("masking")
+    for timing in summary["stages"]:
+        assert timing["wait_seconds"] >= 0
+    assert summary["deterministic"] is True
+
+
+def test_profiling_is_off_unless_requested(tmp_path) -> None:
+    with profile_run(ProfilingSettings(output_dir=str(tmp_path)), None) as profile:
+        with record_stage("ingestion"):
+            pass
+
+    assert profile is None
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,75 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.common.cancellation import CancellationToken, OperationCancelled
+from src.common.deadline import Deadline, DeadlineExceeded
+from src.common.rate_limit import RateLimiter, get_rate_limiter, retry_after_seconds
+
+
+def test_rate_limiter_smooths_requests_and_tokens() -> None:
+    now = [0.0]
+    slept: list[float] = []
+    limiter = RateLimiter(
+        requests_per_minute=60,
+        tokens_per_minute=600,
+        burst_seconds=1.0,
+        clock=lambda: now[0],
+        sleep=slept.append,
+    )
+
+    assert limiter.acquire(tokens=5) == 0.0
+    assert limiter.acquire(tokens=5) == 1.0
+    now[0] += 1.0
+    assert limiter.acquire(tokens=30) == 2.0
+    assert slept == [1.0, 2.0]
+    assert limiter.stats.delayed == 2
+    assert limiter.stats.max_wait_seconds == 2.0
+
+
+def test_rate_limiter_honors_retry_after_for_all_callers() -> None:
+    now = [0.0]
+    limiter = RateLimiter(requests_per_minute=6000, clock=lambda: now[0])
+    limiter.penalize(2.5)
+    assert limiter.reserve() == 2.5
+    now[0] += 2.5
+    assert limiter.reserve() == 0.0
+
+
+def test_retry_after_seconds_reads_response_headers() -> None:
+    error = Exception("429")
+    error.response = SimpleNamespace(headers={"retry-after-ms": "1500"})  # type: ignore[attr-defined]
+    assert retry_after_seconds(error) == 1.5
+    assert retry_after_seconds(Exception("boom")) is None
+
+
+def test_rate_limiter_wait_respects_deadline_and_cancellation() -> None:
+    now = [0.0]
+    slept: list[float] = []
+    limiter = RateLimiter(
+        requests_per_minute=60, burst_seconds=1.0, clock=lambda: now[0], sleep=slept.append
+    )
+    limiter.acquire()
+
+    with pytest.raises(DeadlineExceeded):
+        limiter.acquire(deadline=Deadline(expires_at=0.5, clock=lambda: now[0]))
+    assert slept == []
+    # The refused reservation was handed back.
+    assert limiter.reserve() == 1.0
+
+    token = CancellationToken()
+    threading.Timer(0.01, token.cancel).start()
+    with pytest.raises(OperationCancelled):
+        limiter.acquire(cancellation=token)
+
+
+def test_limiters_with_different_limits_do_not_share_buckets() -> None:
+    slow = get_rate_limiter("limits-keyed-test", requests_per_minute=10, tokens_per_minute=None)
+    fast = get_rate_limiter("limits-keyed-test", requests_per_minute=1000, tokens_per_minute=None)
+
+    assert slow is not fast
+    assert (
+        get_rate_limiter("limits-keyed-test", requests_per_minute=10, tokens_per_minute=None)
+        is slow
+    )
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.common.cancellation import CancellationToken, OperationCancelled
+from src.common.deadline import DeadlineExceeded
+from src.common.resilience import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    EndpointGuard,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(status_code)
+        self.status_code = status_code
+
+
+def test_breaker_opens_fails_fast_and_recovers_through_probe() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker("m", failure_threshold=2, reset_seconds=10, clock=clock)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now = 10.0
+    breaker.before_call()  # the probe
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one probe at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.rejected == 2
+
+
+def test_failed_probe_reopens_circuit() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker("m", failure_threshold=1, reset_seconds=5, clock=clock)
+    breaker.record_failure()
+    clock.now = 5.0
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_aimd_grows_additively_and_halves_on_errors_or_slow_calls() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial=4, maximum=8, latency_target=1.0)
+    for _ in range(8):
+        assert limiter.try_acquire()
+        limiter.release(latency=0.1, ok=True)
+    assert limiter.limit == 5
+
+    limiter.acquire()
+    limiter.release(latency=2.0, ok=True)
+    assert limiter.limit == 2
+    limiter.acquire()
+    limiter.release(latency=0.1, ok=False)
+    assert limiter.limit == 1
+    assert limiter.try_acquire() and not limiter.try_acquire()
+
+
+def test_guard_ignores_client_errors_but_counts_server_errors() -> None:
+    guard = EndpointGuard(
+        CircuitBreaker("m", failure_threshold=1),
+        AdaptiveConcurrencyLimiter(initial=4),
+    )
+    with pytest.raises(StatusError):
+        with guard.attempt():
+            raise StatusError(400)
+    assert guard.breaker.state == "closed"
+    assert guard.limiter.limit == 4
+
+    with pytest.raises(StatusError):
+        with guard.attempt():
+            raise StatusError(503)
+    assert guard.breaker.state == "open"
+    assert guard.limiter.limit == 2
+    assert guard.limiter.in_flight == 0
+
+
+def test_blocked_acquire_honours_timeout_and_cancellation() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial=1, maximum=1)
+    limiter.acquire()
+
+    with pytest.raises(DeadlineExceeded):
+        limiter.acquire(timeout=0.01)
+
+    token = CancellationToken()
+    threading.Timer(0.01, token.cancel, args=("client disconnected",)).start()
+    with pytest.raises(OperationCancelled):
+        limiter.acquire(cancellation=token)
+    assert limiter.in_flight == 1
+
+
+def test_async_waiter_is_woken_by_release_and_times_out_otherwise() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial=1, maximum=1)
+
+    async def scenario() -> None:
+        await limiter.aacquire()
+        with pytest.raises(DeadlineExceeded):
+            await limiter.aacquire(timeout=0.01)
+
+        waiter = asyncio.ensure_future(limiter.aacquire(timeout=5))
+        await asyncio.sleep(0)
+        # Released from another thread, as sync callers sharing the guard do.
+        await asyncio.to_thread(limiter.release, latency=0.0, ok=None)
+        await asyncio.wait_for(waiter, timeout=1)
+
+    asyncio.run(scenario())
+    assert limiter.in_flight == 1 and not limiter._async_waiters
+
+
+def test_probe_is_released_when_the_slot_wait_fails() -> None:
+    clock = FakeClock()
+    guard = EndpointGuard(
+        CircuitBreaker("m", failure_threshold=1, reset_seconds=5, clock=clock),
+        AdaptiveConcurrencyLimiter(initial=1, maximum=1),
+    )
+    guard.breaker.record_failure()
+    clock.now = 5.0
+    assert guard.limiter.try_acquire()
+
+    guard.before_call()  # the probe
+    with pytest.raises(DeadlineExceeded):
+        with guard.attempt(timeout=0.01):
+            pass
+    guard.before_call()  # another caller may probe instead
+
+    async def _probe() -> None:
+        with pytest.raises(DeadlineExceeded):
+            async with guard.aattempt(timeout=0.01):
+                pass
+
+    asyncio.run(_probe())
+    guard.before_call()
+    assert guard.breaker.state == "half_open"
@@ -0,0 +1,65 @@
+from src.common import text
+from src.common.text import (
+    compile_terms,
+    iter_strip_markup,
+    keyword_hits,
+    mask_terms,
+    mask_terms_with_spans,
+    strip_markup,
+)
+
+
+def test_mask_terms_prefers_longest_alias_in_one_pass() -> None:
+    value = "OpenAI, Inc. ships ChatGPT; openai also ships Sora."
+    terms = ["OpenAI", "OpenAI, Inc.", "ChatGPT", "Sora"]
+    assert mask_terms(value, terms, token="[MASK]") == (
+        "[MASK] ships [MASK]; [MASK] also ships [MASK]."
+    )
+
+    result = mask_terms_with_spans(value, terms, token="[MASK]")
+    assert [(span.start, span.end, span.term) for span in result.spans][:2] == [
+        (0, 12, "OpenAI, Inc."),
+        (19, 26, "ChatGPT"),
+    ]
+
+
+def test_keyword_hits_counts_nested_aliases() -> None:
+    hits = keyword_hits("OpenAI, Inc. and OpenAI", ["OpenAI", "OpenAI, Inc.", "Gemini"])
+    assert hits == {"OpenAI, Inc.": 1, "OpenAI": 2}
+
+
+def test_compile_terms_is_cached_per_alias_set() -> None:
+    assert compile_terms(["OpenAI", "Sora"]) is compile_terms(["OpenAI", "Sora"])
+    assert not compile_terms(["", "  "])
+
+
+def test_iter_strip_markup_matches_strip_markup_for_long_tags() -> None:
+    value = (
+        'Intro <img src="data:image/png;base64,' + "A" * 10_000 + '"> body <<b>x</b> ' "a <> b < c"
+    )
+    expected = strip_markup(value)
+    assert len(expected) < 40
+    for size in (1, 7, 4096, len(value)):
+        chunks = [value[start : start + size] for start in range(0, len(value), size)]
+        assert "".join(iter_strip_markup(chunks)) == expected
+
+
+def test_iter_strip_markup_bounds_an_unclosed_bracket(monkeypatch) -> None:
+    monkeypatch.setattr(text, "_MAX_TAG_CHARS", 8)
+
+    assert "".join(iter_strip_markup(["a < b", " c"])) == "a < b c"
+    assert "".join(iter_strip_markup(["a < b is ", "true forever"])) == "a < b is t"
+
+
+def test_keyword_hits_counts_overlapping_aliases_independently() -> None:
+    assert keyword_hits("abc abc", ["ab", "bc"]) == {"ab": 2, "bc": 2}
+    assert keyword_hits("aaaa", ["aa", "aaa"]) == {"aa": 2, "aaa": 1}
+    assert not compile_terms(["OpenAI", "OpenAI, Inc."]).has_overlaps
+
+
+def test_matching_agrees_with_unicode_case_folding() -> None:
+    assert mask_terms("ς x", ["Σ"], token="[MASK]") == "[MASK] x"
+    assert keyword_hits("s", ["ſ"]) == {"ſ": 1}
+    # lower() turns "İ" into two characters; the alias must still be masked and audited.
+    assert mask_terms("Visit İstanbul today", ["İstanbul"], token="[MASK]") == "Visit [MASK] today"
+    assert keyword_hits("İstanbul and İSTANBUL", ["İstanbul"]) == {"İstanbul": 2}
@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+
+import pytest
+
+from src.common.tracing import NOOP_SPAN, Tracer, current_span, span
+
+
+class ListExporter:
+    def __init__(self) -> None:
+        self.spans: list[dict] = []
+
+    def export(self, span: dict) -> None:
+        self.spans.append(span)
+
+
+def test_spans_nest_under_the_active_trace_and_record_errors() -> None:
+    exporter = ListExporter()
+    tracer = Tracer(exporter)
+
+    with tracer.span("pipeline", story_id="s1") as root:
+        with span("runner.answer", model="gpt-test") as child:
+            current_span().set_attribute("cache_hit", True)
+        with pytest.raises(ValueError):
+            with span("openai.attempt", attempt=1):
+                raise ValueError("boom")
+
+    answer, attempt, pipeline = exporter.spans
+    assert pipeline["span_id"] == root.span_id and pipeline["parent_id"] is None
+    assert answer["parent_id"] == attempt["parent_id"] == root.span_id
+    assert answer["attributes"] == {"model": "gpt-test", "cache_hit": True}
+    assert child.trace_id == root.trace_id
+    assert attempt["status"] == "error" and "boom" in attempt["attributes"]["error"]
+
+
+def test_unsampled_traces_and_untraced_code_export_nothing() -> None:
+    exporter = ListExporter()
+    tracer = Tracer(exporter, sample_rate=0.0)
+
+    with span("orphan") as orphan:
+        assert orphan is NOOP_SPAN
+    with tracer.span("pipeline") as root:
+        assert root.trace_id
+        with span("service.extract_pillars") as child:
+            assert child is root
+
+    assert exporter.spans == []
+
+
+def test_context_propagates_into_worker_threads() -> None:
+    exporter = ListExporter()
+    tracer = Tracer(exporter)
+
+    def work() -> None:
+        with span("worker"):
+            pass
+
+    with tracer.span("pipeline") as root, ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(contextvars.copy_context().run, work).result()
+
+    worker = exporter.spans[0]
+    assert worker["name"] == "worker" and worker["parent_id"] == root.span_id
@@ -0,0 +1,40 @@
+from src.common.usage import TokenUsage, UsageLedger, cost_usd, extract_usage
+
+
+def test_extract_usage_reads_both_api_shapes() -> None:
+    chat = {
+        "usage": {
+            "prompt_tokens": 1200,
+            "completion_tokens": 300,
+            "prompt_tokens_details": {"cached_tokens": 1024},
+            "completion_tokens_details": {"reasoning_tokens": 120},
+        }
+    }
+    responses = {
+        "usage": {
+            "input_tokens": 800,
+            "output_tokens": 90,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens_details": None,
+        }
+    }
+    assert extract_usage(chat) == TokenUsage(1200, 300, 120, 1024)
+    assert extract_usage(responses) == TokenUsage(800, 90, 0, 0)
+    assert extract_usage({"output_text": "hi"}) is None
+
+
+def test_ledger_groups_usage_and_skips_cached_responses() -> None:
+    ledger = UsageLedger()
+    ledger.record(
+        "answer", "gpt-4o-2024-08-06", TokenUsage(prompt_tokens=1_000_000, cached_tokens=500_000)
+    )
+    ledger.record("answer", "gpt-5", TokenUsage(completion_tokens=100_000))
+    ledger.record("answer", "gpt-5", TokenUsage(completion_tokens=100_000), from_cache=True)
+
+    summary = ledger.summary()
+    assert summary["calls"] == 2
+    assert summary["response_cache_hits"] == 1
+    assert summary["by_model"]["gpt-4o-2024-08-06"]["cost_usd"] == 1.875
+    assert summary["by_stage"]["answer"]["completion_tokens"] == 100_000
+    assert summary["cost_usd"] == 2.875
+    assert cost_usd("unknown-model", TokenUsage(prompt_tokens=10), ledger.pricing) is None
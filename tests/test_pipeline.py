@@ -0,0 +1,185 @@
+import asyncio
+from dataclasses import replace
+from itertools import count
+
+import pytest
+
+from src import pipeline
+from src.common.cache import LRUCache, StageCache
+from src.common.cancellation import CancellationToken, OperationCancelled
+from src.common.deadline import Deadline
+from src.pipeline import arun_pipeline, arun_pipeline_batch, run_pipeline, run_pipeline_batch
+
+TEXT = "OpenAI partnered with Oscar Health to modernize medical records."
+
+
+def test_arun_pipeline_matches_sync_pipeline_in_stub_mode() -> None:
+    sync_payload = run_pipeline(text=TEXT, mode="stub", story_id="oscar")
+    async_payload = asyncio.run(arun_pipeline(text=TEXT, mode="stub", story_id="oscar"))
+
+    sync_payload["metadata"].pop("generated_at")
+    async_payload["metadata"].pop("generated_at")
+    assert async_payload == sync_payload
+
+
+def test_run_pipeline_reports_usage_ledger() -> None:
+    payload = run_pipeline(text=TEXT, mode="stub", models_override=["gpt-4o"])
+    usage = payload["usage"]
+    assert usage["estimated"] is True
+    assert usage["calls"] == payload["summary"]["total_questions"]
+    assert usage["by_model"]["gpt-4o"]["prompt_tokens"] > 0
+
+
+def test_expired_deadline_returns_partial_result() -> None:
+    payload = run_pipeline(text=TEXT, mode="stub", deadline=Deadline.after(0))
+
+    assert payload["partial"] is True
+    assert payload["selling_points"] == []
+
+
+def test_deadline_during_answers_lists_unanswered_pairs() -> None:
+    ticks = count()
+    deadline = Deadline(expires_at=6, clock=lambda: next(ticks))
+
+    payload = run_pipeline(
+        text=TEXT, mode="stub", models_override=["gpt-4o", "gpt-5"], deadline=deadline
+    )
+
+    answered = sum(
+        len(question["responses"])
+        for point in payload["selling_points"]
+        for question in point["questions"]
+    )
+    assert payload["partial"] is True
+    assert answered > 0 and payload["unanswered"]
+    assert answered + len(payload["unanswered"]) == 2 * payload["summary"]["total_questions"]
+    assert {"question_id", "model"} == set(payload["unanswered"][0])
+
+
+def test_cancelled_run_raises_before_any_stage() -> None:
+    token = CancellationToken()
+    token.cancel("client disconnected")
+
+    with pytest.raises(OperationCancelled):
+        run_pipeline(text=TEXT, mode="stub", cancellation=token)
+
+
+def test_run_pipeline_batch_dedupes_stories_by_content() -> None:
+    other = "Anthropic helped Acme Bank summarize support tickets."
+    items = run_pipeline_batch([TEXT, other, TEXT], mode="stub")
+
+    assert [item.indices for item in items] == [[0, 2], [1]]
+    assert all(item.error is None for item in items)
+    assert items[0].result["story_id"] == items[0].story_id
+    single = run_pipeline(text=TEXT, mode="stub")
+    assert items[0].result["summary"] == single["summary"]
+
+
+def test_run_pipeline_batch_builds_one_service_for_all_stories(monkeypatch) -> None:
+    built = []
+
+    class CountingService(pipeline.VisibilityLLMService):
+        def __init__(self, *args, **kwargs) -> None:
+            built.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(pipeline, "VisibilityLLMService", CountingService)
+    texts = [f"Story {index}: OpenAI partnered with Oscar Health." for index in range(4)]
+
+    items = run_pipeline_batch(texts, mode="stub")
+
+    assert all(item.result is not None for item in items)
+    assert len(built) == 1
+
+
+def test_arun_pipeline_batch_reports_failures_per_story(monkeypatch) -> None:
+    from src.agents.visibility import pillars
+
+    extract = pillars.extract_pillars
+
+    def flaky_extract(text, **kwargs):
+        if "Acme" in text:
+            raise ValueError("cannot parse story")
+        return extract(text, **kwargs)
+
+    monkeypatch.setattr(pillars, "extract_pillars", flaky_extract)
+
+    async def collect() -> list:
+        texts = [TEXT, "Anthropic helped Acme Bank summarize support tickets."]
+        return [
+            item
+            async for item in arun_pipeline_batch(texts, mode="stub", cache=StageCache(LRUCache()))
+        ]
+
+    items = sorted(asyncio.run(collect()), key=lambda item: item.indices)
+    assert items[0].result is not None
+    assert items[1].error == "cannot parse story"
+
+
+def test_run_pipeline_batch_can_run_twice_in_live_mode(monkeypatch) -> None:
+    import httpx
+
+    from src.common.config import load_settings
+    from src.common.openai_client import OpenAIClient, close_shared_clients
+
+    def completion(request: httpx.Request) -> httpx.Response:
+        message = {"role": "assistant", "content": '{"answer": "Unsure"}'}
+        return httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o",
+                "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+            },
+        )
+
+    async_clients: list = []
+    build = OpenAIClient._build_http_client
+
+    def mock_http_client(self, *, asynchronous: bool):
+        if not asynchronous:
+            return build(self, asynchronous=False)
+        client = httpx.AsyncClient(transport=httpx.MockTransport(completion))
+        async_clients.append(client)
+        return client
+
+    monkeypatch.setattr(OpenAIClient, "_build_http_client", mock_http_client)
+    settings = load_settings()
+    settings.model = replace(
+        settings.model, api_key="sk-test", name="gpt-4o", comparison_models=[], max_retries=0
+    )
+    try:
+        for _ in range(2):
+            items = run_pipeline_batch(
+                [TEXT], mode="live", settings=settings, models_override=["gpt-4o"]
+            )
+            assert items[0].error is None
+    finally:
+        close_shared_clients()
+    # One pooled async client per event loop (each batch runs its own loop).
+    assert len(async_clients) == 2
+
+
+def test_arun_pipeline_keeps_blocking_work_off_the_event_loop(monkeypatch) -> None:
+    import threading
+
+    from src.agents.visibility import pillars
+
+    threads: dict[str, str] = {}
+    extract = pillars.extract_pillars
+
+    def record_extract(text, **kwargs):
+        threads["extract_pillars"] = threading.current_thread().name
+        return extract(text, **kwargs)
+
+    monkeypatch.setattr(pillars, "extract_pillars", record_extract)
+
+    async def scenario() -> str:
+        await arun_pipeline(text=TEXT, mode="stub")
+        return threading.current_thread().name
+
+    loop_thread = asyncio.run(scenario())
+    assert threads["extract_pillars"] != loop_thread